@@ -19,6 +19,18 @@ REQUEST_DELAY = 1.5  # Delay between individual post requests
 BLOG_REQUEST_DELAY = 2.0  # Delay after blog info requests
 COMMENT_REQUEST_DELAY = 1.0  # Delay between comment page requests
 
+# Adaptive rate limiter (requests per second), starts at 1 / REQUEST_DELAY
+RATE_LIMIT_BURST = 2  # Max requests allowed back-to-back
+RATE_LIMIT_MAX_RATE = 4.0  # Upper bound while the server responds normally
+RATE_LIMIT_MIN_RATE = 0.2  # Lower bound after repeated 429/5xx responses
+
+# Concurrent fetch workers (requests still pass through the rate limiter)
+POST_FETCH_WORKERS = 8  # Post content pages fetched at once
+COMMENT_FETCH_WORKERS = 4  # Matches the Selenium driver pool size
+WRITE_BATCH_SIZE = 50  # Posts written per DB transaction / progress save
+CHECKPOINT_INTERVAL = 2.0  # Max seconds between progress saves in a step
+PROGRESS_SAVE_INTERVAL = 0.5  # Min seconds between coalesced progress writes
+
 # Request settings
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
@@ -44,6 +56,11 @@ ACCESS_CODES = {
     "KATE2026Q4": "2026-12-31",  # 4분기 수강생
 }
 
+# A verified code is remembered for AUTH_CACHE_TTL seconds, so the access
+# dialog is skipped on later launches while the code is unexpired
+AUTH_CACHE_PATH = BASE_DIR / "auth_cache.json"
+AUTH_CACHE_TTL = int(os.environ.get("NAVERBLOG_AUTH_TTL", 24 * 60 * 60))
+
 # Status constants
 class Status:
     PENDING = "pending"
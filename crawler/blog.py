@@ -1,21 +1,30 @@
 """Blog metadata crawler for Naver Blog."""
 
 import re
-import time
+import json
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from typing import Optional, Dict, Any, Callable
 
-from config import HEADERS, BLOG_REQUEST_DELAY
+from crawler.http import SESSION, conditional_headers, fetch_with_retry
+from crawler.parsing import HTML_PARSER
+
+_RE_NAVER_BLOG_SUFFIX = re.compile(r'\s*:\s*네이버\s*블로그\s*$')
+_RE_DIGITS = re.compile(r'(\d[\d,]*)')
+
+# The post list page is only parsed for its post count elements
+_POST_COUNT_STRAINER = SoupStrainer(class_=re.compile(r'category_title|cnt'))
 
 
 class BlogCrawler:
     """Crawls blog-level metadata (name, author)."""
 
-    def __init__(self, progress_callback: Callable[[str], None] = None):
+    def __init__(self, progress_callback: Callable[[str], None] = None,
+                 cache=None):
         self.progress_callback = progress_callback
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.session = SESSION
+        # Optional DatabaseManager used for conditional requests
+        self.cache = cache
 
     def _log(self, message: str):
         if self.progress_callback:
@@ -33,22 +42,26 @@ class BlogCrawler:
         url = f"https://m.blog.naver.com/{blog_id}"
         self._log(f"블로그 정보 가져오는 중: {blog_id}")
 
+        entry = self.cache.get_http_cache(url) if self.cache else None
+
         try:
-            resp = self.session.get(url, timeout=15)
+            resp = fetch_with_retry(url, session=self.session,
+                                    headers=conditional_headers(entry),
+                                    timeout=15)
+            if resp.status_code == 304 and entry and entry.get('data'):
+                return json.loads(entry['data'])
             resp.raise_for_status()
         except requests.RequestException as e:
             self._log(f"블로그 접근 실패: {e}")
             return None
 
-        soup = BeautifulSoup(resp.text, 'html.parser')
+        soup = BeautifulSoup(resp.text, HTML_PARSER)
 
         blog_name = self._extract_blog_name(soup, blog_id)
         author_name = self._extract_author_name(soup, blog_id)
         post_count = self._get_post_count(blog_id)
 
-        time.sleep(BLOG_REQUEST_DELAY)
-
-        return {
+        info = {
             'id': blog_id,
             'blog_name': blog_name or blog_id,
             'author_name': author_name or blog_id,
@@ -56,6 +69,17 @@ class BlogCrawler:
             'post_count': post_count,
         }
 
+        # Without a validator the entry could never be answered by a 304
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+        if self.cache and (etag or last_modified):
+            self.cache.set_http_cache(
+                url, etag, last_modified,
+                json.dumps(info, ensure_ascii=False)
+            )
+
+        return info
+
     def _extract_blog_name(self, soup: BeautifulSoup,
                            blog_id: str) -> Optional[str]:
         """Extract blog title from page."""
@@ -65,14 +89,14 @@ class BlogCrawler:
             title = og_title['content'].strip()
             if title:
                 # Remove trailing " : 네이버 블로그" if present
-                title = re.sub(r'\s*:\s*네이버\s*블로그\s*$', '', title)
+                title = _RE_NAVER_BLOG_SUFFIX.sub('', title)
                 return title
 
         # Try title tag
         title_tag = soup.find('title')
         if title_tag:
             title = title_tag.get_text(strip=True)
-            title = re.sub(r'\s*:\s*네이버\s*블로그\s*$', '', title)
+            title = _RE_NAVER_BLOG_SUFFIX.sub('', title)
             if title:
                 return title
 
@@ -109,14 +133,16 @@ class BlogCrawler:
                f"?blogId={blog_id}&categoryNo=0&from=postList")
 
         try:
-            resp = self.session.get(url, timeout=15)
+            resp = fetch_with_retry(url, session=self.session,
+                                    timeout=15)
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            soup = BeautifulSoup(resp.text, HTML_PARSER,
+                                 parse_only=_POST_COUNT_STRAINER)
 
             # Try to find total post count from the page
             count_area = soup.find('span', class_='category_title')
             if count_area:
-                match = re.search(r'(\d[\d,]*)', count_area.get_text())
+                match = _RE_DIGITS.search(count_area.get_text())
                 if match:
                     return int(match.group(1).replace(',', ''))
 
@@ -124,7 +150,7 @@ class BlogCrawler:
             count_elem = soup.find('em', class_='cnt')
             if count_elem:
                 text = count_elem.get_text(strip=True)
-                match = re.search(r'(\d[\d,]*)', text)
+                match = _RE_DIGITS.search(text)
                 if match:
                     return int(match.group(1).replace(',', ''))
 
@@ -137,7 +163,12 @@ class BlogCrawler:
         """Check if a blog ID is valid and accessible."""
         url = f"https://m.blog.naver.com/{blog_id}"
         try:
-            resp = self.session.get(url, timeout=10, allow_redirects=False)
+            # HEAD transfers no body; some servers only answer GET
+            resp = fetch_with_retry(url, session=self.session, method='HEAD',
+                                    timeout=10, allow_redirects=False)
+            if resp.status_code == 405:
+                resp = fetch_with_retry(url, session=self.session,
+                                        timeout=10, allow_redirects=False)
             return resp.status_code == 200
         except requests.RequestException:
             return False
@@ -1,53 +1,256 @@
 """Comment and reply crawler for Naver Blog posts."""
 
 import re
+import json
 import time
-from bs4 import BeautifulSoup
-from typing import Optional, Dict, Any, List, Callable
+import hashlib
+import functools
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import Optional, Dict, Any, List, Callable, Iterator, Tuple
+
+import requests
 
 from config import HEADERS, COMMENT_REQUEST_DELAY
+from crawler.http import SESSION, fetch_with_retry
+from crawler.parsing import HTML_PARSER
+from crawler.selectors import compile_sel
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# JSONP endpoint behind the cbox comment widget
+_COMMENT_API_URL = ('https://apis.naver.com/commentBox/cbox/'
+                    'web_naver_list_jsonp.json')
+_COMMENT_API_PAGE_SIZE = 100
+
+_RE_JSONP = re.compile(r'^[^(]*\((.*)\)\s*;?\s*$', re.S)
+_RE_CBOX_NICK_CLASS = re.compile(r'class="[^"]*u_cbox_nick[^"]*"')
+_RE_NICK_OR_CONTENT = re.compile(
+    r'u_cbox_(?:nick[^>]*>(?P<nick>[^<]+)|contents[^>]*>(?P<content>[^<]+))<'
+)
+_RE_COMMENT_ID = re.compile(r'comment[_-]?(\d+)')
+_RE_HTML_TAGS = re.compile(r'<[^>]+>')
+
+
+@functools.lru_cache(maxsize=64)
+def _naver_comment_pattern(log_no: str) -> re.Pattern:
+    """Compiled pattern matching blog comment classes of one post."""
+    return re.compile(rf'naverComment_\d+_{re.escape(log_no)}__comment_(\d+)')
+
+
+@functools.lru_cache(maxsize=64)
+def _naver_comment_xpath(log_no: str):
+    """Compiled XPath selecting blog comment elements of one post."""
+    return etree.XPath(
+        "//*[contains(@class, 'naverComment_')]"
+        f"[re:test(@class, 'naverComment_\\d+_{log_no}__comment_\\d+')]",
+        namespaces={'re': 'http://exslt.org/regular-expressions'},
+    )
+
+
+if etree is not None:
+    # XPath equivalents of the loose selectors below
+    _XPATH_NICK = etree.XPath(
+        ".//*[contains(@class, 'nick') or contains(@class, 'name')]"
+    )
+    _XPATH_CONTENT = etree.XPath(
+        ".//*[contains(@class, 'contents') or contains(@class, 'text_wrap')"
+        " or contains(@class, 'comment')]"
+    )
+    _XPATH_DATE = etree.XPath(".//*[contains(@class, 'date')]")
+    _XPATH_RECOMM = etree.XPath(".//*[contains(@class, 'recomm')]")
+
+
+def _lxml_text(el) -> str:
+    """Stripped text of an lxml element, like get_text(strip=True)."""
+    return ''.join(t.strip() for t in el.itertext())
+
+
+# Loose selectors for the blog's own comment module markup
+_NICK_SELECTOR = '[class*="nick"], [class*="name"]'
+_CONTENT_SELECTOR = ('[class*="contents"], [class*="text_wrap"], '
+                     '[class*="comment"]')
+_DATE_SELECTOR = '[class*="date"]'
+_RECOMM_SELECTOR = '[class*="recomm"]'
+
+# Only the cbox comment subtrees are needed for the primary parser
+_CBOX_STRAINER = SoupStrainer(class_=re.compile(r'u_cbox_comment|u_cbox_comment_box'))
 
 
 class CommentCrawler:
-    """Crawls comments and replies for blog posts using Selenium."""
+    """Crawls comments and replies for blog posts.
+
+    Uses the cbox JSON API, falling back to Selenium when it is refused.
+    """
 
     def __init__(self, progress_callback: Callable[[str], None] = None):
         self.progress_callback = progress_callback
+        self.session = SESSION
 
     def _log(self, message: str):
         if self.progress_callback:
             self.progress_callback(message)
 
-    def get_comments(self, blog_id: str,
-                     log_no: str) -> List[Dict[str, Any]]:
+    def get_comments(self, blog_id: str, log_no: str,
+                     expected_count: int = 0) -> List[Dict[str, Any]]:
         """Fetch all comments and replies for a post.
 
-        Uses Selenium to load the fully-rendered blog page,
-        then parses comment elements from the DOM.
+        Reads the cbox comment API directly; if the API refuses the
+        request, or returns no comments for a post known to have some,
+        loads the rendered page with Selenium instead.
 
         Args:
             blog_id: Blog ID
             log_no: Post log number
+            expected_count: The post's comment count, if already known
 
         Returns:
             List of comment dicts with id, post_id, parent_id, author,
             content, like_count, written_at, is_reply
         """
+        return list(self.iter_comments(blog_id, log_no, expected_count))
+
+    def iter_comments(self, blog_id: str, log_no: str,
+                      expected_count: int = 0) -> Iterator[Dict[str, Any]]:
+        """Yield comments and replies for a post page by page.
+
+        Same dicts as get_comments, but only one comment page is held
+        in memory at a time.
+        """
         post_id = f"{blog_id}_{log_no}"
 
         try:
-            return self._fetch_comments_selenium(blog_id, log_no, post_id)
+            first = self._fetch_comments_api(blog_id, log_no, post_id)
+            # An empty first page is suspect when the post has comments
+            # (sort/permission quirks, objectId mismatches)
+            if first is None or (not first[0] and expected_count > 0):
+                yield from self._iter_comments_selenium(blog_id, log_no,
+                                                        post_id)
+                return
+
+            comments, total_pages = first
+            yield from comments
+            for page in range(2, min(total_pages, 50) + 1):  # Safety limit
+                result = self._fetch_comments_api(blog_id, log_no, post_id,
+                                                  page)
+                if result is None:
+                    break
+                yield from result[0]
         except Exception as e:
             self._log(f"댓글 가져오기 실패 ({log_no}): {e}")
-            return []
 
-    def _fetch_comments_selenium(self, blog_id: str, log_no: str,
-                                  post_id: str) -> List[Dict[str, Any]]:
-        """Fetch comments using Selenium-rendered page."""
-        from crawler.selenium_helper import get_shared_driver
-        from selenium.webdriver.common.by import By
+    def _fetch_comments_api(self, blog_id: str, log_no: str, post_id: str,
+                            page: int = 1
+                            ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """Fetch one page of comments from the cbox JSONP API.
+
+        Returns:
+            (comments, total_pages), or None if the request failed or the
+            API gave no usable page (see _parse_comments_api)
+        """
+        params = {
+            'ticket': 'blog',
+            'templateId': 'default',
+            'pool': 'blogid',
+            'lang': 'ko',
+            'objectId': post_id,
+            'groupId': blog_id,
+            'pageSize': _COMMENT_API_PAGE_SIZE,
+            'page': page,
+            'listType': 'OBJECT',
+            'sort': 'NEW',
+            'initialize': 'true',
+            '_callback': 'jsonp',
+        }
+        headers = {'Referer': f"https://blog.naver.com/{blog_id}/{log_no}"}
+
+        try:
+            resp = fetch_with_retry(_COMMENT_API_URL, session=self.session,
+                                    params=params, headers=headers,
+                                    timeout=10)
+            if resp.status_code in (401, 403):
+                return None
+            resp.raise_for_status()
+            return self._parse_comments_api(resp.text, post_id)
+        except (requests.RequestException, ValueError):
+            return None
+
+    def _parse_comments_api(self, text: str, post_id: str
+                            ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """Convert a cbox JSONP response to comment dicts.
+
+        Returns:
+            (comments, total_pages), or None if the API refused the request
+            or reported comments without listing any
+
+        Raises:
+            ValueError: If the payload is not valid JSON
+        """
+        match = _RE_JSONP.match(text.strip())
+        data = _loads(match.group(1) if match else text)
+
+        # Unauthorized tickets come back as success=false with a code
+        if not data.get('success'):
+            return None
 
-        driver = get_shared_driver()
+        result = data.get('result') or {}
+        page_model = result.get('pageModel') or {}
+        comment_list = result.get('commentList') or []
+        if not comment_list and (page_model.get('totalRows') or 0) > 0:
+            return None
+
+        comments = []
+        deleted_nos = set()
+        for item in comment_list:
+            comment_no = item.get('commentNo')
+            if item.get('deleted'):
+                deleted_nos.add(comment_no)
+                continue
+            parent_no = item.get('parentCommentNo')
+            is_reply = (item.get('replyLevel') or 1) > 1
+            # Replies to deleted comments would violate the parent_id FK
+            has_parent = is_reply and parent_no and parent_no not in deleted_nos
+            comments.append({
+                'id': f"{post_id}_c{comment_no}",
+                'post_id': post_id,
+                'parent_id': f"{post_id}_c{parent_no}" if has_parent else None,
+                'author': item.get('userName') or '',
+                'content': item.get('contents') or '',
+                'like_count': item.get('sympathyCount') or 0,
+                'written_at': item.get('regTime') or '',
+                'is_reply': 1 if is_reply else 0,
+            })
+
+        total_pages = page_model.get('totalPages') or 1
+        return comments, total_pages
+
+    def _iter_comments_selenium(self, blog_id: str, log_no: str,
+                                post_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield comments from the Selenium-rendered page."""
+        from crawler.selenium_helper import borrow_driver
+
+        with borrow_driver() as driver:
+            yield from self._iter_comments_with_driver(driver, blog_id,
+                                                       log_no, post_id)
+
+    def _iter_comments_with_driver(self, driver, blog_id: str, log_no: str,
+                                   post_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield comments for one post using a borrowed driver."""
+        from selenium.webdriver.common.by import By
 
         url = f"https://blog.naver.com/{blog_id}/{log_no}"
         driver.get(url)
@@ -86,115 +289,138 @@ class CommentCrawler:
         # Wait for comment elements to appear in page source
         for _ in range(10):
             src = driver.page_source
-            if re.search(r'class="[^"]*u_cbox_nick[^"]*"', src):
+            if _RE_CBOX_NICK_CLASS.search(src):
                 break
             time.sleep(1)
 
-        # Collect comments from all pages
-        all_comments = []
+        # Stream comments from all pages
         seen_ids = set()
+        last_page_hash = None
         max_pages = 50  # Safety limit
 
-        for page_num in range(max_pages):
-            src = driver.page_source
-            soup = BeautifulSoup(src, 'html.parser')
-
-            # Parse comments from current page
-            page_comments = self._parse_cbox_comments(soup, post_id)
-            if not page_comments:
-                page_comments = self._parse_naver_blog_comments(
-                    soup, post_id, log_no
-                )
-            if not page_comments:
-                page_comments = self._parse_comments_regex(src, post_id)
-
-            # Add only new comments (avoid duplicates)
-            new_count = 0
-            for c in page_comments:
-                if c['id'] not in seen_ids:
-                    seen_ids.add(c['id'])
-                    all_comments.append(c)
-                    new_count += 1
-
-            # Try to go to next page
-            try:
-                # Find next page button
-                next_btns = driver.find_elements(
-                    By.CSS_SELECTOR, '.u_cbox_page a.u_cbox_next'
-                )
-                next_btn = None
-                for btn in next_btns:
-                    if btn.is_displayed() and btn.is_enabled():
-                        # Check if it's not disabled
-                        classes = btn.get_attribute('class') or ''
-                        if 'disabled' not in classes and 'dimmed' not in classes:
-                            next_btn = btn
-                            break
-
-                if next_btn:
-                    driver.execute_script("arguments[0].click();", next_btn)
-                    time.sleep(2)
+        try:
+            for page_num in range(max_pages):
+                src = driver.page_source
+
+                # Same DOM as last time means the page click did nothing
+                page_hash = hashlib.blake2b(src.encode('utf-8'),
+                                            digest_size=8).digest()
+                if page_hash == last_page_hash:
+                    break
+                last_page_hash = page_hash
+
+                # Parse comments from current page
+                if LexborHTMLParser is not None:
+                    page_comments = self._parse_cbox_comments_lexbor(
+                        src, post_id
+                    )
                 else:
-                    # No next button, try clicking page numbers
-                    page_nums = driver.find_elements(
-                        By.CSS_SELECTOR, '.u_cbox_page .u_cbox_num_page'
+                    soup = BeautifulSoup(src, HTML_PARSER,
+                                         parse_only=_CBOX_STRAINER)
+                    page_comments = self._parse_cbox_comments(soup, post_id)
+                    # Break the tree's parent links so it is freed now
+                    soup.decompose()
+                if not page_comments:
+                    if etree is not None:
+                        page_comments = self._parse_naver_blog_comments_lxml(
+                            src, post_id, log_no
+                        )
+                    else:
+                        soup = BeautifulSoup(src, HTML_PARSER)
+                        page_comments = self._parse_naver_blog_comments(
+                            soup, post_id, log_no
+                        )
+                        soup.decompose()
+                if not page_comments:
+                    page_comments = self._parse_comments_regex(src, post_id)
+                # Don't keep the page source alive while the consumer runs
+                del src
+
+                # Add only new comments (avoid duplicates)
+                for c in page_comments:
+                    if c['id'] not in seen_ids:
+                        seen_ids.add(c['id'])
+                        yield c
+
+                # Try to go to next page
+                try:
+                    # Find next page button
+                    next_btns = driver.find_elements(
+                        By.CSS_SELECTOR, '.u_cbox_page a.u_cbox_next'
                     )
-                    clicked = False
-                    for pn in page_nums:
-                        try:
-                            num_text = pn.text.strip()
-                            if num_text.isdigit() and int(num_text) == page_num + 2:
-                                driver.execute_script("arguments[0].click();", pn)
-                                time.sleep(2)
-                                clicked = True
+                    next_btn = None
+                    for btn in next_btns:
+                        if btn.is_displayed() and btn.is_enabled():
+                            # Check if it's not disabled
+                            classes = btn.get_attribute('class') or ''
+                            if 'disabled' not in classes and 'dimmed' not in classes:
+                                next_btn = btn
                                 break
-                        except Exception:
-                            pass
-                    if not clicked:
-                        break  # No more pages
-            except Exception:
-                break
 
-        # Try to switch back to default content
-        try:
-            driver.switch_to.default_content()
-        except Exception:
-            pass
-
-        return all_comments
+                    if next_btn:
+                        driver.execute_script("arguments[0].click();", next_btn)
+                        time.sleep(2)
+                    else:
+                        # No next button, try clicking page numbers
+                        page_nums = driver.find_elements(
+                            By.CSS_SELECTOR, '.u_cbox_page .u_cbox_num_page'
+                        )
+                        clicked = False
+                        for pn in page_nums:
+                            try:
+                                num_text = pn.text.strip()
+                                if num_text.isdigit() and int(num_text) == page_num + 2:
+                                    driver.execute_script("arguments[0].click();", pn)
+                                    time.sleep(2)
+                                    clicked = True
+                                    break
+                            except Exception:
+                                pass
+                        if not clicked:
+                            break  # No more pages
+                except Exception:
+                    break
+        finally:
+            # Try to switch back to default content
+            try:
+                driver.switch_to.default_content()
+            except Exception:
+                pass
 
     def _parse_cbox_comments(self, soup: BeautifulSoup,
                               post_id: str) -> List[Dict[str, Any]]:
         """Parse standard Naver cbox comment elements."""
         comments = []
 
-        comment_items = soup.select('li.u_cbox_comment')
+        comment_items = soup.find_all('li', class_='u_cbox_comment')
         if not comment_items:
-            comment_items = soup.select('.u_cbox_comment_box')
+            comment_items = soup.find_all(class_='u_cbox_comment_box')
 
         for item in comment_items:
             comment_id = self._extract_comment_id(item)
 
             # Author
-            nick = (item.select_one('.u_cbox_nick')
-                    or item.select_one('.u_cbox_name'))
+            # u_cbox_name wraps u_cbox_nick plus badges, so nick goes first
+            nick = (item.find(class_='u_cbox_nick')
+                    or item.find(class_='u_cbox_name'))
             author = nick.get_text(strip=True) if nick else ''
 
             # Content
-            content_el = (item.select_one('.u_cbox_contents')
-                          or item.select_one('.u_cbox_text_wrap')
-                          or item.select_one('.u_cbox_comment'))
+            # Checked in priority order: u_cbox_text_wrap wraps contents
+            content_el = (item.find(class_='u_cbox_contents')
+                          or item.find(class_='u_cbox_text_wrap')
+                          or item.find(class_='u_cbox_comment'))
             content = content_el.get_text(strip=True) if content_el else ''
 
             if not author and not content:
                 continue
 
             # Date
-            date_el = item.select_one('.u_cbox_date')
+            date_el = item.find(class_='u_cbox_date')
             written_at = date_el.get_text(strip=True) if date_el else ''
 
             # Like count
-            like_el = item.select_one('.u_cbox_cnt_recomm')
+            like_el = item.find(class_='u_cbox_cnt_recomm')
             like_count = 0
             if like_el:
                 like_text = like_el.get_text(strip=True)
@@ -202,7 +428,7 @@ class CommentCrawler:
 
             # Reply detection
             is_reply = ('reply' in ' '.join(item.get('class', []))
-                        or bool(item.select_one('.u_cbox_reply_area')))
+                        or bool(item.find(class_='u_cbox_reply_area')))
 
             parent_id = None
             if is_reply:
@@ -228,6 +454,71 @@ class CommentCrawler:
 
         return comments
 
+    def _parse_cbox_comments_lexbor(self, html: str,
+                                    post_id: str) -> List[Dict[str, Any]]:
+        """Parse standard Naver cbox comment elements with selectolax."""
+        comments = []
+        tree = LexborHTMLParser(html)
+
+        comment_items = tree.css('li.u_cbox_comment')
+        if not comment_items:
+            comment_items = tree.css('.u_cbox_comment_box')
+
+        parent_cid = ''
+        for item in comment_items:
+            classes = item.attributes.get('class') or ''
+            comment_id = self._extract_comment_id_lexbor(item)
+
+            # Author
+            nick = (item.css_first('.u_cbox_nick')
+                    or item.css_first('.u_cbox_name'))
+            author = nick.text(strip=True) if nick else ''
+
+            # Content
+            content_el = (item.css_first('.u_cbox_contents')
+                          or item.css_first('.u_cbox_text_wrap')
+                          or item.css_first('.u_cbox_comment'))
+            content = content_el.text(strip=True) if content_el else ''
+
+            if not author and not content:
+                continue
+
+            # Date
+            date_el = item.css_first('.u_cbox_date')
+            written_at = date_el.text(strip=True) if date_el else ''
+
+            # Like count
+            like_el = item.css_first('.u_cbox_cnt_recomm')
+            like_count = 0
+            if like_el:
+                like_text = like_el.text(strip=True)
+                like_count = int(like_text) if like_text.isdigit() else 0
+
+            # Reply detection: a reply belongs to the nearest preceding
+            # top-level comment in document order
+            is_reply = ('reply' in classes
+                        or item.css_first('.u_cbox_reply_area') is not None)
+
+            parent_id = None
+            if is_reply:
+                if parent_cid:
+                    parent_id = f"{post_id}_c{parent_cid}"
+            else:
+                parent_cid = comment_id
+
+            comments.append({
+                'id': f"{post_id}_c{comment_id}" if comment_id else f"{post_id}_c{len(comments)}",
+                'post_id': post_id,
+                'parent_id': parent_id,
+                'author': author,
+                'content': content,
+                'like_count': like_count,
+                'written_at': written_at,
+                'is_reply': 1 if is_reply else 0,
+            })
+
+        return comments
+
     def _parse_naver_blog_comments(self, soup: BeautifulSoup,
                                     post_id: str,
                                     log_no: str) -> List[Dict[str, Any]]:
@@ -235,11 +526,9 @@ class CommentCrawler:
         comments = []
 
         # Find elements matching naverComment_{id}_{logNo}__comment_{commentNo}
-        pattern = re.compile(
-            rf'naverComment_\d+_{log_no}__comment_(\d+)'
-        )
+        pattern = _naver_comment_pattern(log_no)
         comment_elements = soup.find_all(
-            class_=lambda c: c and any(pattern.match(cls) for cls in c)
+            class_=lambda c: c is not None and pattern.match(c)
         )
 
         if not comment_elements:
@@ -256,12 +545,10 @@ class CommentCrawler:
                 continue
 
             # Try to extract structured data
-            nick = el.select_one('[class*="nick"], [class*="name"]')
-            content_el = el.select_one(
-                '[class*="contents"], [class*="text_wrap"], [class*="comment"]'
-            )
-            date_el = el.select_one('[class*="date"]')
-            like_el = el.select_one('[class*="recomm"]')
+            nick = compile_sel(_NICK_SELECTOR).select_one(el)
+            content_el = compile_sel(_CONTENT_SELECTOR).select_one(el)
+            date_el = compile_sel(_DATE_SELECTOR).select_one(el)
+            like_el = compile_sel(_RECOMM_SELECTOR).select_one(el)
 
             author = nick.get_text(strip=True) if nick else ''
             content = content_el.get_text(strip=True) if content_el else text
@@ -287,21 +574,73 @@ class CommentCrawler:
 
         return comments
 
+    def _parse_naver_blog_comments_lxml(self, html: str, post_id: str,
+                                         log_no: str) -> List[Dict[str, Any]]:
+        """Parse the blog's own comment module with a single lxml XPath."""
+        comments = []
+
+        try:
+            tree = lxml.html.fromstring(html)
+        except (etree.ParserError, ValueError):
+            return []
+
+        pattern = _naver_comment_pattern(log_no)
+        for el in _naver_comment_xpath(log_no)(tree):
+            classes = el.get('class', '')
+            match = pattern.search(classes)
+            comment_no = match.group(1) if match else str(len(comments))
+
+            text = _lxml_text(el)
+            if not text:
+                continue
+
+            nick = next(iter(_XPATH_NICK(el)), None)
+            content_el = next(iter(_XPATH_CONTENT(el)), None)
+            date_el = next(iter(_XPATH_DATE(el)), None)
+            like_el = next(iter(_XPATH_RECOMM(el)), None)
+
+            author = _lxml_text(nick) if nick is not None else ''
+            content = _lxml_text(content_el) if content_el is not None else text
+            written_at = _lxml_text(date_el) if date_el is not None else ''
+
+            like_count = 0
+            if like_el is not None:
+                like_text = _lxml_text(like_el)
+                like_count = int(like_text) if like_text.isdigit() else 0
+
+            comments.append({
+                'id': f"{post_id}_c{comment_no}",
+                'post_id': post_id,
+                'parent_id': None,
+                'author': author,
+                'content': content,
+                'like_count': like_count,
+                'written_at': written_at,
+                'is_reply': 1 if 'reply' in classes.lower() else 0,
+            })
+
+        return comments
+
     def _parse_comments_regex(self, html: str,
                                post_id: str) -> List[Dict[str, Any]]:
         """Last resort: extract comment data using regex patterns."""
         comments = []
 
-        # Pattern for nick + content pairs
-        nick_pattern = r'u_cbox_nick[^>]*>([^<]+)<'
-        content_pattern = r'u_cbox_contents[^>]*>([^<]+)<'
-
-        nicks = re.findall(nick_pattern, html)
-        contents = re.findall(content_pattern, html)
+        # One pass over the HTML, pairing each nick with the next content
+        nick = None
+        pair_index = 0
+        for match in _RE_NICK_OR_CONTENT.finditer(html):
+            if match.group('nick') is not None:
+                nick = match.group('nick')
+                continue
+            if nick is None:
+                continue
 
-        for i in range(min(len(nicks), len(contents))):
-            author = nicks[i].strip()
-            content = contents[i].strip()
+            author = nick.strip()
+            content = match.group('content').strip()
+            i = pair_index
+            pair_index += 1
+            nick = None
             if not author or not content:
                 continue
 
@@ -310,7 +649,7 @@ class CommentCrawler:
                 'post_id': post_id,
                 'parent_id': None,
                 'author': author,
-                'content': re.sub(r'<[^>]+>', '', content).strip(),
+                'content': _RE_HTML_TAGS.sub('', content).strip(),
                 'like_count': 0,
                 'written_at': '',
                 'is_reply': 0,
@@ -318,10 +657,19 @@ class CommentCrawler:
 
         return comments
 
+    def _extract_comment_id_lexbor(self, node) -> str:
+        """Extract comment ID from a selectolax node."""
+        classes = node.attributes.get('class') or ''
+        match = _RE_COMMENT_ID.search(classes)
+        if match:
+            return match.group(1)
+
+        return node.attributes.get('data-comment-id') or ''
+
     def _extract_comment_id(self, element) -> str:
         """Extract comment ID from element classes or attributes."""
         classes = ' '.join(element.get('class', []))
-        match = re.search(r'comment[_-]?(\d+)', classes)
+        match = _RE_COMMENT_ID.search(classes)
         if match:
             return match.group(1)
 
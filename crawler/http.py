@@ -0,0 +1,103 @@
+"""Shared HTTP session for the Naver Blog crawlers.
+
+SESSION keeps up to 64 connections per host alive. Its adapter retries
+only connection errors; 429/5xx responses are retried by
+fetch_with_retry, which honours Retry-After and the rate limiter.
+"""
+
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import HEADERS
+from crawler.ratelimit import RATE_LIMITER, observe_response
+
+# Statuses worth retrying; anything else is returned to the caller as-is
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _create_session() -> requests.Session:
+    """Create a keep-alive session with a pooled, retrying adapter."""
+    session = requests.Session()
+    # urllib3 only retries connection errors; retryable statuses are
+    # handled by fetch_with_retry so Retry-After and the rate limiter
+    # see every response
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.5,
+                          respect_retry_after_header=False),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(HEADERS)
+    session.hooks['response'].append(observe_response)
+    return session
+
+
+# One session for every crawler so TLS connections to the Naver hosts
+# are reused across requests
+SESSION = _create_session()
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """If-None-Match/If-Modified-Since headers for a cached response."""
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def fetch_with_retry(url: str, session: requests.Session = None,
+                     max_retries: int = 4, base_delay: float = 1.0,
+                     max_delay: float = 30.0, method: str = 'GET',
+                     **kwargs) -> requests.Response:
+    """GET a URL through the rate limiter, retrying 429/5xx responses.
+
+    Waits for the server's Retry-After when present, otherwise uses
+    exponential backoff with jitter. The response hook on the session
+    already lowers RATE_LIMITER's rate on each throttled response.
+
+    Returns:
+        The last response received (callers still raise_for_status)
+    """
+    session = session or SESSION
+
+    for attempt in range(max_retries + 1):
+        RATE_LIMITER.acquire()
+        resp = session.request(method, url, **kwargs)
+        if resp.status_code not in RETRY_STATUSES or attempt == max_retries:
+            return resp
+
+        delay = _parse_retry_after(resp.headers.get('Retry-After'))
+        if delay is None:
+            delay = (min(max_delay, base_delay * 2 ** attempt)
+                     * random.uniform(0.5, 1.5))
+        time.sleep(min(delay, max_delay))
+
+    return resp
@@ -0,0 +1,8 @@
+"""Shared HTML parsing settings for the crawler modules."""
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    # lxml is much faster, but keep working with the stdlib parser
+    HTML_PARSER = 'html.parser'
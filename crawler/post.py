@@ -1,22 +1,114 @@
 """Post list and content crawler for Naver Blog."""
 
 import re
-import time
+import html
 import json
+import functools
 import requests
-from bs4 import BeautifulSoup
-from typing import Optional, Dict, Any, List, Callable
-
-from config import HEADERS, REQUEST_DELAY
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import Optional, Dict, Any, List, Callable, Tuple
+
+from crawler.http import SESSION, conditional_headers, fetch_with_retry
+from crawler.parsing import HTML_PARSER
+from crawler.selectors import compile_sel
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+_RE_LOG_NO = re.compile(r'"logNo"\s*:\s*"?(\d+)"?')
+_RE_TITLE_JSON = re.compile(r'"title"\s*:\s*"([^"]*)"')
+_RE_LOG_NO_PARAM = re.compile(r'logNo=(\d+)')
+_RE_SE_TEXT_CLASS = re.compile(r'se-text|se-module-text')
+
+
+def _to_int(value) -> int:
+    """Parse a count that may arrive as an int or a digit string."""
+    try:
+        return int(str(value).replace(',', ''))
+    except ValueError:
+        return 0
+
+
+@functools.lru_cache(maxsize=64)
+def _post_href_pattern(blog_id: str) -> re.Pattern:
+    """Compiled pattern matching post links of one blog."""
+    return re.compile(rf'/{re.escape(blog_id)}/(\d+)')
+
+
+@functools.lru_cache(maxsize=64)
+def _post_link_pattern(blog_id: str) -> re.Pattern:
+    """Compiled pattern matching post anchors (log_no, text) in raw HTML."""
+    return re.compile(
+        rf'href="[^"]*?/{re.escape(blog_id)}/(\d+)[^"]*"[^>]*>([^<]{{0,200}})'
+    )
+
+
+# Fallback selectors for each field, in priority order
+_TITLE_SELECTORS = (
+    'div.se-title-text',
+    'h3.se_textarea',
+    'div.tit_h3',
+    'div.__se_title_area',
+    'h3.tit_view',
+    'div.se-module-text h3',
+)
+
+_CONTENT_SELECTORS = (
+    'div.se-main-container',
+    'div.__se_component_area',
+    'div.post-view',
+    'div#postViewArea',
+    'div.se_component_wrap',
+)
+
+_CATEGORY_SELECTORS = (
+    'a.blog_ctg',
+    'em.category',
+    'a.pcol2',
+    'span.cate',
+    'a[class*="category"]',
+)
+
+_DATE_SELECTORS = (
+    '.blog_date',
+    'span.se_publishDate',
+    'span.date',
+    'p.date',
+    'span[class*="date"]',
+)
+
+# selectolax equivalent of the _RE_SE_TEXT_CLASS paragraph filter
+_SE_TEXT_SELECTOR = ', '.join(
+    f'{tag}[class*="{cls}"]'
+    for tag in ('p', 'div', 'span')
+    for cls in ('se-text', 'se-module-text')
+)
+
+# Subtrees used by the title/content/category/date extractors
+_POST_STRAINER = SoupStrainer(class_=re.compile(
+    r'se-main-container|__se_component_area|post-view|se_component_wrap'
+    r'|se-title-text|se_textarea|tit_h3|__se_title_area|tit_view'
+    r'|se-module-text|blog_ctg|cate|pcol2|date|Date'
+))
 
 
 class PostCrawler:
     """Crawls post list and individual post content."""
 
-    def __init__(self, progress_callback: Callable[[str], None] = None):
+    def __init__(self, progress_callback: Callable[[str], None] = None,
+                 cache=None):
         self.progress_callback = progress_callback
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.session = SESSION
+        # Optional DatabaseManager used for conditional requests
+        self.cache = cache
 
     def _log(self, message: str):
         if self.progress_callback:
@@ -33,7 +125,8 @@ class PostCrawler:
             page_size: Number of posts per page
 
         Returns:
-            List of dicts with id, blog_id, title, post_url
+            List of dicts with id, blog_id, title, post_url and, from the
+            list API, comment_count
         """
         all_posts = []
         current_page = 1
@@ -51,7 +144,6 @@ class PostCrawler:
                 break
 
             current_page += 1
-            time.sleep(REQUEST_DELAY)
 
         self._log(f"총 {len(all_posts)}개 글 목록 수집 완료")
         return all_posts
@@ -66,7 +158,8 @@ class PostCrawler:
                f"&countPerPage={page_size}")
 
         try:
-            resp = self.session.get(url, timeout=15)
+            resp = fetch_with_retry(url, session=self.session,
+                                    timeout=15)
             resp.raise_for_status()
 
             # The response is a JS-like format, parse it
@@ -93,14 +186,15 @@ class PostCrawler:
         # The response may contain invalid escapes like \' in HTML fragments
         try:
             sanitized = text.replace("\\'", "'")
-            data = json.loads(sanitized)
+            data = _loads(sanitized.encode('utf-8'))
             post_list = data.get('postList', [])
             for item in post_list:
                 log_no = str(item.get('logNo', ''))
                 if not log_no:
                     continue
                 title = item.get('title', '')
-                if title:
+                # Titles are form-encoded; clean ones need no unquoting
+                if title and ('%' in title or '+' in title):
                     title = unquote_plus(title)
                 post_url = f"https://blog.naver.com/{blog_id}/{log_no}"
                 posts.append({
@@ -109,21 +203,23 @@ class PostCrawler:
                     'title': title or None,
                     'post_url': post_url,
                     'log_no': log_no,
+                    # Lets the comments step spot an empty API answer
+                    'comment_count': _to_int(item.get('commentCount')),
                 })
             return posts
         except (json.JSONDecodeError, ValueError):
             pass
 
         # Fallback: regex extraction
-        log_nos = re.findall(r'"logNo"\s*:\s*"?(\d+)"?', text)
-        titles = re.findall(r'"title"\s*:\s*"([^"]*)"', text)
+        log_nos = _RE_LOG_NO.findall(text)
+        titles = _RE_TITLE_JSON.findall(text)
 
         if not log_nos:
-            log_nos = re.findall(r'logNo=(\d+)', text)
+            log_nos = _RE_LOG_NO_PARAM.findall(text)
 
         for i, log_no in enumerate(log_nos):
             title = titles[i] if i < len(titles) else None
-            if title:
+            if title and ('%' in title or '+' in title):
                 title = unquote_plus(title)
 
             post_url = f"https://blog.naver.com/{blog_id}/{log_no}"
@@ -145,36 +241,57 @@ class PostCrawler:
                f"&categoryNo=0&currentPage={page}")
 
         try:
-            resp = self.session.get(url, timeout=15)
+            resp = fetch_with_retry(url, session=self.session,
+                                    timeout=15)
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            # Single regex pass over the raw HTML, no DOM needed
+            pairs = [(m.group(1), html.unescape(m.group(2)).strip())
+                     for m in _post_link_pattern(blog_id).finditer(resp.text)]
+            if not pairs:
+                pairs = self._post_links_from_dom(resp.text, blog_id)
 
             posts = []
-            # Find post links
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                match = re.search(
-                    rf'/{blog_id}/(\d+)', href
-                )
-                if match:
-                    log_no = match.group(1)
-                    post_id = f"{blog_id}_{log_no}"
-                    # Avoid duplicates
-                    if not any(p['id'] == post_id for p in posts):
-                        title = link.get_text(strip=True) or None
-                        posts.append({
-                            'id': post_id,
-                            'blog_id': blog_id,
-                            'title': title if title and len(title) > 1 else None,
-                            'post_url': f"https://blog.naver.com/{blog_id}/{log_no}",
-                            'log_no': log_no,
-                        })
+            seen_ids = set()
+            for log_no, title in pairs:
+                post_id = f"{blog_id}_{log_no}"
+                # Avoid duplicates
+                if post_id in seen_ids:
+                    continue
+                seen_ids.add(post_id)
+                posts.append({
+                    'id': post_id,
+                    'blog_id': blog_id,
+                    'title': title if title and len(title) > 1 else None,
+                    'post_url': f"https://blog.naver.com/{blog_id}/{log_no}",
+                    'log_no': log_no,
+                })
 
             return posts
 
         except requests.RequestException:
             return []
 
+    def _post_links_from_dom(self, text: str,
+                             blog_id: str) -> List[Tuple[str, str]]:
+        """(log_no, title) pairs of post links found by an HTML parser."""
+        # (href, get_text) pairs from whichever parser is available
+        if LexborHTMLParser is not None:
+            nodes = LexborHTMLParser(text).css('a[href]')
+            links = [(n.attributes.get('href') or '', n.text)
+                     for n in nodes]
+        else:
+            soup = BeautifulSoup(text, HTML_PARSER)
+            links = [(a['href'], a.get_text)
+                     for a in soup.find_all('a', href=True)]
+
+        pairs = []
+        href_pattern = _post_href_pattern(blog_id)
+        for href, get_text in links:
+            match = href_pattern.search(href)
+            if match:
+                pairs.append((match.group(1), get_text(strip=True)))
+        return pairs
+
     def get_post_content(self, blog_id: str,
                          log_no: str) -> Optional[Dict[str, Any]]:
         """Fetch a single post's full content using mobile version.
@@ -186,23 +303,71 @@ class PostCrawler:
         Returns:
             Dict with title, content, category, post_date or None
         """
+        result, cache_entry = self.fetch_post_content(blog_id, log_no)
+        if cache_entry:
+            self.cache.set_http_cache(*cache_entry)
+        return result
+
+    def fetch_post_content(self, blog_id: str, log_no: str
+                           ) -> Tuple[Optional[Dict[str, Any]],
+                                      Optional[tuple]]:
+        """get_post_content without the cache write.
+
+        The cache is only read, so worker threads can fetch while a
+        single thread does every database write.
+
+        Returns:
+            (content, cache_entry) where cache_entry holds the
+            set_http_cache arguments to store, or None
+        """
         url = f"https://m.blog.naver.com/{blog_id}/{log_no}"
 
+        entry = self.cache.get_http_cache(url) if self.cache else None
+
         try:
-            resp = self.session.get(url, timeout=15)
+            resp = fetch_with_retry(url, session=self.session,
+                                    headers=conditional_headers(entry),
+                                    timeout=15)
+            if resp.status_code == 304 and entry and entry.get('data'):
+                return json.loads(entry['data']), None
             resp.raise_for_status()
         except requests.RequestException as e:
             self._log(f"글 내용 가져오기 실패 ({log_no}): {e}")
-            return None
+            return None, None
+
+        result = self._parse_post_content(resp.text)
+
+        # Without a validator the entry could never be answered by a 304
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+        cache_entry = None
+        if self.cache and (etag or last_modified):
+            cache_entry = (url, etag, last_modified,
+                           json.dumps(result, ensure_ascii=False))
+
+        return result, cache_entry
+
+    def _parse_post_content(self, text: str) -> Dict[str, Any]:
+        """Extract title, content, category and date from a post page."""
+        if LexborHTMLParser is not None:
+            return self._extract_post_lexbor(text)
 
-        soup = BeautifulSoup(resp.text, 'html.parser')
+        soup = BeautifulSoup(text, HTML_PARSER, parse_only=_POST_STRAINER)
 
         title = self._extract_title(soup)
         content = self._extract_content(soup)
         category = self._extract_category(soup)
         post_date = self._extract_date(soup)
 
-        time.sleep(REQUEST_DELAY)
+        # Extracted values are plain str, so the tree can be freed now
+        soup.decompose()
+
+        # Fall back to a full parse for the postViewArea/og:* fallbacks
+        if title is None or content is None:
+            soup = BeautifulSoup(text, HTML_PARSER)
+            title = title or self._extract_title(soup)
+            content = content or self._extract_content(soup)
+            soup.decompose()
 
         return {
             'title': title,
@@ -211,18 +376,69 @@ class PostCrawler:
             'post_date': post_date,
         }
 
+    def _extract_post_lexbor(self, html: str) -> Dict[str, Any]:
+        """Extract title, content, category and date with selectolax."""
+        tree = LexborHTMLParser(html)
+        return {
+            'title': self._extract_title_lexbor(tree),
+            'content': self._extract_content_lexbor(tree),
+            'category': self._first_text_lexbor(tree, _CATEGORY_SELECTORS),
+            'post_date': self._extract_date_lexbor(tree),
+        }
+
+    def _first_text_lexbor(self, tree, selectors) -> Optional[str]:
+        """Text of the first selector match that has any text."""
+        for selector in selectors:
+            node = tree.css_first(selector)
+            if node is not None:
+                text = node.text(strip=True)
+                if text:
+                    return text
+        return None
+
+    def _meta_content_lexbor(self, tree, prop: str) -> Optional[str]:
+        """Content of an og:* meta tag, if present."""
+        node = tree.css_first(f'meta[property="{prop}"]')
+        content = node.attributes.get('content') if node is not None else None
+        return content.strip() if content else None
+
+    def _extract_title_lexbor(self, tree) -> Optional[str]:
+        """Extract post title from a selectolax tree."""
+        return (self._first_text_lexbor(tree, _TITLE_SELECTORS)
+                or self._meta_content_lexbor(tree, 'og:title'))
+
+    def _extract_content_lexbor(self, tree) -> Optional[str]:
+        """Extract post body text from a selectolax tree."""
+        for selector in _CONTENT_SELECTORS:
+            elem = tree.css_first(selector)
+            if elem is None:
+                continue
+
+            for tag in elem.css('script, style'):
+                tag.decompose()
+
+            paragraphs = [p.text(strip=True)
+                          for p in elem.css(_SE_TEXT_SELECTOR)]
+            paragraphs = [p for p in paragraphs if p]
+            if paragraphs:
+                return '\n'.join(paragraphs)
+
+            text = elem.text(separator='\n', strip=True)
+            if text:
+                return text
+
+        return self._meta_content_lexbor(tree, 'og:description')
+
+    def _extract_date_lexbor(self, tree) -> Optional[str]:
+        """Extract post date from a selectolax tree."""
+        text = self._first_text_lexbor(tree, _DATE_SELECTORS)
+        return text.replace('/', '.').strip() if text else None
+
     def _extract_title(self, soup: BeautifulSoup) -> Optional[str]:
         """Extract post title."""
         # Mobile version selectors
-        for selector in [
-            'div.se-title-text',
-            'h3.se_textarea',
-            'div.tit_h3',
-            'div.__se_title_area',
-            'h3.tit_view',
-            'div.se-module-text h3',
-        ]:
-            elem = soup.select_one(selector)
+        for selector in _TITLE_SELECTORS:
+            elem = compile_sel(selector).select_one(soup)
             if elem:
                 text = elem.get_text(strip=True)
                 if text:
@@ -238,14 +454,8 @@ class PostCrawler:
     def _extract_content(self, soup: BeautifulSoup) -> Optional[str]:
         """Extract post body text content."""
         # Smart Editor ONE (SE) content area
-        for selector in [
-            'div.se-main-container',
-            'div.__se_component_area',
-            'div.post-view',
-            'div#postViewArea',
-            'div.se_component_wrap',
-        ]:
-            elem = soup.select_one(selector)
+        for selector in _CONTENT_SELECTORS:
+            elem = compile_sel(selector).select_one(soup)
             if elem:
                 # Remove script/style tags
                 for tag in elem.find_all(['script', 'style']):
@@ -254,9 +464,7 @@ class PostCrawler:
                 # Get text with paragraph breaks
                 paragraphs = []
                 for p in elem.find_all(['p', 'div', 'span'],
-                                       class_=re.compile(
-                                           r'se-text|se-module-text'
-                                       )):
+                                       class_=_RE_SE_TEXT_CLASS):
                     text = p.get_text(strip=True)
                     if text:
                         paragraphs.append(text)
@@ -278,14 +486,8 @@ class PostCrawler:
 
     def _extract_category(self, soup: BeautifulSoup) -> Optional[str]:
         """Extract post category."""
-        for selector in [
-            'a.blog_ctg',
-            'em.category',
-            'a.pcol2',
-            'span.cate',
-            'a[class*="category"]',
-        ]:
-            elem = soup.select_one(selector)
+        for selector in _CATEGORY_SELECTORS:
+            elem = compile_sel(selector).select_one(soup)
             if elem:
                 text = elem.get_text(strip=True)
                 if text:
@@ -295,14 +497,8 @@ class PostCrawler:
 
     def _extract_date(self, soup: BeautifulSoup) -> Optional[str]:
         """Extract post date."""
-        for selector in [
-            '.blog_date',
-            'span.se_publishDate',
-            'span.date',
-            'p.date',
-            'span[class*="date"]',
-        ]:
-            elem = soup.select_one(selector)
+        for selector in _DATE_SELECTORS:
+            elem = compile_sel(selector).select_one(soup)
             if elem:
                 text = elem.get_text(strip=True)
                 if text:
@@ -0,0 +1,82 @@
+"""Adaptive token-bucket rate limiter shared by all crawlers."""
+
+import threading
+import time
+
+from config import (
+    REQUEST_DELAY, RATE_LIMIT_BURST, RATE_LIMIT_MAX_RATE, RATE_LIMIT_MIN_RATE
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket with AIMD-style rate adaptation.
+
+    Successful responses slowly raise the refill rate up to ``max_rate``;
+    throttling responses (429/5xx) empty the bucket and cut the rate.
+    """
+
+    def __init__(self, rate: float, capacity: float, max_rate: float,
+                 min_rate: float, increase_step: float = 0.1,
+                 increase_factor: float = 1.05,
+                 decrease_factor: float = 2.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase_step = increase_step
+        self.increase_factor = increase_factor
+        self.decrease_factor = decrease_factor
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def increase_rate(self):
+        """Additively refill and multiplicatively raise the rate."""
+        with self.lock:
+            self.tokens = min(self.capacity,
+                              self.tokens + self.increase_step)
+            self.rate = min(self.rate * self.increase_factor, self.max_rate)
+
+    def decrease_rate(self):
+        """Drain the bucket and back off the rate."""
+        with self.lock:
+            self.tokens = 0
+            self.last_refill = time.monotonic()
+            self.rate = max(self.min_rate, self.rate / self.decrease_factor)
+
+    def observe(self, status_code: int):
+        """Adapt the rate to an HTTP response status."""
+        if status_code == 429 or status_code >= 500:
+            self.decrease_rate()
+        elif 200 <= status_code < 300:
+            self.increase_rate()
+
+
+RATE_LIMITER = TokenBucket(
+    rate=1 / REQUEST_DELAY,
+    capacity=RATE_LIMIT_BURST,
+    max_rate=RATE_LIMIT_MAX_RATE,
+    min_rate=RATE_LIMIT_MIN_RATE,
+)
+
+
+def observe_response(resp, *args, **kwargs):
+    """requests response hook feeding statuses into RATE_LIMITER."""
+    RATE_LIMITER.observe(resp.status_code)
@@ -1,12 +1,67 @@
 """Reaction (공감) crawler for Naver Blog posts."""
 
-import re
+import asyncio
 import json
-import time
 import requests
 from typing import Optional, Dict, Any, List, Callable
-
-from config import HEADERS, REQUEST_DELAY
+from urllib.parse import quote
+
+from config import HEADERS
+from crawler.http import SESSION, RETRY_STATUSES, fetch_with_retry
+from crawler.ratelimit import RATE_LIMITER
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+_LIKE_API_URL = ("https://apis.naver.com/blogserver/like/v1/search/contents"
+                 "?suppress_response_codes=true&pool=blogid"
+                 "&q={q}&isDuplication=false&cssIds=BLOG_PC")
+
+# [className, count text] of each reaction in the sympathy area, or null
+# when the page has none; avoids shipping page_source over WebDriver
+_SYMPATHY_JS = """
+var area = document.querySelector('div.area_sympathy');
+if (!area) { return null; }
+return Array.from(area.querySelectorAll('.u_likeit_list')).map(function (e) {
+    var count = e.querySelector('._count');
+    return [e.className, count ? count.innerText.trim() : null];
+});
+"""
+
+
+# Reaction type codes (lowercase) to their Korean labels
+_REACTION_MAP = {
+    'like': '좋아요',
+    'sympathy': '공감',
+    'cheer': '응원해요',
+    'congrats': '축하해요',
+    'love': '사랑해요',
+    'wow': '놀라워요',
+    'sad': '슬퍼요',
+    'angry': '화나요',
+    'fun': '재미있어요',
+    'useful': '유용해요',
+    'creative': '창의적이에요',
+    'touching': '감동이에요',
+    'impressive': '칭찬해요',
+    'interesting': '흥미로워요',
+    'thanks': '고마워요',
+    'haha': '웃겨요',
+}
 
 
 class ReactionCrawler:
@@ -14,8 +69,7 @@ class ReactionCrawler:
 
     def __init__(self, progress_callback: Callable[[str], None] = None):
         self.progress_callback = progress_callback
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.session = SESSION
 
     def _log(self, message: str):
         if self.progress_callback:
@@ -39,105 +93,158 @@ class ReactionCrawler:
         # Fallback: scrape from post page via Selenium
         return self._fetch_from_selenium(blog_id, log_no)
 
+    async def get_reactions_many(
+            self, blog_id: str, log_nos: List[str],
+            concurrency: int = 16) -> List[Optional[Dict[str, Any]]]:
+        """Fetch reactions for several posts of one blog concurrently.
+
+        Like API requests overlap on one pooled httpx.AsyncClient; posts
+        the API can't answer fall back to Selenium on pooled drivers.
+
+        Returns:
+            Results in the same order as log_nos
+        """
+        if httpx is None:
+            return [self.get_reactions(blog_id, log_no) for log_no in log_nos]
+
+        semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(max_keepalive_connections=20,
+                              max_connections=100)
+
+        async with httpx.AsyncClient(http2=_HTTP2, headers=HEADERS,
+                                     limits=limits, timeout=10) as client:
+            async def fetch(log_no: str) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    return await self._afetch_from_like_api(client, blog_id,
+                                                            log_no)
+
+            results = await asyncio.gather(*[fetch(n) for n in log_nos])
+
+        if all(result is not None for result in results):
+            return results
+
+        # Misses each borrow a pooled driver; cap them at POOL_SIZE so the
+        # rest wait here rather than in to_thread's worker threads
+        from crawler.selenium_helper import POOL_SIZE
+        drivers = asyncio.Semaphore(POOL_SIZE)
+
+        async def fallback(log_no: str, result):
+            if result is not None:
+                return result
+            async with drivers:
+                return await asyncio.to_thread(self._fetch_from_selenium,
+                                               blog_id, log_no)
+
+        return list(await asyncio.gather(
+            *[fallback(n, r) for n, r in zip(log_nos, results)]
+        ))
+
+    def _like_api_request(self, blog_id: str, log_no: str):
+        """URL and headers for the blogserver like API."""
+        url = _LIKE_API_URL.format(q=quote(f"BLOG[{blog_id}_{log_no}]"))
+        # Both clients already send HEADERS; only the Referer varies
+        headers = {'Referer': f'https://blog.naver.com/{blog_id}/{log_no}'}
+        return url, headers
+
     def _fetch_from_like_api(self, blog_id: str,
                              log_no: str) -> Optional[Dict[str, Any]]:
         """Fetch reactions via Naver's blogserver like API."""
-        from urllib.parse import quote
-
-        q_param = quote(f"BLOG[{blog_id}_{log_no}]")
-        url = (f"https://apis.naver.com/blogserver/like/v1/search/contents"
-               f"?suppress_response_codes=true&pool=blogid"
-               f"&q={q_param}&isDuplication=false&cssIds=BLOG_PC")
-
-        headers = {
-            **HEADERS,
-            'Referer': f'https://blog.naver.com/{blog_id}/{log_no}',
-        }
+        url, headers = self._like_api_request(blog_id, log_no)
 
         try:
-            resp = self.session.get(url, headers=headers, timeout=10)
+            resp = fetch_with_retry(url, session=self.session,
+                                    headers=headers, timeout=10)
             resp.raise_for_status()
-            data = json.loads(resp.text)
-
-            contents = data.get('contents', [])
-            if not contents:
-                return {'total_count': 0, 'reactions': []}
+            return self._parse_like_api(_loads(resp.content))
+        except (requests.RequestException, ValueError, KeyError):
+            return None
 
-            content = contents[0]
-            reaction_list = content.get('reactions', [])
+    async def _afetch_from_like_api(self, client, blog_id: str,
+                                    log_no: str) -> Optional[Dict[str, Any]]:
+        """Async variant of _fetch_from_like_api on a shared client."""
+        url, headers = self._like_api_request(blog_id, log_no)
 
-            reactions = []
-            total_count = 0
-            for r in reaction_list:
-                rtype = r.get('reactionType', '')
-                count = r.get('count', 0)
-                if count > 0:
-                    reactions.append({
-                        'reaction_type': self._map_reaction_type(rtype),
-                        'count': count,
-                    })
-                    total_count += count
+        try:
+            # Token bucket sleeps, so wait for it off the event loop
+            await asyncio.to_thread(RATE_LIMITER.acquire)
+            resp = await client.get(url, headers=headers)
+            RATE_LIMITER.observe(resp.status_code)
+            if resp.status_code in RETRY_STATUSES:
+                return None
+            resp.raise_for_status()
+            return self._parse_like_api(_loads(resp.content))
+        except (httpx.HTTPError, ValueError, KeyError):
+            return None
 
-            return {
-                'total_count': total_count,
-                'reactions': reactions,
-            }
+    def _parse_like_api(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a like API response to the reactions dict."""
+        contents = data.get('contents', [])
+        if not contents:
+            return {'total_count': 0, 'reactions': []}
 
-        except (requests.RequestException, json.JSONDecodeError, KeyError):
-            return None
+        content = contents[0]
+        reaction_list = content.get('reactions', [])
+
+        reactions = []
+        total_count = 0
+        for r in reaction_list:
+            rtype = r.get('reactionType', '')
+            count = r.get('count', 0)
+            if count > 0:
+                reactions.append({
+                    'reaction_type': self._map_reaction_type(rtype),
+                    'count': count,
+                })
+                total_count += count
+
+        return {
+            'total_count': total_count,
+            'reactions': reactions,
+        }
 
     def _fetch_from_selenium(self, blog_id: str,
                              log_no: str) -> Optional[Dict[str, Any]]:
         """Fallback: extract reactions from Selenium-rendered page."""
         try:
-            from crawler.selenium_helper import get_shared_driver
-            from bs4 import BeautifulSoup
-
-            driver = get_shared_driver()
-            url = f"https://blog.naver.com/{blog_id}/{log_no}"
-            driver.get(url)
-            time.sleep(3)
-
-            try:
-                from selenium.webdriver.common.by import By
-                iframe = driver.find_element(By.ID, 'mainFrame')
-                driver.switch_to.frame(iframe)
-            except Exception:
-                pass
-
-            # Wait for reaction counts to load
-            for _ in range(5):
-                src = driver.page_source
-                counts = re.findall(
-                    r'u_likeit_list_count[^>]*>(\d+)<', src
-                )
-                non_zero = [c for c in counts if c != '0']
-                if non_zero:
-                    break
-                time.sleep(1)
-
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            driver.switch_to.default_content()
-
-            sympathy_area = soup.select_one('div.area_sympathy')
-            if not sympathy_area:
-                return {'total_count': 0, 'reactions': []}
+            from crawler.selenium_helper import borrow_driver
+
+            from selenium.common.exceptions import TimeoutException
+            from selenium.webdriver.support.ui import WebDriverWait
+
+            with borrow_driver() as driver:
+                url = f"https://blog.naver.com/{blog_id}/{log_no}"
+                driver.get(url)
+
+                try:
+                    from selenium.webdriver.common.by import By
+                    iframe = driver.find_element(By.ID, 'mainFrame')
+                    driver.switch_to.frame(iframe)
+                except Exception:
+                    pass
+
+                # Poll and extract in one round-trip until a count is non-zero
+                try:
+                    items = WebDriverWait(
+                        driver, 8, poll_frequency=0.25
+                    ).until(self._rendered_sympathy_items)
+                except TimeoutException:
+                    return {'total_count': 0, 'reactions': []}
+                finally:
+                    driver.switch_to.default_content()
 
             reactions = []
             total_count = 0
             seen_types = set()
 
-            for item in sympathy_area.select('.u_likeit_list'):
-                classes = [c for c in item.get('class', [])
+            for class_name, count_text in items:
+                classes = [c for c in (class_name or '').split()
                            if c != 'u_likeit_list']
                 rtype = classes[0] if classes else None
                 if not rtype or rtype in seen_types:
                     continue
                 seen_types.add(rtype)
 
-                count_el = item.select_one('._count')
-                count = int(count_el.get_text(strip=True) or '0') \
-                    if count_el else 0
+                count = int(count_text or '0')
 
                 if count > 0:
                     reactions.append({
@@ -154,24 +261,14 @@ class ReactionCrawler:
         except Exception:
             return {'total_count': 0, 'reactions': []}
 
-    def _map_reaction_type(self, code: str) -> str:
+    def _rendered_sympathy_items(self, driver) -> Optional[List[list]]:
+        """WebDriverWait condition: reaction items once a count is non-zero."""
+        items = driver.execute_script(_SYMPATHY_JS)
+        if items and any(count not in (None, '', '0') for _, count in items):
+            return items
+        return None
+
+    @staticmethod
+    def _map_reaction_type(code: str) -> str:
         """Map reaction type code to Korean name."""
-        mapping = {
-            'like': '좋아요',
-            'sympathy': '공감',
-            'cheer': '응원해요',
-            'congrats': '축하해요',
-            'love': '사랑해요',
-            'wow': '놀라워요',
-            'sad': '슬퍼요',
-            'angry': '화나요',
-            'fun': '재미있어요',
-            'useful': '유용해요',
-            'creative': '창의적이에요',
-            'touching': '감동이에요',
-            'impressive': '칭찬해요',
-            'interesting': '흥미로워요',
-            'thanks': '고마워요',
-            'haha': '웃겨요',
-        }
-        return mapping.get(code.lower(), code)
+        return _REACTION_MAP.get(code.lower(), code)
@@ -0,0 +1,11 @@
+"""Cached CSS selectors for the crawler parsers."""
+
+import functools
+
+import soupsieve
+
+
+@functools.lru_cache(maxsize=256)
+def compile_sel(selector: str) -> soupsieve.SoupSieve:
+    """Compile a CSS selector once per process."""
+    return soupsieve.compile(selector)
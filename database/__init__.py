@@ -1,5 +1,6 @@
 """Database package for Naver Blog Crawler."""
 
 from database.manager import DatabaseManager
+from database.models import Record
 
-__all__ = ['DatabaseManager']
+__all__ = ['DatabaseManager', 'Record']
@@ -1,25 +1,131 @@
 """Database manager for CRUD operations and progress tracking."""
 
+import logging
 import sqlite3
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import threading
+from contextlib import contextmanager
+from typing import (Optional, List, Dict, Any, Iterable, Iterator, Set,
+                    Tuple)
 from pathlib import Path
 
-from database.models import init_database
+from database.models import Record, connect, init_database
 from config import DATABASE_PATH, Status, CrawlStep
 
+logger = logging.getLogger(__name__)
+
+# Rows per fetchmany() call when streaming large result sets
+FETCH_BATCH_SIZE = 512
+
+# Shared by add_posts_batch and add_post_fast so sqlite3's statement
+# cache, keyed on the exact SQL text, reuses one prepared statement
+_INSERT_POST_SQL = """
+    INSERT OR IGNORE INTO posts
+    (id, blog_id, log_no, title, post_url, comment_count)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_COMMENT_SQL = """
+    INSERT INTO comments
+    (id, post_id, parent_id, author, content, like_count, written_at, is_reply)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO NOTHING
+"""
+
+
+def _log_no_from_id(post_id: str) -> str:
+    """Extract log_no from post id (format: blogId_logNo)."""
+    return post_id.split('_', 1)[-1] if '_' in post_id else post_id
+
+
+class _ThreadState(threading.local):
+    """Each thread's own connection and transaction() nesting depth."""
+
+    def __init__(self):
+        self.conn = None
+        self.tx_depth = 0
+
 
 class DatabaseManager:
-    """Manages all database operations for the Naver Blog Crawler."""
+    """Manages all database operations for the Naver Blog Crawler.
+
+    Every thread gets its own connection, so in WAL mode the UI thread's
+    reads don't queue behind the crawler thread's writes.
 
-    def __init__(self, db_path: Path = DATABASE_PATH):
+    test_mode=True turns off journaling and fsync for throwaway databases.
+    """
+
+    def __init__(self, db_path: Path = DATABASE_PATH,
+                 test_mode: bool = False):
         self.db_path = db_path
-        self.conn = init_database(db_path)
+        self.test_mode = test_mode
+        self._local = _ThreadState()
+        self._conns: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._conns_lock = threading.Lock()
+        self._register(init_database(db_path, test_mode))
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use."""
+        conn = self._local.conn
+        if conn is None:
+            conn = self._register(connect(self.db_path, self.test_mode))
+        return conn
+
+    def _register(self, conn: sqlite3.Connection) -> sqlite3.Connection:
+        """Make conn the calling thread's connection."""
+        with self._conns_lock:
+            # Crawl and fetch threads come and go; close what they left
+            for thread in [t for t in self._conns if not t.is_alive()]:
+                self._conns.pop(thread).close()
+            self._conns[threading.current_thread()] = conn
+        self._local.conn = conn
+        return conn
 
     def close(self):
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
+        """Close every thread's database connection."""
+        with self._conns_lock:
+            for conn in self._conns.values():
+                conn.close()
+            self._conns.clear()
+        self._local.conn = None
+
+    def _commit(self):
+        """Commit now unless a transaction() block will commit later."""
+        if not self._local.tx_depth:
+            self.conn.commit()
+
+    def flush(self):
+        """Commit writes left pending by add_post_fast()."""
+        self._commit()
+
+    @contextmanager
+    def transaction(self):
+        """Group several writes into one commit (rolled back on error)."""
+        state = self._local
+        if not state.tx_depth and not self.conn.in_transaction:
+            # Take the write lock up front rather than on the first write
+            self.conn.execute("BEGIN IMMEDIATE")
+        state.tx_depth += 1
+        try:
+            yield self
+        except Exception:
+            state.tx_depth -= 1
+            if not state.tx_depth:
+                self.conn.rollback()
+            raise
+        state.tx_depth -= 1
+        if not state.tx_depth:
+            self.conn.commit()
+
+    @staticmethod
+    def _iter_rows(cursor: sqlite3.Cursor,
+                   size: int = FETCH_BATCH_SIZE) -> Iterator[Record]:
+        """Yield a cursor's rows, fetching them size at a time."""
+        while True:
+            batch = cursor.fetchmany(size)
+            if not batch:
+                break
+            yield from batch
 
     # ==================== Blog Operations ====================
 
@@ -32,31 +138,47 @@ class DatabaseManager:
                 INSERT INTO blogs (id, blog_name, author_name, url, post_count, status)
                 VALUES (?, ?, ?, ?, ?, ?)
             """, (blog_id, blog_name, author_name, url, post_count, Status.PENDING))
-            self.conn.commit()
+            self._commit()
             return True
         except sqlite3.IntegrityError:
             return False
 
-    def get_blog(self, blog_id: str) -> Optional[Dict[str, Any]]:
+    def get_blog(self, blog_id: str) -> Optional[Record]:
         """Get blog information by ID."""
         cursor = self.conn.cursor()
         cursor.execute("SELECT * FROM blogs WHERE id = ?", (blog_id,))
         row = cursor.fetchone()
-        return dict(row) if row else None
-
-    def get_all_blogs(self) -> List[Dict[str, Any]]:
+        return row
+
+    def get_blogs_by_ids(self, blog_ids: List[str]) -> List[Record]:
+        """Get the blogs with the given IDs that exist, in one query."""
+        blogs = []
+        # Stay under SQLite's default 999 bound-parameter limit
+        for start in range(0, len(blog_ids), 500):
+            chunk = blog_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor = self.conn.execute(
+                f"SELECT * FROM blogs WHERE id IN ({placeholders})", chunk
+            )
+            blogs.extend(cursor.fetchall())
+        return blogs
+
+    def get_all_blogs(self) -> List[Record]:
         """Get all blogs from the database."""
+        return list(self.iter_all_blogs())
+
+    def iter_all_blogs(self) -> Iterator[Record]:
+        """Yield all blogs without loading them all at once."""
         cursor = self.conn.cursor()
         cursor.execute("SELECT * FROM blogs ORDER BY created_at DESC")
-        return [dict(row) for row in cursor.fetchall()]
+        return self._iter_rows(cursor)
 
     def update_blog_status(self, blog_id: str, status: str) -> bool:
         """Update blog crawling status."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE blogs SET status = ? WHERE id = ?
-        """, (status, blog_id))
-        self.conn.commit()
+        cursor = self.conn.execute(
+            "UPDATE blogs SET status = ? WHERE id = ?", (status, blog_id)
+        )
+        self._commit()
         return cursor.rowcount > 0
 
     def update_blog_post_count(self, blog_id: str, count: int) -> bool:
@@ -65,7 +187,7 @@ class DatabaseManager:
         cursor.execute("""
             UPDATE blogs SET post_count = ? WHERE id = ?
         """, (count, blog_id))
-        self.conn.commit()
+        self._commit()
         return cursor.rowcount > 0
 
     def update_blog_info(self, blog_id: str, blog_name: str = None,
@@ -86,21 +208,22 @@ class DatabaseManager:
         cursor.execute(f"""
             UPDATE blogs SET {', '.join(updates)} WHERE id = ?
         """, params)
-        self.conn.commit()
+        self._commit()
         return cursor.rowcount > 0
 
     def delete_blog(self, blog_id: str) -> bool:
         """Delete a blog and all associated data."""
         cursor = self.conn.cursor()
 
-        # Get all post IDs for this blog
-        cursor.execute("SELECT id FROM posts WHERE blog_id = ?", (blog_id,))
-        post_ids = [row['id'] for row in cursor.fetchall()]
-
-        # Delete comments and reactions for all posts
-        for post_id in post_ids:
-            cursor.execute("DELETE FROM comments WHERE post_id = ?", (post_id,))
-            cursor.execute("DELETE FROM reactions WHERE post_id = ?", (post_id,))
+        # Delete comments and reactions for all posts in one statement each
+        cursor.execute("""
+            DELETE FROM comments
+            WHERE post_id IN (SELECT id FROM posts WHERE blog_id = ?)
+        """, (blog_id,))
+        cursor.execute("""
+            DELETE FROM reactions
+            WHERE post_id IN (SELECT id FROM posts WHERE blog_id = ?)
+        """, (blog_id,))
 
         # Delete posts
         cursor.execute("DELETE FROM posts WHERE blog_id = ?", (blog_id,))
@@ -111,7 +234,7 @@ class DatabaseManager:
         # Delete blog
         cursor.execute("DELETE FROM blogs WHERE id = ?", (blog_id,))
 
-        self.conn.commit()
+        self._commit()
         return True
 
     # ==================== Post Operations ====================
@@ -122,49 +245,77 @@ class DatabaseManager:
         try:
             cursor = self.conn.cursor()
             cursor.execute("""
-                INSERT INTO posts (id, blog_id, title, post_url)
-                VALUES (?, ?, ?, ?)
-            """, (post_id, blog_id, title, post_url))
-            self.conn.commit()
+                INSERT INTO posts (id, blog_id, log_no, title, post_url)
+                VALUES (?, ?, ?, ?, ?)
+            """, (post_id, blog_id, _log_no_from_id(post_id), title,
+                  post_url))
+            self._commit()
             return True
         except sqlite3.IntegrityError:
             return False
 
     def add_posts_batch(self, posts: List[Dict[str, Any]]) -> int:
-        """Add multiple posts in a batch."""
-        cursor = self.conn.cursor()
-        added = 0
-        for post in posts:
-            try:
-                cursor.execute("""
-                    INSERT INTO posts (id, blog_id, title, post_url)
-                    VALUES (?, ?, ?, ?)
-                """, (post['id'], post['blog_id'],
-                      post.get('title'), post.get('post_url')))
-                added += 1
-            except sqlite3.IntegrityError:
-                pass
-        self.conn.commit()
-        return added
+        """Add multiple posts in a batch, skipping existing IDs."""
+        rows = ((post['id'], post['blog_id'],
+                 post.get('log_no') or _log_no_from_id(post['id']),
+                 post.get('title'), post.get('post_url'),
+                 post.get('comment_count') or 0)
+                for post in posts)
+        try:
+            with self.transaction():
+                cursor = self.conn.executemany(_INSERT_POST_SQL, rows)
+        except sqlite3.Error:
+            return 0
+        return cursor.rowcount
+
+    def add_post_fast(self, post_id: str, blog_id: str, title: str = None,
+                      post_url: str = None, comment_count: int = 0) -> bool:
+        """Insert a post, skipping existing IDs, without committing.
+
+        For loops of single inserts; call flush() once afterwards.
+        """
+        cursor = self.conn.execute(
+            _INSERT_POST_SQL,
+            (post_id, blog_id, _log_no_from_id(post_id), title, post_url,
+             comment_count)
+        )
+        return cursor.rowcount > 0
 
-    def get_post(self, post_id: str) -> Optional[Dict[str, Any]]:
+    def get_post(self, post_id: str) -> Optional[Record]:
         """Get post information by ID."""
         cursor = self.conn.cursor()
         cursor.execute("SELECT * FROM posts WHERE id = ?", (post_id,))
         row = cursor.fetchone()
-        return dict(row) if row else None
-
-    def get_blog_posts(self, blog_id: str) -> List[Dict[str, Any]]:
+        return row
+
+    def existing_post_ids(self, post_ids: List[str]) -> Set[str]:
+        """Return which of post_ids are already stored, in few queries."""
+        existing = set()
+        # Stay under SQLite's default 999 bound-parameter limit
+        for start in range(0, len(post_ids), 500):
+            chunk = post_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor = self.conn.execute(
+                f"SELECT id FROM posts WHERE id IN ({placeholders})", chunk
+            )
+            existing.update(row['id'] for row in cursor)
+        return existing
+
+    def get_blog_posts(self, blog_id: str) -> List[Record]:
         """Get all posts for a blog."""
+        return list(self.iter_blog_posts(blog_id))
+
+    def iter_blog_posts(self, blog_id: str) -> Iterator[Record]:
+        """Yield a blog's posts without loading them all at once."""
         cursor = self.conn.cursor()
         cursor.execute("""
             SELECT * FROM posts WHERE blog_id = ?
-            ORDER BY created_at
+            ORDER BY created_at, rowid
         """, (blog_id,))
-        return [dict(row) for row in cursor.fetchall()]
+        return self._iter_rows(cursor)
 
     def get_posts_by_status(self, blog_id: str,
-                            crawl_status: str = None) -> List[Dict[str, Any]]:
+                            crawl_status: str = None) -> List[Record]:
         """Get posts filtered by crawl status."""
         cursor = self.conn.cursor()
         conditions = ["blog_id = ?"]
@@ -176,7 +327,7 @@ class DatabaseManager:
 
         query = f"SELECT * FROM posts WHERE {' AND '.join(conditions)}"
         cursor.execute(query, params)
-        return [dict(row) for row in cursor.fetchall()]
+        return cursor.fetchall()
 
     def update_post_content(self, post_id: str, title: str = None,
                             content: str = None, category: str = None,
@@ -206,34 +357,41 @@ class DatabaseManager:
         cursor.execute(f"""
             UPDATE posts SET {', '.join(updates)} WHERE id = ?
         """, params)
-        self.conn.commit()
+        self._commit()
         return cursor.rowcount > 0
 
     def update_post_crawl_status(self, post_id: str, status: str) -> bool:
         """Update post crawl status."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE posts SET crawl_status = ? WHERE id = ?
-        """, (status, post_id))
-        self.conn.commit()
+        cursor = self.conn.execute(
+            "UPDATE posts SET crawl_status = ? WHERE id = ?", (status, post_id)
+        )
+        self._commit()
         return cursor.rowcount > 0
 
+    def update_post_crawl_status_many(self, post_ids: List[str],
+                                      status: str) -> int:
+        """Set the same crawl status on many posts in one statement."""
+        with self.transaction():
+            cursor = self.conn.executemany(
+                "UPDATE posts SET crawl_status = ? WHERE id = ?",
+                ((status, post_id) for post_id in post_ids)
+            )
+        return cursor.rowcount
+
     def update_post_sympathy_count(self, post_id: str, count: int) -> bool:
         """Update post total sympathy count."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE posts SET sympathy_count = ? WHERE id = ?
-        """, (count, post_id))
-        self.conn.commit()
+        cursor = self.conn.execute(
+            "UPDATE posts SET sympathy_count = ? WHERE id = ?", (count, post_id)
+        )
+        self._commit()
         return cursor.rowcount > 0
 
     def update_post_comment_count(self, post_id: str, count: int) -> bool:
         """Update post comment count."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE posts SET comment_count = ? WHERE id = ?
-        """, (count, post_id))
-        self.conn.commit()
+        cursor = self.conn.execute(
+            "UPDATE posts SET comment_count = ? WHERE id = ?", (count, post_id)
+        )
+        self._commit()
         return cursor.rowcount > 0
 
     # ==================== Reaction Operations ====================
@@ -244,38 +402,60 @@ class DatabaseManager:
         try:
             cursor = self.conn.cursor()
             cursor.execute("""
-                INSERT OR REPLACE INTO reactions (post_id, reaction_type, count)
+                INSERT INTO reactions (post_id, reaction_type, count)
                 VALUES (?, ?, ?)
+                ON CONFLICT(post_id, reaction_type)
+                DO UPDATE SET count = excluded.count
             """, (post_id, reaction_type, count))
-            self.conn.commit()
+            self._commit()
             return True
         except sqlite3.Error:
             return False
 
     def add_reactions_batch(self, reactions: List[Dict[str, Any]]) -> int:
-        """Add multiple reactions in a batch."""
-        cursor = self.conn.cursor()
-        added = 0
-        for reaction in reactions:
-            try:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO reactions (post_id, reaction_type, count)
+        """Add or update multiple reactions in one statement."""
+        return self.bulk_upsert_reactions(
+            (reaction['post_id'], reaction['reaction_type'],
+             reaction.get('count', 0))
+            for reaction in reactions
+        )
+
+    def bulk_upsert_reactions(
+            self, rows: Iterable[Tuple[str, str, int]]) -> int:
+        """Add or update (post_id, reaction_type, count) rows in one statement."""
+        try:
+            with self.transaction():
+                cursor = self.conn.executemany("""
+                    INSERT INTO reactions (post_id, reaction_type, count)
                     VALUES (?, ?, ?)
-                """, (reaction['post_id'], reaction['reaction_type'],
-                      reaction.get('count', 0)))
-                added += 1
-            except sqlite3.Error:
-                pass
-        self.conn.commit()
-        return added
+                    ON CONFLICT(post_id, reaction_type)
+                    DO UPDATE SET count = excluded.count
+                """, rows)
+        except sqlite3.Error:
+            return 0
+        return cursor.rowcount
 
-    def get_reactions(self, post_id: str) -> List[Dict[str, Any]]:
+    def get_reactions(self, post_id: str) -> List[Record]:
         """Get all reactions for a post."""
         cursor = self.conn.cursor()
         cursor.execute("""
             SELECT * FROM reactions WHERE post_id = ?
         """, (post_id,))
-        return [dict(row) for row in cursor.fetchall()]
+        return cursor.fetchall()
+
+    def get_reactions_for_blog(self, blog_id: str) -> List[Record]:
+        """Get every reaction of a blog's posts, in iter_blog_posts order."""
+        return list(self.iter_reactions_for_blog(blog_id))
+
+    def iter_reactions_for_blog(self, blog_id: str) -> Iterator[Record]:
+        """Yield every reaction of a blog's posts, in iter_blog_posts order."""
+        cursor = self.conn.execute("""
+            SELECT r.* FROM reactions r
+            JOIN posts p ON r.post_id = p.id
+            WHERE p.blog_id = ?
+            ORDER BY p.created_at, p.rowid
+        """, (blog_id,))
+        return self._iter_rows(cursor)
 
     # ==================== Comment Operations ====================
 
@@ -287,57 +467,126 @@ class DatabaseManager:
         try:
             cursor = self.conn.cursor()
             cursor.execute("""
-                INSERT OR IGNORE INTO comments
+                INSERT INTO comments
                 (id, post_id, parent_id, author, content, like_count, written_at, is_reply)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO NOTHING
             """, (comment_id, post_id, parent_id, author, content,
                   like_count, written_at, is_reply))
-            self.conn.commit()
+            self._commit()
             return True
         except sqlite3.Error:
             return False
 
     def add_comments_batch(self, comments: List[Dict[str, Any]]) -> int:
-        """Add multiple comments in a batch."""
-        cursor = self.conn.cursor()
-        added = 0
-        for comment in comments:
+        """Add multiple comments in a batch, skipping existing IDs.
+
+        Replies go in after their parents; a reply whose parent is in
+        neither the batch nor the table is stored with parent_id NULL
+        instead of failing the foreign key. If the batch still fails, it
+        is retried row by row so only the rejected rows are left out.
+
+        Returns:
+            Number of comments inserted
+        """
+        comments = list(comments)
+        batch_ids = {comment['id'] for comment in comments}
+        outside = [comment['parent_id'] for comment in comments
+                   if comment.get('parent_id')
+                   and comment['parent_id'] not in batch_ids]
+        known_ids = batch_ids | self._existing_comment_ids(outside)
+
+        # Replies only point at top-level comments, so parents-first is
+        # enough; sorted() keeps API order within each group
+        ordered = sorted(comments,
+                         key=lambda c: c.get('parent_id') in batch_ids)
+        rows = [(
+            comment['id'],
+            comment['post_id'],
+            comment.get('parent_id') if comment.get('parent_id') in known_ids
+            else None,
+            comment.get('author'),
+            comment.get('content'),
+            comment.get('like_count', 0),
+            comment.get('written_at'),
+            comment.get('is_reply', 0),
+        ) for comment in ordered]
+
+        with self.transaction():
+            # A savepoint undoes a failed executemany's earlier rows even
+            # inside a caller's transaction(), so the retry starts clean
+            self.conn.execute("SAVEPOINT comments_batch")
             try:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO comments
-                    (id, post_id, parent_id, author, content, like_count, written_at, is_reply)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    comment['id'],
-                    comment['post_id'],
-                    comment.get('parent_id'),
-                    comment.get('author'),
-                    comment.get('content'),
-                    comment.get('like_count', 0),
-                    comment.get('written_at'),
-                    comment.get('is_reply', 0),
-                ))
-                added += 1
-            except sqlite3.IntegrityError:
-                pass
-        self.conn.commit()
+                added = self.conn.executemany(_INSERT_COMMENT_SQL,
+                                              rows).rowcount
+            except sqlite3.Error as e:
+                logger.warning("Comment batch failed (%s); retrying %d "
+                               "rows one at a time", e, len(rows))
+                self.conn.execute("ROLLBACK TO comments_batch")
+                added = 0
+                for row in rows:
+                    try:
+                        added += self.conn.execute(_INSERT_COMMENT_SQL,
+                                                   row).rowcount
+                    except sqlite3.Error as row_error:
+                        logger.warning("Skipped comment %s of post %s: %s",
+                                       row[0], row[1], row_error)
+            self.conn.execute("RELEASE comments_batch")
         return added
 
-    def get_comments(self, post_id: str,
-                     include_replies: bool = True) -> List[Dict[str, Any]]:
+    def _existing_comment_ids(self, comment_ids: List[str]) -> Set[str]:
+        """Return which of comment_ids are already stored."""
+        existing = set()
+        for start in range(0, len(comment_ids), 500):
+            chunk = comment_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor = self.conn.execute(
+                f"SELECT id FROM comments WHERE id IN ({placeholders})", chunk
+            )
+            existing.update(row['id'] for row in cursor)
+        return existing
+
+    def get_comments(self, post_id: str, include_replies: bool = True,
+                     is_reply: Optional[bool] = None) -> List[Record]:
         """Get all comments for a post."""
+        return list(self.iter_comments(post_id, include_replies, is_reply))
+
+    def iter_comments(self, post_id: str, include_replies: bool = True,
+                      is_reply: Optional[bool] = None) -> Iterator[Record]:
+        """Yield a post's comments without loading them all at once.
+
+        is_reply=True/False keeps only replies/top-level comments; the
+        (post_id, is_reply, written_at) index serves the filter.
+        """
+        if not include_replies:
+            is_reply = False
+
         cursor = self.conn.cursor()
-        if include_replies:
+        if is_reply is None:
             cursor.execute("""
                 SELECT * FROM comments WHERE post_id = ?
                 ORDER BY written_at
             """, (post_id,))
         else:
             cursor.execute("""
-                SELECT * FROM comments WHERE post_id = ? AND is_reply = 0
+                SELECT * FROM comments WHERE post_id = ? AND is_reply = ?
                 ORDER BY written_at
-            """, (post_id,))
-        return [dict(row) for row in cursor.fetchall()]
+            """, (post_id, int(is_reply)))
+        return self._iter_rows(cursor)
+
+    def get_comments_for_blog(self, blog_id: str) -> List[Record]:
+        """Get every comment of a blog's posts, in iter_blog_posts order."""
+        return list(self.iter_comments_for_blog(blog_id))
+
+    def iter_comments_for_blog(self, blog_id: str) -> Iterator[Record]:
+        """Yield every comment of a blog's posts, in iter_blog_posts order."""
+        cursor = self.conn.execute("""
+            SELECT c.* FROM comments c
+            JOIN posts p ON c.post_id = p.id
+            WHERE p.blog_id = ?
+            ORDER BY p.created_at, p.rowid, c.written_at
+        """, (blog_id,))
+        return self._iter_rows(cursor)
 
     def get_comment_count(self, post_id: str) -> int:
         """Get the number of comments for a post."""
@@ -356,28 +605,28 @@ class DatabaseManager:
             cursor.execute("""
                 INSERT OR REPLACE INTO progress
                 (blog_id, current_post_index, total_posts, current_step, last_updated)
-                VALUES (?, 0, ?, ?, ?)
-            """, (blog_id, total_posts, CrawlStep.BLOG_INFO,
-                  datetime.now().isoformat()))
-            self.conn.commit()
+                VALUES (?, 0, ?, ?, CURRENT_TIMESTAMP)
+            """, (blog_id, total_posts, CrawlStep.BLOG_INFO))
+            self._commit()
             return True
         except sqlite3.Error:
             return False
 
-    def get_progress(self, blog_id: str) -> Optional[Dict[str, Any]]:
+    def get_progress(self, blog_id: str) -> Optional[Record]:
         """Get progress for a blog."""
         cursor = self.conn.cursor()
         cursor.execute("""
             SELECT * FROM progress WHERE blog_id = ?
         """, (blog_id,))
         row = cursor.fetchone()
-        return dict(row) if row else None
+        return row
 
     def update_progress(self, blog_id: str, current_post_index: int = None,
                         current_step: str = None) -> bool:
         """Update progress for a blog."""
-        updates = ["last_updated = ?"]
-        params = [datetime.now().isoformat()]
+        # Timestamped by SQLite, like the column defaults
+        updates = ["last_updated = CURRENT_TIMESTAMP"]
+        params = []
 
         if current_post_index is not None:
             updates.append("current_post_index = ?")
@@ -391,7 +640,28 @@ class DatabaseManager:
         cursor.execute(f"""
             UPDATE progress SET {', '.join(updates)} WHERE blog_id = ?
         """, params)
-        self.conn.commit()
+        self._commit()
+        return cursor.rowcount > 0
+
+    # ==================== HTTP Cache Operations ====================
+
+    def get_http_cache(self, url: str) -> Optional[Record]:
+        """Get the cached validators and parsed data for a URL."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT * FROM http_cache WHERE url = ?", (url,))
+        row = cursor.fetchone()
+        return row
+
+    def set_http_cache(self, url: str, etag: str = None,
+                       last_modified: str = None, data: str = None) -> bool:
+        """Store ETag/Last-Modified and parsed data for a URL."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO http_cache
+            (url, etag, last_modified, data, updated_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (url, etag, last_modified, data))
+        self._commit()
         return cursor.rowcount > 0
 
     # ==================== Statistics ====================
@@ -411,12 +681,12 @@ class DatabaseManager:
         """, (blog_id, Status.COMPLETED))
         posts_completed = cursor.fetchone()['count']
 
+        # Maintained by the comments_ai/comments_ad triggers
         cursor.execute("""
-            SELECT COUNT(*) as count FROM comments c
-            JOIN posts p ON c.post_id = p.id
-            WHERE p.blog_id = ?
+            SELECT comment_total FROM blogs WHERE id = ?
         """, (blog_id,))
-        total_comments = cursor.fetchone()['count']
+        row = cursor.fetchone()
+        total_comments = row['comment_total'] if row else 0
 
         return {
             'total_posts': total_posts,
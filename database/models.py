@@ -3,6 +3,33 @@
 import sqlite3
 from pathlib import Path
 
+
+class Record(sqlite3.Row):
+    """sqlite3.Row with dict-style .get() and column attributes.
+
+    Rows stay tuple-backed (no per-instance __dict__), so long-lived rows
+    such as the blog list's cost no more than a plain sqlite3.Row.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except (IndexError, KeyError):
+            raise AttributeError(name) from None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except (IndexError, KeyError):
+            return default
+
+    def to_dict(self) -> dict:
+        """Copy into a plain dict, pairing columns with values in one pass."""
+        return dict(zip(self.keys(), self))
+
+
 CREATE_BLOGS_TABLE = """
 CREATE TABLE IF NOT EXISTS blogs (
     id TEXT PRIMARY KEY,
@@ -10,6 +37,7 @@ CREATE TABLE IF NOT EXISTS blogs (
     author_name TEXT,
     url TEXT NOT NULL,
     post_count INTEGER DEFAULT 0,
+    comment_total INTEGER DEFAULT 0,
     status TEXT DEFAULT 'pending',
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
@@ -19,6 +47,7 @@ CREATE_POSTS_TABLE = """
 CREATE TABLE IF NOT EXISTS posts (
     id TEXT PRIMARY KEY,
     blog_id TEXT NOT NULL,
+    log_no TEXT,
     title TEXT,
     content TEXT,
     category TEXT,
@@ -70,19 +99,113 @@ CREATE TABLE IF NOT EXISTS progress (
 );
 """
 
+CREATE_HTTP_CACHE_TABLE = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    data TEXT,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Keep blogs.comment_total in step with the comments table
+CREATE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS comments_ai AFTER INSERT ON comments
+    BEGIN
+        UPDATE blogs SET comment_total = comment_total + 1
+        WHERE id = (SELECT blog_id FROM posts WHERE id = NEW.post_id);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS comments_ad AFTER DELETE ON comments
+    BEGIN
+        UPDATE blogs SET comment_total = comment_total - 1
+        WHERE id = (SELECT blog_id FROM posts WHERE id = OLD.post_id);
+    END;
+    """,
+]
+
 CREATE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_posts_blog_id ON posts(blog_id);",
     "CREATE INDEX IF NOT EXISTS idx_reactions_post_id ON reactions(post_id);",
     "CREATE INDEX IF NOT EXISTS idx_comments_post_id ON comments(post_id);",
     "CREATE INDEX IF NOT EXISTS idx_comments_parent_id ON comments(parent_id);",
     "CREATE INDEX IF NOT EXISTS idx_progress_blog_id ON progress(blog_id);",
+    "CREATE INDEX IF NOT EXISTS idx_posts_blog_status ON posts(blog_id, crawl_status);",
+    "CREATE INDEX IF NOT EXISTS idx_comments_post_isreply ON comments(post_id, is_reply, written_at);",
 ]
 
 
-def init_database(db_path: Path) -> sqlite3.Connection:
-    """Initialize the SQLite database with all required tables."""
+def _migrate(cursor: sqlite3.Cursor):
+    """Add columns introduced after a database was first created."""
+    cursor.execute("PRAGMA table_info(posts)")
+    if 'log_no' not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE posts ADD COLUMN log_no TEXT")
+        # Post ids are "blogId_logNo"
+        cursor.execute("""
+            UPDATE posts SET log_no = CASE
+                WHEN instr(id, '_') > 0 THEN substr(id, instr(id, '_') + 1)
+                ELSE id
+            END
+        """)
+
+    cursor.execute("PRAGMA table_info(blogs)")
+    columns = {row[1] for row in cursor.fetchall()}
+    if 'comment_total' not in columns:
+        cursor.execute(
+            "ALTER TABLE blogs ADD COLUMN comment_total INTEGER DEFAULT 0"
+        )
+        cursor.execute("""
+            UPDATE blogs SET comment_total = (
+                SELECT COUNT(*) FROM comments c
+                JOIN posts p ON c.post_id = p.id
+                WHERE p.blog_id = blogs.id
+            )
+        """)
+
+
+# WAL lets readers run alongside the crawler's writes and makes commits
+# an append; synchronous=NORMAL is still crash-safe in WAL mode
+JOURNAL_PRAGMAS = [
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+]
+
+# Throwaway test databases skip the journal file and fsync entirely;
+# a crash can corrupt them, so never use these on real data
+TEST_JOURNAL_PRAGMAS = [
+    "PRAGMA journal_mode=MEMORY;",
+    "PRAGMA synchronous=OFF;",
+]
+
+# busy_timeout retries instead of failing while another writer commits
+CONNECTION_PRAGMAS = [
+    "PRAGMA busy_timeout=5000;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-65536;",  # 64 MiB
+    "PRAGMA mmap_size=268435456;",  # 256 MiB
+    "PRAGMA foreign_keys=ON;",
+]
+
+
+def connect(db_path: Path, test_mode: bool = False) -> sqlite3.Connection:
+    """Open a connection with Record rows and the connection PRAGMAs."""
     conn = sqlite3.connect(str(db_path), check_same_thread=False)
-    conn.row_factory = sqlite3.Row
+    conn.row_factory = Record
+
+    journal = TEST_JOURNAL_PRAGMAS if test_mode else JOURNAL_PRAGMAS
+    for pragma_sql in journal + CONNECTION_PRAGMAS:
+        conn.execute(pragma_sql)
+
+    return conn
+
+
+def init_database(db_path: Path,
+                  test_mode: bool = False) -> sqlite3.Connection:
+    """Initialize the SQLite database with all required tables."""
+    conn = connect(db_path, test_mode)
 
     cursor = conn.cursor()
 
@@ -91,6 +214,11 @@ def init_database(db_path: Path) -> sqlite3.Connection:
     cursor.execute(CREATE_REACTIONS_TABLE)
     cursor.execute(CREATE_COMMENTS_TABLE)
     cursor.execute(CREATE_PROGRESS_TABLE)
+    cursor.execute(CREATE_HTTP_CACHE_TABLE)
+    _migrate(cursor)
+
+    for trigger_sql in CREATE_TRIGGERS:
+        cursor.execute(trigger_sql)
 
     for index_sql in CREATE_INDEXES:
         cursor.execute(index_sql)
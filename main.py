@@ -1,26 +1,69 @@
 """Naver Blog Crawler - GUI Application using CustomTkinter."""
 
 import customtkinter as ctk
-from tkinter import messagebox, filedialog
+from tkinter import messagebox, filedialog, TclError
+import asyncio
+import hashlib
+import json
 import threading
-import queue
 import os
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from itertools import groupby, tee
+from operator import itemgetter
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
 
 from config import (
     WINDOW_WIDTH, WINDOW_HEIGHT, APPEARANCE_MODE, COLOR_THEME,
-    DATABASE_PATH, EXPORT_DIR, Status, CrawlStep, ACCESS_CODES
+    DATABASE_PATH, EXPORT_DIR, Status, CrawlStep, ACCESS_CODES,
+    AUTH_CACHE_PATH, AUTH_CACHE_TTL, POST_FETCH_WORKERS, COMMENT_FETCH_WORKERS, WRITE_BATCH_SIZE,
+    CHECKPOINT_INTERVAL
 )
-from database import DatabaseManager
-from crawler import BlogCrawler, PostCrawler, ReactionCrawler, CommentCrawler
+from database import DatabaseManager, Record
 from utils.helpers import (
     extract_blog_id, load_progress, save_progress, has_incomplete_work,
     update_blog_progress, get_blog_progress, get_next_incomplete_step,
-    remove_blog_from_progress, export_to_json, export_to_csv
+    remove_blog_from_progress, export_to_json_stream, export_to_csv,
+    assemble_threaded_comments, ProgressWriter
 )
 
 
+# Characters Windows doesn't allow in file names, mapped to '_'
+_FILENAME_FORBIDDEN = str.maketrans(dict.fromkeys('/\\|<>:"?*', '_'))
+
+# Access code expiry dates, parsed once instead of on every check
+_ACCESS_CODE_EXPIRY = {
+    code: datetime.strptime(expiry, "%Y-%m-%d")
+    for code, expiry in ACCESS_CODES.items()
+}
+
+# Crawl steps in the order _crawl_blogs runs them
+_ALL_STEPS = tuple(CrawlStep.all_steps())
+
+# Blog list status text by status; {n} is the blog's post count
+_STATUS_TEMPLATES = {
+    Status.PENDING: "대기중 ({n}개)",
+    Status.IN_PROGRESS: "진행중",
+    Status.COMPLETED: "완료 ({n}개)",
+}
+
+
+def _group_by_post(posts: Iterable[Dict[str, Any]],
+                   rows: Iterable[Dict[str, Any]]
+                   ) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """Pair each post with its rows; both must come in the same post order."""
+    groups = groupby(rows, key=itemgetter('post_id'))
+    current = next(groups, None)
+    for post in posts:
+        if current and current[0] == post['id']:
+            yield post, list(current[1])
+            current = next(groups, None)
+        else:
+            yield post, []
+
+
 # Configure appearance
 ctk.set_appearance_mode(APPEARANCE_MODE)
 ctk.set_default_color_theme(COLOR_THEME)
@@ -29,7 +72,7 @@ ctk.set_default_color_theme(COLOR_THEME)
 class BlogListItem(ctk.CTkFrame):
     """Individual blog item in the list."""
 
-    def __init__(self, parent, blog_data: Dict[str, Any],
+    def __init__(self, parent, blog_data: Record,
                  on_select: callable = None, on_delete: callable = None):
         super().__init__(parent)
 
@@ -49,13 +92,13 @@ class BlogListItem(ctk.CTkFrame):
         self.checkbox.pack(side="left", padx=(5, 10))
 
         # Blog name
-        name = blog_data.get('blog_name', 'Unknown Blog')
+        name = blog_data.blog_name or 'Unknown Blog'
         self.name_label = ctk.CTkLabel(self, text=name, anchor="w")
         self.name_label.pack(side="left", fill="x", expand=True)
 
         # Status
-        status = blog_data.get('status', Status.PENDING)
-        post_count = blog_data.get('post_count', 0)
+        status = blog_data.status
+        post_count = blog_data.post_count or 0
         status_text = self._format_status(status, post_count)
         self.status_label = ctk.CTkLabel(self, text=status_text, width=150)
         self.status_label.pack(side="right", padx=5)
@@ -70,31 +113,26 @@ class BlogListItem(ctk.CTkFrame):
 
     def _format_status(self, status: str, post_count: int) -> str:
         """Format status text for display."""
-        if status == Status.PENDING:
-            return f"대기중 ({post_count}개)"
-        elif status == Status.IN_PROGRESS:
-            return "진행중"
-        elif status == Status.COMPLETED:
-            return f"완료 ({post_count}개)"
-        return status
+        template = _STATUS_TEMPLATES.get(status)
+        return template.format(n=post_count) if template else status
 
     def _on_checkbox_change(self):
         """Handle checkbox state change."""
         self.selected = self.checkbox_var.get()
         if self.on_select:
-            self.on_select(self.blog_data['id'], self.selected)
+            self.on_select(self.blog_data.id, self.selected)
 
     def _on_delete(self):
         """Handle delete button click."""
         if self.on_delete:
-            self.on_delete(self.blog_data['id'])
+            self.on_delete(self.blog_data.id)
 
     def update_status(self, status: str, progress_text: str = None):
         """Update the displayed status."""
         if progress_text:
             self.status_label.configure(text=progress_text)
         else:
-            post_count = self.blog_data.get('post_count', 0)
+            post_count = self.blog_data.post_count or 0
             self.status_label.configure(
                 text=self._format_status(status, post_count)
             )
@@ -113,10 +151,17 @@ class NaverBlogCrawlerApp(ctk.CTk):
         # Initialize components
         self.db = DatabaseManager(DATABASE_PATH)
         self.progress_data = load_progress()
+        self.progress_writer = ProgressWriter()
+
+        # Crawlers, imported here so a failed access check never pays for
+        # requests/bs4/httpx
+        from crawler import (BlogCrawler, PostCrawler, ReactionCrawler,
+                             CommentCrawler)
 
-        # Crawlers
-        self.blog_crawler = BlogCrawler(progress_callback=self._log_message)
-        self.post_crawler = PostCrawler(progress_callback=self._log_message)
+        self.blog_crawler = BlogCrawler(progress_callback=self._log_message,
+                                        cache=self.db)
+        self.post_crawler = PostCrawler(progress_callback=self._log_message,
+                                        cache=self.db)
         self.reaction_crawler = ReactionCrawler(progress_callback=self._log_message)
         self.comment_crawler = CommentCrawler(progress_callback=self._log_message)
 
@@ -126,8 +171,13 @@ class NaverBlogCrawlerApp(ctk.CTk):
         self.selected_blogs = set()
         self.blog_widgets = {}
 
-        # Message queue for thread-safe UI updates
-        self.message_queue = queue.Queue()
+        # Message queue for thread-safe UI updates, see _post_message
+        self.message_queue = deque()
+        self._queue_lock = threading.Lock()
+        self._drain_requested = threading.Event()
+        # Last per-post update sent, see _report_post_progress
+        self._last_progress_pct = -1
+        self._last_status_time = 0.0
 
         # Build UI
         self._create_widgets()
@@ -138,8 +188,10 @@ class NaverBlogCrawlerApp(ctk.CTk):
         # Check for incomplete work
         self.after(500, self._check_incomplete_work)
 
-        # Process message queue
-        self._process_message_queue()
+        # Process queued messages whenever they arrive
+        self.bind("<<CrawlMessage>>",
+                  lambda e: self._process_message_queue())
+        self._poll_message_queue()
 
     def _create_widgets(self):
         """Create all UI widgets."""
@@ -249,13 +301,12 @@ class NaverBlogCrawlerApp(ctk.CTk):
 
     def _load_blogs(self):
         """Load blogs from database and display them."""
-        blogs = self.db.get_all_blogs()
-        for blog in blogs:
+        for blog in self.db.iter_all_blogs():
             self._add_blog_to_list(blog)
 
-    def _add_blog_to_list(self, blog_data: Dict[str, Any]):
+    def _add_blog_to_list(self, blog_data: Record):
         """Add a blog widget to the list."""
-        blog_id = blog_data['id']
+        blog_id = blog_data.id
 
         # Remove existing if present
         if blog_id in self.blog_widgets:
@@ -307,22 +358,25 @@ class NaverBlogCrawlerApp(ctk.CTk):
                 )
 
                 if success:
-                    self.message_queue.put(('add_blog', blog_info))
-                    self.message_queue.put((
+                    # The stored row, so the list holds Records only
+                    self._post_message(
+                        'add_blog', self.db.get_blog(blog_info['id'])
+                    )
+                    self._post_message(
                         'log',
                         f"블로그 추가됨: {blog_info['blog_name']}"
-                    ))
+                    )
                 else:
-                    self.message_queue.put((
+                    self._post_message(
                         'log', "블로그가 이미 존재합니다."
-                    ))
+                    )
             else:
-                self.message_queue.put((
+                self._post_message(
                     'log',
                     f"블로그 정보를 가져올 수 없습니다: {blog_id}"
-                ))
+                )
 
-            self.message_queue.put(('enable_add', None))
+            self._post_message('enable_add', None)
 
         thread = threading.Thread(target=fetch_blog, daemon=True)
         thread.start()
@@ -350,7 +404,7 @@ class NaverBlogCrawlerApp(ctk.CTk):
             self.progress_data = remove_blog_from_progress(
                 self.progress_data, blog_id
             )
-            save_progress(self.progress_data)
+            self.progress_writer.save(self.progress_data)
 
             if blog_id in self.blog_widgets:
                 self.blog_widgets[blog_id].destroy()
@@ -369,6 +423,11 @@ class NaverBlogCrawlerApp(ctk.CTk):
             if result:
                 self._start_crawling(resume=True)
 
+    def _blogs_in_order(self, blog_ids: List[str]) -> List[Dict[str, Any]]:
+        """Existing blogs for blog_ids, looked up at once, in that order."""
+        found = {b['id']: b for b in self.db.get_blogs_by_ids(blog_ids)}
+        return [found[bid] for bid in blog_ids if bid in found]
+
     def _start_crawling(self, resume: bool = False):
         """Start the crawling process."""
         if self.is_crawling:
@@ -376,18 +435,17 @@ class NaverBlogCrawlerApp(ctk.CTk):
 
         # Get blogs to crawl
         if resume:
-            blogs_to_crawl = []
-            for b_progress in self.progress_data.get('blogs', []):
-                if b_progress.get('status') == 'in_progress':
-                    blog = self.db.get_blog(b_progress['blog_id'])
-                    if blog:
-                        blogs_to_crawl.append(blog)
+            blog_ids = [
+                b_progress['blog_id']
+                for b_progress in self.progress_data.get('blogs', [])
+                if b_progress.get('status') == 'in_progress'
+            ]
+            blogs_to_crawl = self._blogs_in_order(blog_ids)
         else:
             if self.selected_blogs:
-                blogs_to_crawl = [
-                    self.db.get_blog(bid) for bid in self.selected_blogs
-                    if self.db.get_blog(bid)
-                ]
+                blogs_to_crawl = self._blogs_in_order(
+                    list(self.selected_blogs)
+                )
             else:
                 blogs_to_crawl = [
                     b for b in self.db.get_all_blogs()
@@ -398,13 +456,7 @@ class NaverBlogCrawlerApp(ctk.CTk):
             messagebox.showinfo("알림", "크롤링할 블로그가 없습니다.")
             return
 
-        # Update UI state
-        self.is_crawling = True
-        self.should_stop = False
-        self.start_btn.configure(state="disabled")
-        self.pause_btn.configure(state="normal")
-        self.stop_btn.configure(state="normal")
-        self.add_btn.configure(state="disabled")
+        self._set_crawling(True)
 
         # Start crawling in background
         thread = threading.Thread(
@@ -414,6 +466,26 @@ class NaverBlogCrawlerApp(ctk.CTk):
         )
         thread.start()
 
+    def _set_crawling(self, crawling: bool):
+        """Switch the crawl flags and control buttons in one place.
+
+        Tk redraws changed widgets together on its next idle pass, so
+        all of these land in a single repaint.
+        """
+        self.is_crawling = crawling
+        self.should_stop = False
+        if crawling:
+            self.start_btn.configure(state="disabled")
+            self.pause_btn.configure(state="normal")
+            self.stop_btn.configure(state="normal")
+            self.add_btn.configure(state="disabled")
+        else:
+            self.start_btn.configure(state="normal")
+            self.pause_btn.configure(state="disabled")
+            self.stop_btn.configure(state="disabled")
+            self.add_btn.configure(state="normal")
+            self.task_label.configure(text="현재 작업: 대기 중")
+
     def _pause_crawling(self):
         """Pause the crawling process."""
         self.should_stop = True
@@ -443,20 +515,20 @@ class NaverBlogCrawlerApp(ctk.CTk):
             blog_id = blog['id']
             blog_name = blog['blog_name']
 
-            self.message_queue.put((
+            self._post_message(
                 'log', f"블로그 크롤링 시작: {blog_name}"
-            ))
-            self.message_queue.put((
+            )
+            self._post_message(
                 'update_blog_status',
                 (blog_id, Status.IN_PROGRESS, "진행중")
-            ))
+            )
 
             self.db.update_blog_status(blog_id, Status.IN_PROGRESS)
 
             # Get or create progress
             b_progress = get_blog_progress(self.progress_data, blog_id)
             if not b_progress:
-                self.progress_data = update_blog_progress(
+                update_blog_progress(
                     self.progress_data, blog_id,
                     blog_name=blog_name,
                     status='in_progress',
@@ -464,27 +536,31 @@ class NaverBlogCrawlerApp(ctk.CTk):
                 )
                 b_progress = get_blog_progress(self.progress_data, blog_id)
 
+            # Steps to skip when resuming
+            done = frozenset(
+                s for s, v in b_progress['steps_completed'].items()
+                if v == 'completed'
+            ) if resume else frozenset()
+
             # Process each step
             success = True
-            for step in CrawlStep.all_steps():
+            for step in _ALL_STEPS:
                 if self.should_stop:
                     break
 
-                # Skip completed steps when resuming
-                if (resume and
-                        b_progress['steps_completed'].get(step) == 'completed'):
+                if step in done:
                     continue
 
-                self.message_queue.put((
+                self._post_message(
                     'task', f"현재 작업: {self._get_step_name(step)}"
-                ))
+                )
 
                 # Mark step as in progress
-                self.progress_data = update_blog_progress(
+                update_blog_progress(
                     self.progress_data, blog_id,
                     step=step, step_status='in_progress'
                 )
-                save_progress(self.progress_data)
+                self.progress_writer.schedule(self.progress_data)
 
                 # Execute step
                 try:
@@ -502,45 +578,45 @@ class NaverBlogCrawlerApp(ctk.CTk):
                         success = self._process_comments(blog)
 
                     if success and not self.should_stop:
-                        self.progress_data = update_blog_progress(
+                        update_blog_progress(
                             self.progress_data, blog_id,
                             step=step, step_status='completed'
                         )
-                        save_progress(self.progress_data)
+                        self.progress_writer.save(self.progress_data)
 
                 except Exception as e:
-                    self.message_queue.put((
+                    self._post_message(
                         'log', f"오류 발생: {str(e)}"
-                    ))
+                    )
                     success = False
                     break
 
             # Update blog status
             if success and not self.should_stop:
                 self.db.update_blog_status(blog_id, Status.COMPLETED)
-                self.progress_data = update_blog_progress(
+                update_blog_progress(
                     self.progress_data, blog_id, status='completed'
                 )
-                self.message_queue.put((
+                self._post_message(
                     'update_blog_status',
                     (blog_id, Status.COMPLETED, None)
-                ))
-                self.message_queue.put((
+                )
+                self._post_message(
                     'log', f"블로그 크롤링 완료: {blog_name}"
-                ))
+                )
             else:
-                self.message_queue.put((
+                self._post_message(
                     'log', f"블로그 크롤링 중단됨: {blog_name}"
-                ))
+                )
 
-            save_progress(self.progress_data)
+            self.progress_writer.save(self.progress_data)
 
             # Update overall progress
             progress = (b_idx + 1) / total_blogs
-            self.message_queue.put(('progress', progress))
+            self._post_message('progress', progress)
 
         # Crawling finished
-        self.message_queue.put(('crawl_finished', None))
+        self._post_message('crawl_finished', None)
 
     def _process_blog_info(self, blog: Dict[str, Any]) -> bool:
         """Process blog info step."""
@@ -553,10 +629,10 @@ class NaverBlogCrawlerApp(ctk.CTk):
                 blog_name=blog_info.get('blog_name'),
                 author_name=blog_info.get('author_name')
             )
-            self.message_queue.put((
+            self._post_message(
                 'log',
                 f"블로그 정보 수집 완료: {blog_info.get('blog_name')}"
-            ))
+            )
             return True
 
         return False
@@ -565,37 +641,59 @@ class NaverBlogCrawlerApp(ctk.CTk):
         """Process post list step."""
         blog_id = blog['id']
 
-        self.message_queue.put(('log', "글 목록 가져오는 중..."))
+        self._post_message('log', "글 목록 가져오는 중...")
 
         posts = self.post_crawler.get_post_list(blog_id)
 
         if posts:
+            # Posts already stored on a previous run are left untouched
+            existing = self.db.existing_post_ids([p['id'] for p in posts])
             post_data = [
                 {
                     'id': p['id'],
                     'blog_id': blog_id,
+                    'log_no': p.get('log_no'),
                     'title': p.get('title'),
                     'post_url': p.get('post_url'),
+                    'comment_count': p.get('comment_count', 0),
                 }
-                for p in posts
+                for p in posts if p['id'] not in existing
             ]
             added = self.db.add_posts_batch(post_data)
 
             self.db.update_blog_post_count(blog_id, len(posts))
 
-            self.progress_data = update_blog_progress(
+            update_blog_progress(
                 self.progress_data, blog_id,
                 total_posts=len(posts)
             )
 
-            self.message_queue.put((
+            self._post_message(
                 'log', f"글 {added}개 추가됨"
-            ))
+            )
             return True
 
-        self.message_queue.put(('log', "글 목록을 가져올 수 없습니다."))
+        self._post_message('log', "글 목록을 가져올 수 없습니다.")
         return False
 
+    def _report_post_progress(self, blog_id: str, label: str, done: int,
+                              total: int):
+        """Queue per-post UI updates, throttled to whole-percent progress
+        changes and at most 10 status updates a second."""
+        pct = int(done * 100 / total)
+        if pct != self._last_progress_pct or done >= total:
+            self._last_progress_pct = pct
+            self._post_message('progress', done / total)
+
+        now = time.monotonic()
+        if now - self._last_status_time >= 0.1 or done >= total:
+            self._last_status_time = now
+            progress_text = f"{label} ({done}/{total})"
+            self._post_message(
+                'update_blog_status',
+                (blog_id, Status.IN_PROGRESS, progress_text)
+            )
+
     def _process_post_content(self, blog: Dict[str, Any],
                               b_progress: Dict[str, Any]) -> bool:
         """Process post content step."""
@@ -610,22 +708,80 @@ class NaverBlogCrawlerApp(ctk.CTk):
         total = len(posts)
         start_index = b_progress.get('current_post_index', 0)
 
-        self.message_queue.put((
+        self._post_message(
             'log', f"글 내용 수집 중... ({total}개 글)"
-        ))
+        )
 
-        for i, post in enumerate(posts[start_index:], start=start_index):
-            if self.should_stop:
-                break
+        # Failed posts are marked in one statement once the loop ends;
+        # any left pending by an interruption are simply retried
+        unavailable = []
+        done = start_index
+
+        # Fetches overlap in worker threads; results, including their
+        # HTTP cache entries, are written here as they complete, so this
+        # thread stays the only DB writer
+        executor = ThreadPoolExecutor(max_workers=POST_FETCH_WORKERS)
+        futures = {
+            executor.submit(self.post_crawler.fetch_post_content,
+                            blog_id, post['log_no']): (index, post)
+            for index, post in enumerate(posts[start_index:], start_index)
+        }
+        # Posts finish out of order, so the resume index only advances
+        # past the leading run of finished posts
+        finished = set()
+        resume_index = start_index
+        # Checkpoint (DB batch + progress file) every WRITE_BATCH_SIZE
+        # posts or CHECKPOINT_INTERVAL seconds, whichever comes first
+        batch = []
+        checkpoint_done = done
+        checkpoint_time = time.monotonic()
+        try:
+            for future in as_completed(futures):
+                if self.should_stop:
+                    break
 
-            # Extract log_no from post id (format: blogId_logNo)
-            log_no = post['id'].split('_', 1)[-1] if '_' in post['id'] else post['id']
+                index, post = futures[future]
+                try:
+                    content_data, cache_entry = future.result()
+                except Exception:
+                    content_data, cache_entry = None, None
 
-            content_data = self.post_crawler.get_post_content(
-                blog_id, log_no
-            )
+                if content_data:
+                    batch.append((post, content_data, cache_entry))
+                else:
+                    unavailable.append(post['id'])
+
+                finished.add(index)
+                while resume_index in finished:
+                    finished.remove(resume_index)
+                    resume_index += 1
+
+                done += 1
+                if (done - checkpoint_done >= WRITE_BATCH_SIZE or
+                        time.monotonic() - checkpoint_time
+                        >= CHECKPOINT_INTERVAL):
+                    self._save_post_contents(blog_id, batch, resume_index)
+                    batch = []
+                    checkpoint_done = done
+                    checkpoint_time = time.monotonic()
+
+                self._report_post_progress(blog_id, "진행중", done, total)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._save_post_contents(blog_id, batch, resume_index)
+
+        if unavailable:
+            self.db.update_post_crawl_status_many(unavailable,
+                                                  Status.UNAVAILABLE)
 
-            if content_data:
+        return not self.should_stop
+
+    def _save_post_contents(self, blog_id: str, batch: List[tuple],
+                            resume_index: int):
+        """Write a batch of fetched posts in one transaction, then
+        record progress once for the whole batch."""
+        with self.db.transaction():
+            for post, content_data, cache_entry in batch:
                 self.db.update_post_content(
                     post['id'],
                     title=content_data.get('title'),
@@ -636,27 +792,14 @@ class NaverBlogCrawlerApp(ctk.CTk):
                 self.db.update_post_crawl_status(
                     post['id'], Status.COMPLETED
                 )
-            else:
-                self.db.update_post_crawl_status(
-                    post['id'], Status.UNAVAILABLE
-                )
+                if cache_entry:
+                    self.db.set_http_cache(*cache_entry)
 
-            # Update progress
-            self.progress_data = update_blog_progress(
-                self.progress_data, blog_id,
-                current_post_index=i + 1
-            )
-            save_progress(self.progress_data)
-
-            # Update UI
-            progress_text = f"진행중 ({i + 1}/{total})"
-            self.message_queue.put((
-                'update_blog_status',
-                (blog_id, Status.IN_PROGRESS, progress_text)
-            ))
-            self.message_queue.put(('progress', (i + 1) / total))
-
-        return not self.should_stop
+        update_blog_progress(
+            self.progress_data, blog_id,
+            current_post_index=resume_index
+        )
+        self.progress_writer.schedule(self.progress_data)
 
     def _process_reactions(self, blog: Dict[str, Any]) -> bool:
         """Process reactions step."""
@@ -667,38 +810,39 @@ class NaverBlogCrawlerApp(ctk.CTk):
             return True
 
         total = len(posts)
-        self.message_queue.put((
+        self._post_message(
             'log', f"공감 수집 중... ({total}개 글)"
-        ))
+        )
 
-        for i, post in enumerate(posts):
+        # Fetch like API results and write them a chunk of posts at a time
+        for start in range(0, total, WRITE_BATCH_SIZE):
             if self.should_stop:
                 break
 
-            log_no = post['id'].split('_', 1)[-1] if '_' in post['id'] else post['id']
-
-            reaction_data = self.reaction_crawler.get_reactions(
-                blog_id, log_no
+            chunk = posts[start:start + WRITE_BATCH_SIZE]
+            log_nos = [post['log_no'] for post in chunk]
+            results = asyncio.run(
+                self.reaction_crawler.get_reactions_many(blog_id, log_nos)
             )
 
-            if reaction_data:
-                total_count = reaction_data.get('total_count', 0)
-                self.db.update_post_sympathy_count(post['id'], total_count)
-
-                for reaction in reaction_data.get('reactions', []):
-                    self.db.add_reaction(
-                        post['id'],
-                        reaction['reaction_type'],
-                        reaction['count']
+            # Every reaction row in the chunk goes in one executemany
+            reaction_rows = []
+            with self.db.transaction():
+                for post, reaction_data in zip(chunk, results):
+                    if not reaction_data:
+                        continue
+                    self.db.update_post_sympathy_count(
+                        post['id'], reaction_data.get('total_count', 0)
                     )
+                    reaction_rows.extend(
+                        (post['id'], reaction['reaction_type'],
+                         reaction.get('count', 0))
+                        for reaction in reaction_data.get('reactions', [])
+                    )
+                self.db.bulk_upsert_reactions(reaction_rows)
 
-            # Update UI
-            progress_text = f"공감 ({i + 1}/{total})"
-            self.message_queue.put((
-                'update_blog_status',
-                (blog_id, Status.IN_PROGRESS, progress_text)
-            ))
-            self.message_queue.put(('progress', (i + 1) / total))
+            self._report_post_progress(blog_id, "공감",
+                                       start + len(chunk), total)
 
         return not self.should_stop
 
@@ -711,34 +855,55 @@ class NaverBlogCrawlerApp(ctk.CTk):
             return True
 
         total = len(posts)
-        self.message_queue.put((
+        self._post_message(
             'log', f"댓글 수집 중... ({total}개 글)"
-        ))
+        )
 
-        for i, post in enumerate(posts):
-            if self.should_stop:
-                break
+        # Each worker borrows its own pooled driver for Selenium fallbacks
+        done = 0
+        executor = ThreadPoolExecutor(max_workers=COMMENT_FETCH_WORKERS)
+        futures = {
+            executor.submit(self.comment_crawler.get_comments,
+                            blog_id, post['log_no'],
+                            post['comment_count'] or 0): post
+            for post in posts
+        }
+        batch = []
+        try:
+            for future in as_completed(futures):
+                if self.should_stop:
+                    break
+
+                post = futures[future]
+                try:
+                    comments = future.result()
+                except Exception:
+                    comments = []
 
-            log_no = post['id'].split('_', 1)[-1] if '_' in post['id'] else post['id']
+                if comments:
+                    batch.append((post, comments))
 
-            comments = self.comment_crawler.get_comments(blog_id, log_no)
+                done += 1
+                if len(batch) >= WRITE_BATCH_SIZE:
+                    self._save_comments(batch)
+                    batch = []
 
-            if comments:
+                self._report_post_progress(blog_id, "댓글", done, total)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._save_comments(batch)
+
+        return not self.should_stop
+
+    def _save_comments(self, batch: List[tuple]):
+        """Write comments for a batch of posts in one transaction."""
+        with self.db.transaction():
+            for post, comments in batch:
                 self.db.add_comments_batch(comments)
                 self.db.update_post_comment_count(
                     post['id'], len(comments)
                 )
 
-            # Update UI
-            progress_text = f"댓글 ({i + 1}/{total})"
-            self.message_queue.put((
-                'update_blog_status',
-                (blog_id, Status.IN_PROGRESS, progress_text)
-            ))
-            self.message_queue.put(('progress', (i + 1) / total))
-
-        return not self.should_stop
-
     def _get_step_name(self, step: str) -> str:
         """Get Korean name for step."""
         names = {
@@ -750,6 +915,27 @@ class NaverBlogCrawlerApp(ctk.CTk):
         }
         return names.get(step, step)
 
+    def _iter_export_posts(self, blog_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield each post of a blog with its reactions and nested comments."""
+        # Every query shares one post order, so they merge in one pass;
+        # zip() keeps the tee'd post streams in step, one post buffered
+        posts_a, posts_b = tee(self.db.iter_blog_posts(blog_id))
+        with_comments = _group_by_post(
+            posts_a, self.db.iter_comments_for_blog(blog_id)
+        )
+        with_reactions = _group_by_post(
+            posts_b, self.db.iter_reactions_for_blog(blog_id)
+        )
+
+        for (post, comments), (_, reactions) in zip(with_comments,
+                                                    with_reactions):
+            # Only posts and top comments gain keys; reactions and replies
+            # stay rows, which the JSON export serializes directly
+            post_data = post.to_dict()
+            post_data['reactions'] = reactions
+            post_data['comments'] = assemble_threaded_comments(comments)
+            yield post_data
+
     def _export_data(self):
         """Export crawled data."""
         blogs = self.db.get_all_blogs()
@@ -775,77 +961,48 @@ class NaverBlogCrawlerApp(ctk.CTk):
         for blog in completed:
             blog_id = blog['id']
             # Windows 파일명에 사용 불가한 문자 제거: < > : " / \ | ? *
-            blog_name = blog['blog_name']
-            for char in ['/', '\\', '|', '<', '>', ':', '"', '?', '*']:
-                blog_name = blog_name.replace(char, '_')
-
-            posts = self.db.get_blog_posts(blog_id)
+            blog_name = blog['blog_name'].translate(_FILENAME_FORBIDDEN)
 
+            # Rows are streamed from the DB straight into the export
+            # file, so only one post's data is held at a time
             if export_format == 'yes':
                 # JSON export
-                data = {
+                head = {
                     'blog': {
                         'id': blog['id'],
                         'blog_name': blog['blog_name'],
                         'author_name': blog.get('author_name', ''),
                         'url': blog['url'],
                     },
-                    'posts': []
                 }
-
-                for post in posts:
-                    post_data = dict(post)
-                    post_data['reactions'] = self.db.get_reactions(post['id'])
-                    comments = self.db.get_comments(post['id'])
-
-                    # Structure comments with replies nested
-                    top_comments = []
-                    reply_map = {}
-                    for c in comments:
-                        c_dict = dict(c)
-                        if c['is_reply'] and c.get('parent_id'):
-                            reply_map.setdefault(
-                                c['parent_id'], []
-                            ).append(c_dict)
-                        else:
-                            c_dict['replies'] = []
-                            top_comments.append(c_dict)
-
-                    for tc in top_comments:
-                        tc['replies'] = reply_map.get(tc['id'], [])
-
-                    post_data['comments'] = top_comments
-                    data['posts'].append(post_data)
-
                 filepath = EXPORT_DIR / f"{blog_name}_{timestamp}.json"
-                export_to_json(data, str(filepath))
+                export_to_json_stream(head, 'posts',
+                                      self._iter_export_posts(blog_id),
+                                      str(filepath))
 
             else:
                 # CSV export - posts
-                posts_csv = []
-                for p in posts:
-                    p_dict = dict(p)
-                    p_dict['blog_name'] = blog['blog_name']
-                    p_dict['author_name'] = blog.get('author_name', '')
-                    posts_csv.append(p_dict)
-
+                posts_csv = (
+                    {**p, 'blog_name': blog['blog_name'],
+                     'author_name': blog.get('author_name', '')}
+                    for p in self.db.iter_blog_posts(blog_id)
+                )
                 filepath = EXPORT_DIR / f"{blog_name}_posts_{timestamp}.csv"
                 export_to_csv(posts_csv, str(filepath))
 
-                # CSV export - comments
-                all_comments = []
-                for post in posts:
-                    comments = self.db.get_comments(post['id'])
-                    for c in comments:
-                        c_dict = dict(c)
-                        c_dict['post_title'] = post.get('title', '')
-                        all_comments.append(c_dict)
-
-                if all_comments:
-                    comments_path = (
-                        EXPORT_DIR / f"{blog_name}_comments_{timestamp}.csv"
+                # CSV export - comments (nothing is written if none)
+                all_comments = (
+                    {**c, 'post_title': post.get('title', '')}
+                    for post, comments in _group_by_post(
+                        self.db.iter_blog_posts(blog_id),
+                        self.db.iter_comments_for_blog(blog_id)
                     )
-                    export_to_csv(all_comments, str(comments_path))
+                    for c in comments
+                )
+                comments_path = (
+                    EXPORT_DIR / f"{blog_name}_comments_{timestamp}.csv"
+                )
+                export_to_csv(all_comments, str(comments_path))
 
         self._log_message(f"데이터 내보내기 완료: {EXPORT_DIR}")
         messagebox.showinfo(
@@ -855,77 +1012,154 @@ class NaverBlogCrawlerApp(ctk.CTk):
     def _log_message(self, message: str):
         """Log a message (thread-safe)."""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.message_queue.put(('log', f"[{timestamp}] {message}"))
+        self._post_message('log', f"[{timestamp}] {message}")
+
+    def _post_message(self, msg_type: str, data: Any):
+        """Queue a UI update from any thread and wake Tk to apply it."""
+        with self._queue_lock:
+            self.message_queue.append((msg_type, data))
+        # One pending event drains everything queued before it runs
+        if not self._drain_requested.is_set():
+            self._drain_requested.set()
+            try:
+                self.event_generate("<<CrawlMessage>>", when="tail")
+            except (RuntimeError, TclError):
+                # No main loop yet, or the window is gone; the poll in
+                # _poll_message_queue still drains the queue
+                pass
+
+    def _poll_message_queue(self):
+        """Drain the queue every second in case a wakeup event is lost."""
+        self._process_message_queue()
+        self.after(1000, self._poll_message_queue)
 
     def _process_message_queue(self):
         """Process messages from background threads."""
-        try:
-            while True:
-                msg_type, data = self.message_queue.get_nowait()
-
-                if msg_type == 'log':
-                    self.log_text.insert("end", f"{data}\n")
-                    self.log_text.see("end")
-
-                elif msg_type == 'progress':
-                    self.progress_bar.set(data)
-                    self.progress_label.configure(
-                        text=f"전체 진행률: {int(data * 100)}%"
-                    )
-
-                elif msg_type == 'task':
-                    self.task_label.configure(text=data)
-
-                elif msg_type == 'add_blog':
-                    blog_data = data
-                    self._add_blog_to_list(blog_data)
-
-                elif msg_type == 'enable_add':
-                    self.add_btn.configure(state="normal")
-
-                elif msg_type == 'update_blog_status':
-                    blog_id, status, progress_text = data
-                    if blog_id in self.blog_widgets:
-                        self.blog_widgets[blog_id].update_status(
-                            status, progress_text
-                        )
-
-                elif msg_type == 'crawl_finished':
-                    self.is_crawling = False
-                    self.should_stop = False
-                    self.start_btn.configure(state="normal")
-                    self.pause_btn.configure(state="disabled")
-                    self.stop_btn.configure(state="disabled")
-                    self.add_btn.configure(state="normal")
-                    self.task_label.configure(text="현재 작업: 대기 중")
-
-        except queue.Empty:
-            pass
+        self._drain_requested.clear()
+        # Drain everything queued since the last drain, then apply logs,
+        # progress and per-blog status once each to limit redraws
+        logs = []
+        progress = None
+        blog_statuses = {}
+        # Swap the whole batch out under one lock acquisition
+        with self._queue_lock:
+            batch, self.message_queue = self.message_queue, deque()
+
+        for msg_type, data in batch:
+            if msg_type == 'log':
+                logs.append(data)
+
+            elif msg_type == 'progress':
+                progress = data
+
+            elif msg_type == 'task':
+                self.task_label.configure(text=data)
+
+            elif msg_type == 'add_blog':
+                blog_data = data
+                self._add_blog_to_list(blog_data)
+
+            elif msg_type == 'enable_add':
+                self.add_btn.configure(state="normal")
+
+            elif msg_type == 'update_blog_status':
+                blog_id, status, progress_text = data
+                blog_statuses[blog_id] = (status, progress_text)
+
+            elif msg_type == 'crawl_finished':
+                self._set_crawling(False)
+
+        if logs:
+            self.log_text.insert("end", "\n".join(logs) + "\n")
+            self.log_text.see("end")
+
+        if progress is not None:
+            self.progress_bar.set(progress)
+            self.progress_label.configure(
+                text=f"전체 진행률: {int(progress * 100)}%"
+            )
 
-        # Schedule next check
-        self.after(100, self._process_message_queue)
+        for blog_id, (status, progress_text) in blog_statuses.items():
+            if blog_id in self.blog_widgets:
+                self.blog_widgets[blog_id].update_status(
+                    status, progress_text
+                )
 
     def on_closing(self):
         """Handle window close event."""
-        from crawler.selenium_helper import close_shared_driver
+        from crawler.selenium_helper import close_shared_drivers
 
         if self.is_crawling:
             if messagebox.askyesno(
                 "확인", "크롤링이 진행 중입니다. 종료하시겠습니까?"
             ):
                 self.should_stop = True
+                # Write synchronously, after anything still queued
+                self.progress_writer.flush()
                 save_progress(self.progress_data)
                 self.db.close()
-                close_shared_driver()
+                close_shared_drivers()
                 self.destroy()
         else:
+            self.progress_writer.flush()
             self.db.close()
-            close_shared_driver()
+            close_shared_drivers()
             self.destroy()
 
 
+def _code_hash(code: str) -> str:
+    """Hash an access code so the auth cache never stores it in clear."""
+    return hashlib.blake2b(code.encode('utf-8')).hexdigest()
+
+
+def _try_cached_auth() -> bool:
+    """Check for a code verified within AUTH_CACHE_TTL that hasn't expired."""
+    try:
+        with open(AUTH_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        code_hash = cache['code_hash']
+        authenticated_at = datetime.fromisoformat(cache['authenticated_at'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+    now = datetime.now()
+    if now - authenticated_at > timedelta(seconds=AUTH_CACHE_TTL):
+        return False
+
+    # Expiry comes from ACCESS_CODES, so removed or shortened codes apply
+    for code, expiry_date in _ACCESS_CODE_EXPIRY.items():
+        if _code_hash(code) == code_hash:
+            return now <= expiry_date
+    return False
+
+
+def _save_auth_cache(code: str):
+    """Remember a successful verification for _try_cached_auth."""
+    try:
+        with open(AUTH_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump({
+                'code_hash': _code_hash(code),
+                'authenticated_at': datetime.now().isoformat(),
+            }, f)
+        os.chmod(AUTH_CACHE_PATH, 0o600)
+    except OSError:
+        pass
+
+
 def verify_access() -> bool:
-    """Verify access code before starting the application."""
+    """Verify access code before starting the application.
+
+    Scripted runs can pass the code in NAVERBLOG_AUTH_CODE, which is
+    checked without ever opening the dialog; an empty value is ignored.
+    """
+    env_code = os.environ.get("NAVERBLOG_AUTH_CODE", "").strip().upper()
+    if env_code:
+        expiry_date = _ACCESS_CODE_EXPIRY.get(env_code)
+        return expiry_date is not None and datetime.now() <= expiry_date
+
+    if _try_cached_auth():
+        return True
+
     dialog = ctk.CTk()
     dialog.title("인증")
     dialog.geometry("350x180")
@@ -963,19 +1197,18 @@ def verify_access() -> bool:
             status_label.configure(text="코드를 입력해주세요")
             return
 
-        expiry = ACCESS_CODES.get(code)
-
-        if not expiry:
+        if code not in _ACCESS_CODE_EXPIRY:
             status_label.configure(text="유효하지 않은 코드입니다")
             return
 
-        expiry_date = datetime.strptime(expiry, "%Y-%m-%d")
-        if datetime.now() > expiry_date:
+        if datetime.now() > _ACCESS_CODE_EXPIRY[code]:
+            expiry = ACCESS_CODES.get(code)
             status_label.configure(
                 text=f"만료된 코드입니다 (만료일: {expiry})"
             )
             return
 
+        _save_auth_cache(code)
         result["verified"] = True
         dialog.destroy()
 
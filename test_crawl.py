@@ -1,40 +1,68 @@
 """TC-02/05: Live crawling integration tests against a real Naver blog."""
-import sys, os, tempfile
+import sys, os, tempfile, atexit, threading
 sys.path.insert(0, '.')
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from crawler.blog import BlogCrawler
 from crawler.post import PostCrawler
 from crawler.reaction import ReactionCrawler
 from crawler.comment import CommentCrawler
+from crawler import selenium_helper
 from database.manager import DatabaseManager
 
+# Temp files live in one directory, removed when the script exits
+TMPDIR = tempfile.TemporaryDirectory()
+atexit.register(TMPDIR.cleanup)
+TMP = Path(TMPDIR.name)
+
+# Every crawler borrows browsers from the one shared pool; quit them even
+# if a check below raises
+atexit.register(selenium_helper.close_shared_drivers)
+
 passed = failed = 0
 logs = []
+# Crawler callbacks arrive from worker threads during TC-05-3..5
+_log_lock = threading.Lock()
+
+# Output is buffered and written once per section
+_output = []
+
+def out(line=''):
+    _output.append(line)
+
+def flush_section():
+    if _output:
+        sys.stdout.write('\n'.join(_output) + '\n')
+        _output.clear()
+
+atexit.register(flush_section)
 
 def log_cb(msg):
-    logs.append(msg)
-    print(f'    LOG: {msg}')
+    with _log_lock:
+        logs.append(msg)
+        out(f'    LOG: {msg}')
 
 def check(name, condition):
     global passed, failed
     if condition:
         passed += 1
-        print(f'  [PASS] {name}')
+        out(f'  [PASS] {name}')
     else:
         failed += 1
-        print(f'  [FAIL] {name}')
+        out(f'  [FAIL] {name}')
 
 # Use a known small public blog
 TEST_BLOG_ID = 'blogpeople'
 
-print('=' * 60)
-print('TC-02/05: LIVE CRAWLING INTEGRATION TESTS')
-print(f'Target blog: {TEST_BLOG_ID}')
-print('=' * 60)
+out('=' * 60)
+out('TC-02/05: LIVE CRAWLING INTEGRATION TESTS')
+out(f'Target blog: {TEST_BLOG_ID}')
+out('=' * 60)
 
 # --- TC-05-1: BlogCrawler ---
-print('\n--- TC-05-1: BlogCrawler.get_blog_info ---')
+flush_section()
+out('\n--- TC-05-1: BlogCrawler.get_blog_info ---')
 bc = BlogCrawler(progress_callback=log_cb)
 
 info = bc.get_blog_info(TEST_BLOG_ID)
@@ -46,12 +74,13 @@ if info:
     check('author_name present', 'author_name' in info)
     check('url present', 'url' in info and 'naver.com' in info['url'])
     check('post_count is int', isinstance(info.get('post_count', 0), int))
-    print(f'    => blog_name: {info["blog_name"]}')
-    print(f'    => author_name: {info["author_name"]}')
-    print(f'    => post_count: {info["post_count"]}')
+    out(f'    => blog_name: {info["blog_name"]}')
+    out(f'    => author_name: {info["author_name"]}')
+    out(f'    => post_count: {info["post_count"]}')
 
 # --- TC-05-2: PostCrawler - post list (limit to 1 page) ---
-print('\n--- TC-05-2: PostCrawler.get_post_list ---')
+flush_section()
+out('\n--- TC-05-2: PostCrawler.get_post_list ---')
 pc = PostCrawler(progress_callback=log_cb)
 
 # Only get first page (5 posts) to keep test fast
@@ -67,16 +96,31 @@ if posts:
     check('Post has id', 'id' in p and len(p['id']) > 0)
     check('Post has blog_id', p.get('blog_id') == TEST_BLOG_ID)
     check('Post has log_no', 'log_no' in p and len(p['log_no']) > 0)
-    print(f'    => First post: id={p["id"]}, title={p.get("title", "N/A")[:50]}')
-    print(f'    => Total posts retrieved: {len(posts)}')
+    out(f'    => First post: id={p["id"]}, title={p.get("title", "N/A")[:50]}')
+    out(f'    => Total posts retrieved: {len(posts)}')
 
     test_log_no = p['log_no']
     test_post_id = p['id']
 
+# Content, reactions and comments hit separate endpoints and each crawler
+# borrows its own pooled driver, so fetch them at once; the checks below
+# still run in order
+content = reactions = comments = None
+if test_log_no:
+    rc = ReactionCrawler(progress_callback=log_cb)
+    cc = CommentCrawler(progress_callback=log_cb)
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        content_future = ex.submit(pc.get_post_content, TEST_BLOG_ID, test_log_no)
+        reactions_future = ex.submit(rc.get_reactions, TEST_BLOG_ID, test_log_no)
+        comments_future = ex.submit(cc.get_comments, TEST_BLOG_ID, test_log_no)
+    content = content_future.result()
+    reactions = reactions_future.result()
+    comments = comments_future.result()
+
 # --- TC-05-3: PostCrawler - post content ---
 if test_log_no:
-    print('\n--- TC-05-3: PostCrawler.get_post_content ---')
-    content = pc.get_post_content(TEST_BLOG_ID, test_log_no)
+    flush_section()
+    out('\n--- TC-05-3: PostCrawler.get_post_content ---')
     check('get_post_content returns dict', content is not None and isinstance(content, dict))
 
     if content:
@@ -86,31 +130,29 @@ if test_log_no:
         check('Content has post_date key', 'post_date' in content)
         has_data = content.get('title') is not None or content.get('content') is not None
         check('Has title or content data', has_data)
-        print(f'    => title: {(content.get("title") or "N/A")[:60]}')
-        print(f'    => content length: {len(content.get("content") or "")} chars')
-        print(f'    => category: {content.get("category", "N/A")}')
-        print(f'    => post_date: {content.get("post_date", "N/A")}')
+        out(f'    => title: {(content.get("title") or "N/A")[:60]}')
+        out(f'    => content length: {len(content.get("content") or "")} chars')
+        out(f'    => category: {content.get("category", "N/A")}')
+        out(f'    => post_date: {content.get("post_date", "N/A")}')
 
 # --- TC-05-4: ReactionCrawler ---
 if test_log_no:
-    print('\n--- TC-05-4: ReactionCrawler.get_reactions ---')
-    rc = ReactionCrawler(progress_callback=log_cb)
-    reactions = rc.get_reactions(TEST_BLOG_ID, test_log_no)
+    flush_section()
+    out('\n--- TC-05-4: ReactionCrawler.get_reactions ---')
     check('get_reactions returns dict', reactions is not None and isinstance(reactions, dict))
 
     if reactions:
         check('Has total_count', 'total_count' in reactions)
         check('Has reactions list', 'reactions' in reactions and isinstance(reactions['reactions'], list))
         check('total_count is int', isinstance(reactions['total_count'], int))
-        print(f'    => total_count: {reactions["total_count"]}')
+        out(f'    => total_count: {reactions["total_count"]}')
         for r in reactions.get('reactions', []):
-            print(f'    => {r["reaction_type"]}: {r["count"]}')
+            out(f'    => {r["reaction_type"]}: {r["count"]}')
 
 # --- TC-05-5: CommentCrawler ---
 if test_log_no:
-    print('\n--- TC-05-5: CommentCrawler.get_comments ---')
-    cc = CommentCrawler(progress_callback=log_cb)
-    comments = cc.get_comments(TEST_BLOG_ID, test_log_no)
+    flush_section()
+    out('\n--- TC-05-5: CommentCrawler.get_comments ---')
     check('get_comments returns list', isinstance(comments, list))
 
     if comments:
@@ -124,15 +166,16 @@ if test_log_no:
 
         top_level = [c for c in comments if c['is_reply'] == 0]
         replies = [c for c in comments if c['is_reply'] == 1]
-        print(f'    => Total: {len(comments)}, Top-level: {len(top_level)}, Replies: {len(replies)}')
-        print(f'    => Sample: author={c0["author"]}, content={c0["content"][:50]}')
+        out(f'    => Total: {len(comments)}, Top-level: {len(top_level)}, Replies: {len(replies)}')
+        out(f'    => Sample: author={c0["author"]}, content={c0["content"][:50]}')
     else:
-        print('    => No comments found (post may have comments disabled)')
+        out('    => No comments found (post may have comments disabled)')
 
 # --- Full DB round-trip ---
 if info and posts:
-    print('\n--- Full DB integration: store & retrieve ---')
-    db_path = Path(tempfile.mktemp(suffix='.db'))
+    flush_section()
+    out('\n--- Full DB integration: store & retrieve ---')
+    db_path = TMP / 'crawl.db'
     db = DatabaseManager(db_path)
 
     db.add_blog(TEST_BLOG_ID, info['blog_name'], info['url'],
@@ -152,14 +195,21 @@ if info and posts:
     check('Posts retrievable from DB', len(stored_posts) == len(posts))
 
     db.close()
-    os.unlink(db_path)
 
 # --- TC-02-10: Nonexistent blog ---
-print('\n--- TC-02-10: Nonexistent blog ---')
+flush_section()
+out('\n--- TC-02-10: Nonexistent blog ---')
 bad_info = bc.get_blog_info('this_blog_definitely_does_not_exist_xyz999')
 check('Nonexistent blog handled gracefully',
       bad_info is None or isinstance(bad_info, dict))
 
-print(f'\n{"="*60}')
-print(f'TOTAL: {passed} passed, {failed} failed')
-print(f'{"="*60}')
+# --- Shared Selenium pool ---
+flush_section()
+out('\n--- Shared Selenium pool ---')
+check('Crawlers reused pooled drivers',
+      len(selenium_helper._drivers) <= selenium_helper.POOL_SIZE)
+
+out(f'\n{"="*60}')
+out(f'TOTAL: {passed} passed, {failed} failed')
+out(f'{"="*60}')
+flush_section()
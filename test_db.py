@@ -1,31 +1,56 @@
 """TC-11: Database integrity tests."""
-import sys, os, tempfile
+import sys, os, tempfile, threading, atexit
 sys.path.insert(0, '.')
 
 from pathlib import Path
 from database.manager import DatabaseManager
 from config import Status
 
-db_path = Path(tempfile.mktemp(suffix='.db'))
+# Temp files live in one directory, removed when the script exits
+TMPDIR = tempfile.TemporaryDirectory()
+atexit.register(TMPDIR.cleanup)
+TMP = Path(TMPDIR.name)
+
+db_path = TMP / 'test.db'
 db = DatabaseManager(db_path)
 
 passed = failed = 0
 
+# Output is buffered and written once per section
+_output = []
+
+def out(line=''):
+    _output.append(line)
+
+def flush_section():
+    if _output:
+        sys.stdout.write('\n'.join(_output) + '\n')
+        _output.clear()
+
+atexit.register(flush_section)
+
 def check(name, condition):
     global passed, failed
     if condition:
         passed += 1
-        print(f'  [PASS] {name}')
+        out(f'  [PASS] {name}')
     else:
         failed += 1
-        print(f'  [FAIL] {name}')
+        out(f'  [FAIL] {name}')
+
+out('=' * 60)
+out('TC-11: DATABASE INTEGRITY TESTS')
+out('=' * 60)
 
-print('=' * 60)
-print('TC-11: DATABASE INTEGRITY TESTS')
-print('=' * 60)
+# --- Connection settings ---
+flush_section()
+out('\n--- Connection settings ---')
+check('WAL journal mode', db.conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal')
+check('Busy timeout set', db.conn.execute('PRAGMA busy_timeout').fetchone()[0] == 5000)
 
 # --- Blog CRUD ---
-print('\n--- Blog CRUD ---')
+flush_section()
+out('\n--- Blog CRUD ---')
 r = db.add_blog('blog1', 'Test Blog', 'https://blog.naver.com/blog1', 'Author1', 10)
 check('Add blog', r == True)
 
@@ -37,9 +62,16 @@ check('Get blog by ID', b is not None and b['blog_name'] == 'Test Blog')
 check('Author name stored', b['author_name'] == 'Author1')
 check('Post count stored', b['post_count'] == 10)
 check('Status default PENDING', b['status'] == Status.PENDING)
+check('Row supports get()', b.get('author_name') == 'Author1' and b.get('missing', 'x') == 'x')
+check('Row converts to dict', dict(b)['id'] == 'blog1')
+check('Row to_dict matches dict()', b.to_dict() == dict(b))
+check('Row exposes columns as attributes', b.blog_name == 'Test Blog' and b.post_count == 10)
+check('Row has no per-instance dict', not hasattr(b, '__dict__'))
 
 blogs = db.get_all_blogs()
 check('Get all blogs returns list', len(blogs) == 1)
+check('Get blogs by ids skips missing', [b['id'] for b in db.get_blogs_by_ids(['blog1', 'nope'])] == ['blog1'])
+check('Get blogs by empty ids', db.get_blogs_by_ids([]) == [])
 
 r = db.update_blog_status('blog1', Status.IN_PROGRESS)
 check('Update blog status', r == True)
@@ -59,7 +91,8 @@ r = db.update_blog_info('blog1')
 check('Update blog info with no params returns False', r == False)
 
 # --- Post CRUD ---
-print('\n--- Post CRUD ---')
+flush_section()
+out('\n--- Post CRUD ---')
 r = db.add_post('blog1_001', 'blog1', 'Post 1', 'https://url1')
 check('Add post', r == True)
 
@@ -76,6 +109,15 @@ check('Batch add posts (skip dup)', added == 2)
 
 posts = db.get_blog_posts('blog1')
 check('Get all posts for blog', len(posts) == 3)
+check('existing_post_ids finds stored posts',
+      db.existing_post_ids(['blog1_001', 'blog1_003', 'blog1_999']) == {'blog1_001', 'blog1_003'})
+check('existing_post_ids chunks large lists',
+      db.existing_post_ids([f'x{i}' for i in range(1200)] + ['blog1_002']) == {'blog1_002'})
+streamed = db._iter_rows(db.conn.execute("SELECT id FROM posts ORDER BY id"), size=2)
+check('Streamed rows span fetchmany batches',
+      [r['id'] for r in streamed] == ['blog1_001', 'blog1_002', 'blog1_003'])
+check('iter_blog_posts matches get_blog_posts',
+      [p['id'] for p in db.iter_blog_posts('blog1')] == [p['id'] for p in posts])
 
 r = db.update_post_content('blog1_001', title='Updated Title', content='Hello world',
                            category='Tech', post_date='2026-01-27')
@@ -84,6 +126,7 @@ p = db.get_post('blog1_001')
 check('Post title updated', p['title'] == 'Updated Title')
 check('Post content stored', p['content'] == 'Hello world')
 check('Post category stored', p['category'] == 'Tech')
+check('Post log_no derived from id', p['log_no'] == '001')
 
 r = db.update_post_crawl_status('blog1_001', Status.COMPLETED)
 check('Update crawl status', r == True)
@@ -94,6 +137,12 @@ check('Get pending posts', len(pending) == 2)
 completed = db.get_posts_by_status('blog1', crawl_status=Status.COMPLETED)
 check('Get completed posts', len(completed) == 1)
 
+n = db.update_post_crawl_status_many(['blog1_002', 'blog1_003'], Status.UNAVAILABLE)
+check('Batch update crawl status', n == 2)
+check('Batch status applied',
+      len(db.get_posts_by_status('blog1', crawl_status=Status.UNAVAILABLE)) == 2)
+db.update_post_crawl_status_many(['blog1_002', 'blog1_003'], Status.PENDING)
+
 r = db.update_post_sympathy_count('blog1_001', 42)
 check('Update sympathy count', r == True)
 p = db.get_post('blog1_001')
@@ -105,13 +154,15 @@ p = db.get_post('blog1_001')
 check('Comment count stored', p['comment_count'] == 15)
 
 # --- Reaction CRUD ---
-print('\n--- Reaction CRUD ---')
+flush_section()
+out('\n--- Reaction CRUD ---')
 r = db.add_reaction('blog1_001', 'like', 30)
 check('Add reaction', r == True)
 
 r = db.add_reaction('blog1_001', 'fun', 12)
 check('Add second reaction type', r == True)
 
+like_id = db.get_reactions('blog1_001')[0]['id']
 r = db.add_reaction('blog1_001', 'like', 35)
 check('Update existing reaction (REPLACE)', r == True)
 
@@ -119,6 +170,7 @@ reactions = db.get_reactions('blog1_001')
 check('Get reactions count', len(reactions) == 2)
 like_r = [r for r in reactions if r['reaction_type'] == 'like'][0]
 check('Reaction count updated to 35', like_r['count'] == 35)
+check('Upsert keeps the reaction row id', like_r['id'] == like_id)
 
 batch_r = [
     {'post_id': 'blog1_002', 'reaction_type': 'sympathy', 'count': 5},
@@ -126,9 +178,17 @@ batch_r = [
 ]
 added = db.add_reactions_batch(batch_r)
 check('Batch add reactions', added == 2)
+db.add_reactions_batch([{'post_id': 'blog1_002', 'reaction_type': 'useful', 'count': 4}])
+useful = [r for r in db.get_reactions('blog1_002') if r['reaction_type'] == 'useful']
+check('Batch upsert updates existing count', len(useful) == 1 and useful[0]['count'] == 4)
+added = db.bulk_upsert_reactions([('blog1_002', 'useful', 6), ('blog1_002', 'sympathy', 5)])
+check('Bulk upsert takes tuples', added == 2)
+counts = {r['reaction_type']: r['count'] for r in db.get_reactions('blog1_002')}
+check('Bulk upsert updates counts in place', counts == {'sympathy': 5, 'useful': 6})
 
 # --- Comment CRUD ---
-print('\n--- Comment CRUD ---')
+flush_section()
+out('\n--- Comment CRUD ---')
 r = db.add_comment('c1', 'blog1_001', 'User A', 'Nice post!', 5, '2026-01-27', is_reply=0)
 check('Add top-level comment', r == True)
 
@@ -144,11 +204,24 @@ check('Get all comments with replies', len(all_comments) == 3)
 
 top_only = db.get_comments('blog1_001', include_replies=False)
 check('Get top-level comments only', len(top_only) == 2)
+check('Filter top-level comments in SQL',
+      [c['id'] for c in db.get_comments('blog1_001', is_reply=False)] == [c['id'] for c in top_only])
 
 count = db.get_comment_count('blog1_001')
 check('Comment count', count == 3)
 
-reply = [c for c in all_comments if c['is_reply'] == 1][0]
+blog_comments = db.get_comments_for_blog('blog1')
+check('Blog-wide comments query', len(blog_comments) == 3)
+blog_reactions = db.get_reactions_for_blog('blog1')
+post_order = [p['id'] for p in db.iter_blog_posts('blog1')]
+check('Blog-wide reactions in post order',
+      [r['post_id'] for r in blog_reactions] == sorted((r['post_id'] for r in blog_reactions),
+                                                       key=post_order.index)
+      and len(blog_reactions) == 4)
+
+replies = db.get_comments('blog1_001', is_reply=True)
+check('Filter replies in SQL', len(replies) == 1)
+reply = replies[0]
 check('Reply parent_id is correct', reply['parent_id'] == 'c1')
 check('Reply like_count stored', reply['like_count'] == 2)
 
@@ -161,26 +234,30 @@ batch_c = [
 ]
 added = db.add_comments_batch(batch_c)
 check('Batch add comments', added == 2)
+check('Re-adding comment batch adds none', db.add_comments_batch(batch_c) == 0)
 
 # --- TC-11-1: Comment-reply FK integrity ---
-print('\n--- TC-11-1: Comment-reply FK integrity ---')
+flush_section()
+out('\n--- TC-11-1: Comment-reply FK integrity ---')
 all_ids = {c['id'] for c in all_comments}
-invalid_parents = [c for c in all_comments
-                   if c['is_reply'] == 1
-                   and c['parent_id'] not in all_ids]
+invalid_parents = [c for c in db.get_comments('blog1_001', is_reply=True)
+                   if c['parent_id'] not in all_ids]
 check('All reply parent_ids are valid', len(invalid_parents) == 0)
 
 # --- TC-11-3: Post-blog FK integrity ---
-print('\n--- TC-11-3: Post-blog FK integrity ---')
+flush_section()
+out('\n--- TC-11-3: Post-blog FK integrity ---')
 all_posts = db.get_blog_posts('blog1')
 check('All posts belong to valid blog', all(p['blog_id'] == 'blog1' for p in all_posts))
 
 # --- TC-11-4: Cascade delete ---
-print('\n--- TC-11-4: Cascade delete ---')
-db.add_blog('blog2', 'Blog 2', 'url2')
-db.add_post('blog2_001', 'blog2', 'P1')
-db.add_comment('c10', 'blog2_001', 'X', 'Y')
-db.add_reaction('blog2_001', 'like', 5)
+flush_section()
+out('\n--- TC-11-4: Cascade delete ---')
+with db.transaction():
+    db.add_blog('blog2', 'Blog 2', 'url2')
+    db.add_post('blog2_001', 'blog2', 'P1')
+    db.add_comment('c10', 'blog2_001', 'X', 'Y')
+    db.add_reaction('blog2_001', 'like', 5)
 
 r = db.delete_blog('blog2')
 check('Delete blog returns True', r == True)
@@ -192,13 +269,15 @@ check('Blog1 still exists', db.get_blog('blog1') is not None)
 check('Blog1 posts unaffected', len(db.get_blog_posts('blog1')) == 3)
 
 # --- Progress ---
-print('\n--- Progress CRUD ---')
+flush_section()
+out('\n--- Progress CRUD ---')
 r = db.init_progress('blog1', 25)
 check('Init progress', r == True)
 
 prog = db.get_progress('blog1')
 check('Get progress', prog is not None)
 check('Progress total_posts', prog['total_posts'] == 25)
+check('Progress timestamped by SQLite', bool(prog['last_updated']))
 
 r = db.update_progress('blog1', current_post_index=10, current_step='post_content')
 check('Update progress', r == True)
@@ -206,16 +285,115 @@ prog = db.get_progress('blog1')
 check('Progress index updated', prog['current_post_index'] == 10)
 check('Progress step updated', prog['current_step'] == 'post_content')
 
+# --- Transactions ---
+flush_section()
+out('\n--- Transactions ---')
+with db.transaction():
+    db.update_post_sympathy_count('blog1_003', 7)
+    db.update_post_comment_count('blog1_003', 2)
+p3 = db.get_post('blog1_003')
+check('Transaction commits grouped updates', p3['sympathy_count'] == 7 and p3['comment_count'] == 2)
+try:
+    with db.transaction():
+        db.update_post_sympathy_count('blog1_003', 99)
+        raise RuntimeError('boom')
+except RuntimeError:
+    pass
+check('Transaction rolls back on error', db.get_post('blog1_003')['sympathy_count'] == 7)
+
+# --- Per-thread connections ---
+flush_section()
+out('\n--- Per-thread connections ---')
+seen = {}
+def worker():
+    seen['conn'] = db.conn
+    db.update_post_sympathy_count('blog1_003', 8)
+    seen['foreign_keys'] = db.conn.execute('PRAGMA foreign_keys').fetchone()[0]
+t = threading.Thread(target=worker)
+t.start()
+t.join()
+check('Worker thread gets its own connection', seen['conn'] is not db.conn)
+check('Worker connection has PRAGMAs', seen['foreign_keys'] == 1)
+check('Worker write visible to main thread', db.get_post('blog1_003')['sympathy_count'] == 8)
+db.update_post_sympathy_count('blog1_003', 7)
+
+# --- HTTP Cache ---
+flush_section()
+out('\n--- HTTP Cache ---')
+check('Missing cache entry is None', db.get_http_cache('https://m.blog.naver.com/x') is None)
+db.set_http_cache('https://m.blog.naver.com/x', '"abc"', 'Mon, 01 Jan 2026 00:00:00 GMT', '{"id": "x"}')
+db.set_http_cache('https://m.blog.naver.com/x', '"def"', None, '{"id": "x"}')
+entry = db.get_http_cache('https://m.blog.naver.com/x')
+check('Cache entry replaced', entry['etag'] == '"def"' and entry['last_modified'] is None)
+
 # --- Stats ---
-print('\n--- Blog Stats ---')
+flush_section()
+out('\n--- Blog Stats ---')
 stats = db.get_blog_stats('blog1')
 check('Stats total_posts', stats['total_posts'] == 3)
 check('Stats posts_completed', stats['posts_completed'] == 1)
 check('Stats total_comments (3+2 batch)', stats['total_comments'] == 5)
 
+# --- Replies whose parent is not stored yet ---
+flush_section()
+out('\n--- Orphan replies ---')
+odb = DatabaseManager(TMP / 'orphan.db', test_mode=True)
+odb.add_blog('ob', 'Orphans', 'url')
+odb.add_post('ob_001', 'ob', 'P1')
+orphan_batch = [
+    # sort=NEW order: the reply arrives before its parent
+    {'id': 'r1', 'post_id': 'ob_001', 'parent_id': 'p1', 'author': 'A',
+     'content': 'reply', 'is_reply': 1},
+    {'id': 'p1', 'post_id': 'ob_001', 'author': 'B', 'content': 'parent'},
+    # Parent on a later API page
+    {'id': 'r2', 'post_id': 'ob_001', 'parent_id': 'missing', 'author': 'C',
+     'content': 'orphan', 'is_reply': 1},
+]
+check('Orphan reply does not drop the batch', odb.add_comments_batch(orphan_batch) == 3)
+stored = {c['id']: c for c in odb.get_comments('ob_001')}
+check('Reply before its parent keeps parent_id', stored['r1']['parent_id'] == 'p1')
+check('Orphan reply stored without parent_id', stored['r2']['parent_id'] is None)
+check('Orphan reply still marked as reply', stored['r2']['is_reply'] == 1)
+later = [{'id': 'r3', 'post_id': 'ob_001', 'parent_id': 'p1', 'author': 'D',
+          'content': 'late reply', 'is_reply': 1}]
+odb.add_comments_batch(later)
+check('Reply links to a parent stored earlier', odb.get_comments('ob_001', is_reply=True)[-1]['parent_id'] == 'p1')
+
+# A row the schema rejects (unknown post) costs only that row
+bad_batch = [
+    {'id': 'g1', 'post_id': 'ob_001', 'author': 'E', 'content': 'good'},
+    {'id': 'b1', 'post_id': 'no_such_post', 'author': 'F', 'content': 'bad'},
+    {'id': 'g2', 'post_id': 'ob_001', 'author': 'G', 'content': 'good'},
+]
+check('Failed batch keeps the good rows', odb.add_comments_batch(bad_batch) == 2)
+with odb.transaction():
+    nested = odb.add_comments_batch([dict(c, id=c['id'] + 'n') for c in bad_batch])
+check('Nested failed batch counts the same', nested == 2)
+stored_ids = {c['id'] for c in odb.get_comments('ob_001')}
+check('Good rows stored, rejected row left out',
+      {'g1', 'g2', 'g1n', 'g2n'} <= stored_ids and 'b1' not in stored_ids)
+odb.close()
+
+# --- Test mode: prepared inserts without fsync ---
+flush_section()
+out('\n--- Test mode fast inserts ---')
+fast = DatabaseManager(TMP / 'fast.db', test_mode=True)
+check('Test mode skips WAL', fast.conn.execute('PRAGMA journal_mode').fetchone()[0] == 'memory')
+check('Test mode skips fsync', fast.conn.execute('PRAGMA synchronous').fetchone()[0] == 0)
+fast.add_blog('fb', 'Fast', 'url')
+added = [fast.add_post_fast(f'fb_{i:04d}', 'fb', f'P{i}') for i in range(1000)]
+check('add_post_fast leaves writes pending', fast.conn.in_transaction)
+fast.flush()
+check('flush commits pending inserts', not fast.conn.in_transaction)
+check('add_post_fast inserted every post', all(added) and len(fast.get_blog_posts('fb')) == 1000)
+check('add_post_fast skips duplicates', fast.add_post_fast('fb_0000', 'fb', 'Dup') == False)
+fast.flush()
+check('add_post_fast derives log_no', fast.get_post('fb_0007')['log_no'] == '0007')
+fast.close()
+
 db.close()
-os.unlink(db_path)
 
-print(f'\n{"="*60}')
-print(f'TOTAL: {passed} passed, {failed} failed')
-print(f'{"="*60}')
+out(f'\n{"="*60}')
+out(f'TOTAL: {passed} passed, {failed} failed')
+out(f'{"="*60}')
+flush_section()
@@ -1,71 +1,106 @@
 """TC-08: Export functionality tests (JSON and CSV)."""
-import sys, os, tempfile, json, csv
+import sys, os, tempfile, json, csv, atexit
 sys.path.insert(0, '.')
 
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 from database.manager import DatabaseManager
-from utils.helpers import export_to_json, export_to_csv
+from utils.helpers import (export_to_json, export_to_json_stream, export_to_csv,
+                           assemble_threaded_comments)
 from config import Status
 
+# Temp files live in one directory, removed when the script exits
+TMPDIR = tempfile.TemporaryDirectory()
+atexit.register(TMPDIR.cleanup)
+TMP = Path(TMPDIR.name)
+
 passed = failed = 0
 
+# Output is buffered and written once per section
+_output = []
+
+def out(line=''):
+    _output.append(line)
+
+def flush_section():
+    if _output:
+        sys.stdout.write('\n'.join(_output) + '\n')
+        _output.clear()
+
+atexit.register(flush_section)
+
 def check(name, condition):
     global passed, failed
     if condition:
         passed += 1
-        print(f'  [PASS] {name}')
+        out(f'  [PASS] {name}')
     else:
         failed += 1
-        print(f'  [FAIL] {name}')
+        out(f'  [FAIL] {name}')
 
-print('=' * 60)
-print('TC-08: EXPORT FUNCTIONALITY TESTS')
-print('=' * 60)
+out('=' * 60)
+out('TC-08: EXPORT FUNCTIONALITY TESTS')
+out('=' * 60)
 
 # Setup: create DB with test data
-db_path = Path(tempfile.mktemp(suffix='.db'))
-db = DatabaseManager(db_path)
-
-# Populate data
-db.add_blog('testblog', 'Test Blog Name', 'https://blog.naver.com/testblog',
-            'Author Kim', 3)
-db.update_blog_status('testblog', Status.COMPLETED)
-
-db.add_post('testblog_001', 'testblog', 'First Post Title',
-            'https://blog.naver.com/testblog/001')
-db.update_post_content('testblog_001', title='First Post Title',
-                       content='This is the first post content.\nWith multiple lines.',
-                       category='Tech', post_date='2026-01-20')
-db.update_post_crawl_status('testblog_001', Status.COMPLETED)
-
-db.add_post('testblog_002', 'testblog', 'Second Post Title',
-            'https://blog.naver.com/testblog/002')
-db.update_post_content('testblog_002', title='Second Post Title',
-                       content='Second post body text.',
-                       category='Daily', post_date='2026-01-21')
-db.update_post_crawl_status('testblog_002', Status.COMPLETED)
-
-db.add_post('testblog_003', 'testblog', 'Third Post',
-            'https://blog.naver.com/testblog/003')
-db.update_post_content('testblog_003', title='Third Post',
-                       content='Third post.',
-                       category='Tech', post_date='2026-01-22')
-
-# Reactions
-db.add_reaction('testblog_001', 'like', 42)
-db.add_reaction('testblog_001', 'fun', 10)
-db.add_reaction('testblog_002', 'sympathy', 5)
-
-# Comments with replies
-db.add_comment('c1', 'testblog_001', 'Alice', 'Great post!', 5, '2026-01-20', is_reply=0)
-db.add_comment('c2', 'testblog_001', 'Bob', 'Thanks Alice!', 2, '2026-01-20',
-               parent_id='c1', is_reply=1)
-db.add_comment('c3', 'testblog_001', 'Charlie', 'Nice content.', 3, '2026-01-21', is_reply=0)
-db.add_comment('c4', 'testblog_002', 'Dave', 'Interesting.', 0, '2026-01-21', is_reply=0)
+db_path = TMP / 'export.db'
+# Throwaway database, so skip journaling and fsync
+db = DatabaseManager(db_path, test_mode=True)
+
+# Populate data in one transaction
+with db.transaction():
+    db.add_blog('testblog', 'Test Blog Name', 'https://blog.naver.com/testblog',
+                'Author Kim', 3)
+    db.update_blog_status('testblog', Status.COMPLETED)
+
+    db.add_posts_batch([
+        {'id': 'testblog_001', 'blog_id': 'testblog', 'title': 'First Post Title',
+         'post_url': 'https://blog.naver.com/testblog/001'},
+        {'id': 'testblog_002', 'blog_id': 'testblog', 'title': 'Second Post Title',
+         'post_url': 'https://blog.naver.com/testblog/002'},
+        {'id': 'testblog_003', 'blog_id': 'testblog', 'title': 'Third Post',
+         'post_url': 'https://blog.naver.com/testblog/003'},
+    ])
+    db.update_post_content('testblog_001', title='First Post Title',
+                           content='This is the first post content.\nWith multiple lines.',
+                           category='Tech', post_date='2026-01-20')
+    db.update_post_content('testblog_002', title='Second Post Title',
+                           content='Second post body text.',
+                           category='Daily', post_date='2026-01-21')
+    db.update_post_content('testblog_003', title='Third Post',
+                           content='Third post.',
+                           category='Tech', post_date='2026-01-22')
+    db.update_post_crawl_status_many(['testblog_001', 'testblog_002'],
+                                     Status.COMPLETED)
+
+    # Reactions
+    db.bulk_upsert_reactions([
+        ('testblog_001', 'like', 42),
+        ('testblog_001', 'fun', 10),
+        ('testblog_002', 'sympathy', 5),
+    ])
+
+    # Comments with replies
+    db.add_comments_batch([
+        {'id': 'c1', 'post_id': 'testblog_001', 'author': 'Alice',
+         'content': 'Great post!', 'like_count': 5, 'written_at': '2026-01-20',
+         'is_reply': 0},
+        {'id': 'c2', 'post_id': 'testblog_001', 'author': 'Bob',
+         'content': 'Thanks Alice!', 'like_count': 2, 'written_at': '2026-01-20',
+         'parent_id': 'c1', 'is_reply': 1},
+        {'id': 'c3', 'post_id': 'testblog_001', 'author': 'Charlie',
+         'content': 'Nice content.', 'like_count': 3, 'written_at': '2026-01-21',
+         'is_reply': 0},
+        {'id': 'c4', 'post_id': 'testblog_002', 'author': 'Dave',
+         'content': 'Interesting.', 'like_count': 0, 'written_at': '2026-01-21',
+         'is_reply': 0},
+    ])
 
 # --- TC-08-1: export_to_json basic ---
-print('\n--- TC-08-1: JSON export basic ---')
-tmp_json = tempfile.mktemp(suffix='.json')
+flush_section()
+out('\n--- TC-08-1: JSON export basic ---')
+tmp_json = TMP / 'basic.json'
 data = {'test': 'value', 'number': 42, 'korean': '한글 테스트'}
 result = export_to_json(data, tmp_json)
 check('export_to_json returns True', result == True)
@@ -76,11 +111,27 @@ with open(tmp_json, 'r', encoding='utf-8') as f:
 check('JSON content matches', loaded['test'] == 'value')
 check('Korean preserved', loaded['korean'] == '한글 테스트')
 check('Number preserved', loaded['number'] == 42)
-os.unlink(tmp_json)
+
+# --- TC-08-1b: streamed JSON export ---
+flush_section()
+out('\n--- TC-08-1b: Streamed JSON export ---')
+tmp_a = TMP / 'full.json'
+tmp_b = TMP / 'streamed.json'
+head = {'blog': {'id': 'b', 'name': '한글'}}
+items = [{'id': 1, 'tags': ['x', 'y']}, {'id': 2, 'text': 'line\nbreak'}]
+export_to_json({**head, 'posts': items}, tmp_a)
+result = export_to_json_stream(head, 'posts', iter(items), tmp_b)
+check('export_to_json_stream returns True', result == True)
+with open(tmp_a, encoding='utf-8') as fa, open(tmp_b, encoding='utf-8') as fb:
+    check('Streamed output matches export_to_json', fa.read() == fb.read())
+export_to_json_stream(head, 'posts', iter([]), tmp_b)
+with open(tmp_b, encoding='utf-8') as fb:
+    check('Streamed empty list is valid JSON', json.load(fb)['posts'] == [])
 
 # --- TC-08-2: export_to_csv basic ---
-print('\n--- TC-08-2: CSV export basic ---')
-tmp_csv = tempfile.mktemp(suffix='.csv')
+flush_section()
+out('\n--- TC-08-2: CSV export basic ---')
+tmp_csv = TMP / 'basic.csv'
 csv_data = [
     {'name': 'Alice', 'age': 30, 'city': 'Seoul'},
     {'name': 'Bob', 'age': 25, 'city': 'Busan'},
@@ -95,11 +146,16 @@ with open(tmp_csv, 'r', encoding='utf-8-sig') as f:
 check('CSV has 2 rows', len(rows) == 2)
 check('CSV first row name', rows[0]['name'] == 'Alice')
 check('CSV second row city', rows[1]['city'] == 'Busan')
-os.unlink(tmp_csv)
+
+tmp_csv = TMP / 'generator.csv'
+result = export_to_csv((row for row in csv_data), tmp_csv)
+with open(tmp_csv, 'r', encoding='utf-8-sig') as f:
+    check('CSV export accepts a generator', result == True and len(list(csv.DictReader(f))) == 2)
 
 # --- TC-08-3: CSV with BOM (UTF-8-sig) ---
-print('\n--- TC-08-3: CSV UTF-8-sig BOM ---')
-tmp_csv = tempfile.mktemp(suffix='.csv')
+flush_section()
+out('\n--- TC-08-3: CSV UTF-8-sig BOM ---')
+tmp_csv = TMP / 'korean.csv'
 csv_korean = [
     {'이름': '김철수', '나이': '30', '도시': '서울'},
     {'이름': '박영희', '나이': '25', '도시': '부산'},
@@ -114,11 +170,11 @@ with open(tmp_csv, 'r', encoding='utf-8-sig') as f:
     rows = list(reader)
 check('Korean headers parsed', '이름' in rows[0])
 check('Korean values preserved', rows[0]['이름'] == '김철수')
-os.unlink(tmp_csv)
 
 # --- TC-08-4: CSV with custom fieldnames ---
-print('\n--- TC-08-4: CSV custom fieldnames ---')
-tmp_csv = tempfile.mktemp(suffix='.csv')
+flush_section()
+out('\n--- TC-08-4: CSV custom fieldnames ---')
+tmp_csv = TMP / 'fieldnames.csv'
 data = [
     {'a': 1, 'b': 2, 'c': 3, 'extra': 'ignored'},
     {'a': 4, 'b': 5, 'c': 6, 'extra': 'also ignored'},
@@ -129,54 +185,62 @@ with open(tmp_csv, 'r', encoding='utf-8-sig') as f:
     reader = csv.DictReader(f)
     rows = list(reader)
 check('Only specified columns', set(rows[0].keys()) == {'a', 'b', 'c'})
-os.unlink(tmp_csv)
+
+export_to_csv(data, tmp_csv, fieldnames=['b'])
+with open(tmp_csv, 'r', encoding='utf-8-sig') as f:
+    rows = list(csv.DictReader(f))
+check('Single custom field', [r['b'] for r in rows] == ['2', '5'])
+
+export_to_csv([{'a': 1, 'b': 2}, {'a': 3}], tmp_csv)
+with open(tmp_csv, 'r', encoding='utf-8-sig') as f:
+    rows = list(csv.DictReader(f))
+check('Missing field written empty', rows[1] == {'a': '3', 'b': ''})
 
 # --- TC-08-5: CSV empty data ---
-print('\n--- TC-08-5: CSV edge cases ---')
-tmp_csv = tempfile.mktemp(suffix='.csv')
+flush_section()
+out('\n--- TC-08-5: CSV edge cases ---')
+tmp_csv = TMP / 'empty.csv'
 result = export_to_csv([], tmp_csv)
 check('Empty list returns False', result == False)
 
 # --- TC-08-6: Full blog JSON export (simulating _export_data logic) ---
-print('\n--- TC-08-6: Full blog JSON export ---')
-tmp_json = tempfile.mktemp(suffix='.json')
+flush_section()
+out('\n--- TC-08-6: Full blog JSON export ---')
+tmp_json = TMP / 'blog.json'
 
 blog = db.get_blog('testblog')
-posts = db.get_blog_posts('testblog')
 
-export_data = {
+head = {
     'blog': {
         'id': blog['id'],
         'blog_name': blog['blog_name'],
         'author_name': blog.get('author_name', ''),
         'url': blog['url'],
     },
-    'posts': []
 }
 
-for post in posts:
-    post_data = dict(post)
-    post_data['reactions'] = db.get_reactions(post['id'])
-    comments = db.get_comments(post['id'])
-
-    # Structure comments with replies nested
-    top_comments = []
-    reply_map = {}
-    for c in comments:
-        c_dict = dict(c)
-        if c['is_reply'] and c.get('parent_id'):
-            reply_map.setdefault(c['parent_id'], []).append(c_dict)
-        else:
-            c_dict['replies'] = []
-            top_comments.append(c_dict)
-
-    for tc in top_comments:
-        tc['replies'] = reply_map.get(tc['id'], [])
-
-    post_data['comments'] = top_comments
-    export_data['posts'].append(post_data)
-
-result = export_to_json(export_data, tmp_json)
+# One query per table for the whole blog, grouped by post
+reactions_by_post = {
+    pid: list(rows) for pid, rows in
+    groupby(db.get_reactions_for_blog('testblog'), key=itemgetter('post_id'))
+}
+comments_by_post = {
+    pid: list(rows) for pid, rows in
+    groupby(db.get_comments_for_blog('testblog'), key=itemgetter('post_id'))
+}
+
+def iter_post_data():
+    """Yield posts one at a time, as the app streams them to disk."""
+    for post in db.iter_blog_posts('testblog'):
+        # Only rows that gain keys are copied; reaction and reply rows
+        # go to the serializer as-is
+        post_data = post.to_dict()
+        post_data['reactions'] = reactions_by_post.get(post['id'], [])
+        post_data['comments'] = assemble_threaded_comments(
+            comments_by_post.get(post['id'], []))
+        yield post_data
+
+result = export_to_json_stream(head, 'posts', iter_post_data(), tmp_json)
 check('Full JSON export succeeds', result == True)
 
 with open(tmp_json, 'r', encoding='utf-8') as f:
@@ -207,20 +271,29 @@ check('Reply is from Bob', c1[0]['replies'][0]['author'] == 'Bob')
 check('Reply like_count is 2', c1[0]['replies'][0]['like_count'] == 2)
 check('Second comment no replies', len(c1[1].get('replies', [])) == 0)
 
-os.unlink(tmp_json)
+# Replies sorted ahead of their parent still nest; orphans are dropped
+threaded = assemble_threaded_comments([
+    {'id': 'r1', 'parent_id': 't1', 'is_reply': 1},
+    {'id': 't1', 'parent_id': None, 'is_reply': 0},
+    {'id': 'r2', 'parent_id': 't1', 'is_reply': 1},
+    {'id': 'r3', 'parent_id': 'gone', 'is_reply': 1},
+])
+check('Threading keeps only top-level comments', [t['id'] for t in threaded] == ['t1'])
+check('Replies nested in original order', [r['id'] for r in threaded[0]['replies']] == ['r1', 'r2'])
+
 
 # --- TC-08-7: Full blog CSV export (simulating _export_data logic) ---
-print('\n--- TC-08-7: Full blog CSV export ---')
-tmp_csv_posts = tempfile.mktemp(suffix='_posts.csv')
-tmp_csv_comments = tempfile.mktemp(suffix='_comments.csv')
+flush_section()
+out('\n--- TC-08-7: Full blog CSV export ---')
+tmp_csv_posts = TMP / 'blog_posts.csv'
+tmp_csv_comments = TMP / 'blog_comments.csv'
 
 # Posts CSV
-posts_csv = []
-for p in posts:
-    p_dict = dict(p)
-    p_dict['blog_name'] = blog['blog_name']
-    p_dict['author_name'] = blog.get('author_name', '')
-    posts_csv.append(p_dict)
+posts_csv = (
+    {**p, 'blog_name': blog['blog_name'],
+     'author_name': blog.get('author_name', '')}
+    for p in db.iter_blog_posts('testblog')
+)
 
 result = export_to_csv(posts_csv, tmp_csv_posts)
 check('Posts CSV export succeeds', result == True)
@@ -232,16 +305,13 @@ check('Posts CSV has 3 rows', len(rows) == 3)
 check('Posts CSV has blog_name', rows[0].get('blog_name') == 'Test Blog Name')
 check('Posts CSV has title', 'title' in rows[0])
 check('Posts CSV has content', 'content' in rows[0])
-os.unlink(tmp_csv_posts)
 
 # Comments CSV
-all_comments = []
-for post in posts:
-    comments = db.get_comments(post['id'])
-    for c in comments:
-        c_dict = dict(c)
-        c_dict['post_title'] = post.get('title', '')
-        all_comments.append(c_dict)
+all_comments = (
+    {**c, 'post_title': post.get('title', '')}
+    for post in db.iter_blog_posts('testblog')
+    for c in comments_by_post.get(post['id'], [])
+)
 
 result = export_to_csv(all_comments, tmp_csv_comments)
 check('Comments CSV export succeeds', result == True)
@@ -257,11 +327,11 @@ check('Comments CSV has is_reply', 'is_reply' in rows[0])
 reply_rows = [r for r in rows if str(r.get('is_reply')) == '1']
 check('CSV has 1 reply row', len(reply_rows) == 1)
 check('Reply has parent_id', reply_rows[0].get('parent_id') == 'c1')
-os.unlink(tmp_csv_comments)
 
 # --- TC-08-8: JSON export with special characters ---
-print('\n--- TC-08-8: Special characters ---')
-tmp_json = tempfile.mktemp(suffix='.json')
+flush_section()
+out('\n--- TC-08-8: Special characters ---')
+tmp_json = TMP / 'special.json'
 special_data = {
     'title': '특수문자 <>&"\'',
     'content': 'Line1\nLine2\tTabbed',
@@ -275,12 +345,10 @@ with open(tmp_json, 'r', encoding='utf-8') as f:
 check('Special chars preserved', loaded['title'] == '특수문자 <>&"\'')
 check('Newlines preserved', '\n' in loaded['content'])
 check('Backslash path preserved', loaded['path'] == 'C:\\Users\\test')
-os.unlink(tmp_json)
 
-# Cleanup
 db.close()
-os.unlink(db_path)
 
-print(f'\n{"="*60}')
-print(f'TOTAL: {passed} passed, {failed} failed')
-print(f'{"="*60}')
+out(f'\n{"="*60}')
+out(f'TOTAL: {passed} passed, {failed} failed')
+out(f'{"="*60}')
+flush_section()
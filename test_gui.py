@@ -1,8 +1,10 @@
 """TC-01/15: GUI structure and design consistency validation."""
-import sys, os, inspect, ast, re
+import sys, os, inspect, ast, re, hashlib, pickle
 sys.path.insert(0, '.')
 
+from collections import Counter
 from datetime import datetime
+from pathlib import Path
 from config import (
     WINDOW_WIDTH, WINDOW_HEIGHT, APPEARANCE_MODE, COLOR_THEME,
     ACCESS_CODES, Status, CrawlStep
@@ -35,11 +37,63 @@ print('\n--- TC-15-2: Source code structure (AST analysis) ---')
 with open('main.py', 'r', encoding='utf-8') as f:
     source = f.read()
 
-tree = ast.parse(source)
-classes = {node.name: node for node in ast.walk(tree)
-           if isinstance(node, ast.ClassDef)}
-functions = {node.name: node for node in ast.walk(tree)
-             if isinstance(node, ast.FunctionDef)}
+STRUCTURE_VERSION = 3
+
+def source_structure(source):
+    """Class, function and method names in main.py, cached by source hash.
+
+    An unchanged main.py is loaded from .test_cache instead of re-parsed.
+    """
+    cache_dir = Path('.test_cache')
+    # Bump STRUCTURE_VERSION whenever what is collected below changes
+    digest = hashlib.sha256(
+        f'{STRUCTURE_VERSION}\n{source}'.encode('utf-8')).hexdigest()
+    cache_path = cache_dir / f'gui_ast_{digest}.pkl'
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    classes = {}
+    functions = set()
+    # Method calls by name ('pack' for x.pack(...)) and module attribute
+    # references ('ctk.CTkFrame'), counted in the same walk
+    calls = Counter()
+    references = Counter()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.ClassDef):
+            classes[node.name] = node
+        elif isinstance(node, ast.FunctionDef):
+            functions.add(node.name)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            calls[node.func.attr] += 1
+        elif isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+            references[f'{node.value.id}.{node.attr}'] += 1
+
+    def methods(name):
+        # A class's own methods are its top-level defs; no need to walk
+        if name not in classes:
+            return set()
+        return {node.name for node in classes[name].body
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))}
+
+    structure = (set(classes), functions,
+                 methods('NaverBlogCrawlerApp'), methods('BlogListItem'),
+                 calls, references)
+    try:
+        cache_dir.mkdir(exist_ok=True)
+        # Only the current source's entry is worth keeping
+        for stale in cache_dir.glob('gui_ast_*.pkl'):
+            stale.unlink()
+        with open(cache_path, 'wb') as f:
+            pickle.dump(structure, f)
+    except OSError:
+        pass
+    return structure
+
+(classes, functions, app_methods, bli_methods,
+ call_counts, reference_counts) = source_structure(source)
 
 check('BlogListItem class exists', 'BlogListItem' in classes)
 check('NaverBlogCrawlerApp class exists', 'NaverBlogCrawlerApp' in classes)
@@ -47,10 +101,6 @@ check('verify_access function exists', 'verify_access' in functions)
 check('main function exists', 'main' in functions)
 
 # Check NaverBlogCrawlerApp methods
-app_class = classes['NaverBlogCrawlerApp']
-app_methods = {node.name for node in ast.walk(app_class)
-               if isinstance(node, ast.FunctionDef)}
-
 required_methods = {
     '__init__', '_create_widgets', '_load_blogs', '_add_blog',
     '_add_blog_to_list', '_on_blog_select', '_on_blog_delete',
@@ -63,9 +113,6 @@ for method in required_methods:
     check(f'App has method: {method}', method in app_methods)
 
 # Check BlogListItem methods
-bli_class = classes['BlogListItem']
-bli_methods = {node.name for node in ast.walk(bli_class)
-               if isinstance(node, ast.FunctionDef)}
 check('BlogListItem has __init__', '__init__' in bli_methods)
 check('BlogListItem has update_status', 'update_status' in bli_methods)
 check('BlogListItem has _on_checkbox_change', '_on_checkbox_change' in bli_methods)
@@ -101,16 +148,17 @@ check('Progress label text', '전체 진행률' in source)
 
 # --- TC-15-5: Layout uses pack (matching YTBExtractor) ---
 print('\n--- TC-15-5: Layout system (pack-based) ---')
-pack_count = source.count('.pack(')
-grid_count = source.count('.grid(')
+pack_count = call_counts['pack']
+grid_count = call_counts['grid']
 check(f'Uses pack layout ({pack_count} calls)', pack_count > 10)
 check(f'No grid usage ({grid_count} calls)', grid_count == 0)
 
 # --- TC-15-6: Thread safety (queue pattern) ---
 print('\n--- TC-15-6: Thread safety ---')
-check('Message queue imported', 'import queue' in source)
-check('Queue created', 'queue.Queue()' in source)
-check('message_queue.put used', 'self.message_queue.put' in source)
+check('Message deque imported', 'from collections import deque' in source)
+check('Queue created', 'self.message_queue = deque()' in source)
+check('Queue guarded by lock', 'self._queue_lock = threading.Lock()' in source)
+check('message_queue.append used', 'self.message_queue.append' in source)
 check('Threading imported', 'import threading' in source)
 check('Thread daemon=True', 'daemon=True' in source)
 check('after() for queue processing', 'self.after(' in source)
@@ -119,7 +167,8 @@ check('after() for queue processing', 'self.after(' in source)
 print('\n--- TC-15-7: Font and styling ---')
 check('Title font size 20 bold',
       'font=ctk.CTkFont(size=20, weight="bold")' in source)
-check('Uses CTk widgets', source.count('ctk.CTk') > 10)
+check('Uses CTk widgets',
+      sum(n for name, n in reference_counts.items() if name.startswith('ctk.CTk')) > 10)
 
 # --- TC-01-1: Access code validation ---
 print('\n--- TC-01-1: Access code validation ---')
@@ -144,6 +193,51 @@ check('Handles expired code', '만료된 코드' in source)
 check('Handles invalid code', '유효하지 않은 코드' in source)
 check('Enter key binding', '<Return>' in source)
 
+# --- TC-01-2b: Cached verification ---
+print('\n--- TC-01-2b: Cached access verification ---')
+import json, tempfile
+from datetime import timedelta
+from unittest import mock
+import main as app_main
+future = datetime.now() + timedelta(days=30)
+test_codes = {'VALIDCODE': future, 'OLDCODE': datetime.now() - timedelta(days=1)}
+# Patches are undone on exit so later checks see the real module state
+real_cache_path, real_expiry = app_main.AUTH_CACHE_PATH, app_main._ACCESS_CODE_EXPIRY
+real_env_code = os.environ.get('NAVERBLOG_AUTH_CODE')
+with tempfile.TemporaryDirectory() as tmp_dir, \
+        mock.patch.object(app_main, 'AUTH_CACHE_PATH',
+                          os.path.join(tmp_dir, 'auth_cache.json')), \
+        mock.patch.object(app_main, '_ACCESS_CODE_EXPIRY', test_codes):
+    check('No cache file means dialog', app_main._try_cached_auth() == False)
+    app_main._save_auth_cache('VALIDCODE')
+    with open(app_main.AUTH_CACHE_PATH, encoding='utf-8') as f:
+        cached = json.load(f)
+    check('Cache stores a hash, not the code', 'VALIDCODE' not in json.dumps(cached))
+    check('Fresh cache skips dialog', app_main._try_cached_auth() == True)
+    app_main._save_auth_cache('OLDCODE')
+    check('Expired code not accepted from cache', app_main._try_cached_auth() == False)
+    cached['authenticated_at'] = (datetime.now() - timedelta(seconds=app_main.AUTH_CACHE_TTL + 60)).isoformat()
+    with open(app_main.AUTH_CACHE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(cached, f)
+    check('Cache older than TTL not accepted', app_main._try_cached_auth() == False)
+
+    # NAVERBLOG_AUTH_CODE is checked before the cache and never opens a dialog
+    for env_code, expected, name in [(' validcode ', True, 'Env code accepted'),
+                                     ('OLDCODE', False, 'Expired env code rejected'),
+                                     ('NOPE', False, 'Unknown env code rejected')]:
+        with mock.patch.dict(os.environ, {'NAVERBLOG_AUTH_CODE': env_code}):
+            check(name, app_main.verify_access() == expected)
+
+    # An exported-but-empty variable falls through to the cache
+    app_main._save_auth_cache('VALIDCODE')
+    for env_code in ('', '   '):
+        with mock.patch.dict(os.environ, {'NAVERBLOG_AUTH_CODE': env_code}):
+            check(f'Empty env code {env_code!r} falls through to the cache',
+                  app_main.verify_access() == True)
+check('Auth cache path restored', app_main.AUTH_CACHE_PATH == real_cache_path)
+check('Access code table restored', app_main._ACCESS_CODE_EXPIRY is real_expiry)
+check('Env code removed again', os.environ.get('NAVERBLOG_AUTH_CODE') == real_env_code)
+
 # --- TC-01-3: Access dialog UI ---
 print('\n--- TC-01-3: Access dialog structure ---')
 check('Dialog title "인증"', '"인증"' in source)
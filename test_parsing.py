@@ -0,0 +1,327 @@
+"""TC-05 (offline): Crawler parsing, caching and driver pool with fakes."""
+import sys, json, tempfile, atexit, threading
+sys.path.insert(0, '.')
+
+from pathlib import Path
+from crawler.comment import CommentCrawler
+from crawler.post import PostCrawler
+from crawler.blog import BlogCrawler
+from crawler import selenium_helper
+from database.manager import DatabaseManager
+from selenium.common.exceptions import (NoSuchElementException,
+                                        WebDriverException)
+
+# Temp files live in one directory, removed when the script exits
+TMPDIR = tempfile.TemporaryDirectory()
+atexit.register(TMPDIR.cleanup)
+TMP = Path(TMPDIR.name)
+
+passed = failed = 0
+
+# Output is buffered and written once per section
+_output = []
+
+def out(line=''):
+    _output.append(line)
+
+def flush_section():
+    if _output:
+        sys.stdout.write('\n'.join(_output) + '\n')
+        _output.clear()
+
+atexit.register(flush_section)
+
+def check(name, condition):
+    global passed, failed
+    if condition:
+        passed += 1
+        out(f'  [PASS] {name}')
+    else:
+        failed += 1
+        out(f'  [FAIL] {name}')
+
+class FakeResponse:
+    def __init__(self, status_code=200, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+class FakeSession:
+    """Answers every request with the next queued response."""
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs.get('headers') or {}))
+        return self.responses.pop(0)
+
+def jsonp(payload):
+    return f'jsonp({json.dumps(payload, ensure_ascii=False)});\n'
+
+out('=' * 60)
+out('TC-05: OFFLINE PARSING TESTS')
+out('=' * 60)
+
+# --- Comment API: JSONP payload to comment rows ---
+flush_section()
+out('\n--- TC-05-5a: Comment API parsing ---')
+cc = CommentCrawler()
+post_id = 'blog1_100'
+payload = {
+    'success': True,
+    'result': {
+        'commentList': [
+            {'commentNo': 1, 'replyLevel': 1, 'userName': '작성자',
+             'contents': '첫 댓글', 'sympathyCount': 3,
+             'regTime': '2026-01-05T10:00:00+0900'},
+            {'commentNo': 2, 'replyLevel': 2, 'parentCommentNo': 1,
+             'userName': '답글러', 'contents': '답글',
+             'regTime': '2026-01-05T11:00:00+0900'},
+            {'commentNo': 3, 'replyLevel': 1, 'deleted': True},
+            {'commentNo': 4, 'replyLevel': 2, 'parentCommentNo': 3,
+             'userName': '고아', 'contents': '삭제된 댓글의 답글'},
+        ],
+        'pageModel': {'totalPages': 2, 'totalRows': 4},
+    },
+}
+comments, total_pages = cc._parse_comments_api(jsonp(payload), post_id)
+by_id = {c['id']: c for c in comments}
+check('JSONP wrapper stripped', len(comments) == 3)
+check('Total pages read from pageModel', total_pages == 2)
+check('Deleted comment skipped', 'blog1_100_c3' not in by_id)
+top = by_id['blog1_100_c1']
+check('Top-level comment fields mapped',
+      top['post_id'] == post_id and top['author'] == '작성자'
+      and top['content'] == '첫 댓글' and top['like_count'] == 3)
+check('Top-level comment is not a reply', top['is_reply'] == 0 and top['parent_id'] is None)
+check('written_at from regTime', top['written_at'] == '2026-01-05T10:00:00+0900')
+reply = by_id['blog1_100_c2']
+check('Reply marked is_reply', reply['is_reply'] == 1)
+check('Reply parent_id points at parent row', reply['parent_id'] == 'blog1_100_c1')
+check('Reply missing like count defaults to 0', reply['like_count'] == 0)
+check('Reply to deleted comment has no parent_id', by_id['blog1_100_c4']['parent_id'] is None)
+
+plain = cc._parse_comments_api(json.dumps(payload), post_id)
+check('Unwrapped JSON also parses', plain is not None and len(plain[0]) == 3)
+refused = cc._parse_comments_api(jsonp({'success': False, 'code': '3999'}), post_id)
+check('success=false is a refusal', refused is None)
+empty = cc._parse_comments_api(
+    jsonp({'success': True, 'result': {'commentList': [],
+                                       'pageModel': {'totalRows': 0}}}), post_id)
+check('No comments parses as an empty page', empty == ([], 1))
+claimed = cc._parse_comments_api(
+    jsonp({'success': True, 'result': {'commentList': [],
+                                       'pageModel': {'totalRows': 5}}}), post_id)
+check('Empty list with comments reported is a refusal', claimed is None)
+try:
+    cc._parse_comments_api('jsonp(<html>);', post_id)
+    check('Invalid payload raises ValueError', False)
+except ValueError:
+    check('Invalid payload raises ValueError', True)
+
+# --- Comment API: Selenium fallback ---
+flush_section()
+out('\n--- TC-05-5b: Selenium fallback ---')
+selenium_rows = [{'id': 'blog1_100_x', 'post_id': post_id}]
+cc._iter_comments_selenium = lambda blog_id, log_no, post_id: iter(selenium_rows)
+
+cc._fetch_comments_api = lambda *args, **kwargs: ([], 1)
+check('Empty first page kept when no comments expected',
+      cc.get_comments('blog1', '100') == [])
+check('Empty first page falls back when comments expected',
+      cc.get_comments('blog1', '100', expected_count=2) == selenium_rows)
+
+cc._fetch_comments_api = lambda *args, **kwargs: None
+check('Refused API falls back to Selenium', cc.get_comments('blog1', '100') == selenium_rows)
+
+cc._fetch_comments_api = lambda *args, **kwargs: ([by_id['blog1_100_c1']], 1)
+check('Non-empty API page skips Selenium',
+      cc.get_comments('blog1', '100', expected_count=2) == [by_id['blog1_100_c1']])
+
+# --- Rendered cbox markup: both parsers agree ---
+flush_section()
+out('\n--- TC-05-5d: Rendered cbox comments ---')
+from bs4 import BeautifulSoup
+from crawler.comment import LexborHTMLParser
+from crawler.parsing import HTML_PARSER
+cbox_html = (
+    '<ul><li class="u_cbox_comment">'
+    '<a class="u_cbox_name"><span class="u_cbox_nick">Kim</span>'
+    '<span class="u_cbox_badge">Blogger</span></a>'
+    '<span class="u_cbox_contents">Nice post</span>'
+    '</li></ul>'
+)
+soup_rows = cc._parse_cbox_comments(BeautifulSoup(cbox_html, HTML_PARSER), post_id)
+check('Author read from u_cbox_nick, not its u_cbox_name wrapper',
+      [c['author'] for c in soup_rows] == ['Kim'])
+if LexborHTMLParser is not None:
+    lexbor_rows = cc._parse_cbox_comments_lexbor(cbox_html, post_id)
+    check('Lexbor parser gives the same author',
+          [c['author'] for c in lexbor_rows] == ['Kim'])
+
+# --- First crawl: post list comment counts reach the comments step ---
+flush_section()
+out('\n--- TC-05-5c: First-crawl comment fallback ---')
+import main as app_main
+list_text = json.dumps({'postList': [
+    {'logNo': '200', 'title': 'With comments', 'commentCount': '3'},
+    {'logNo': '201', 'title': 'No comments', 'commentCount': 0},
+]})
+listed = PostCrawler()._parse_post_list_response(list_text, 'fc')
+check('Post list carries commentCount', [p['comment_count'] for p in listed] == [3, 0])
+
+app = object.__new__(app_main.NaverBlogCrawlerApp)
+app.db = DatabaseManager(TMP / 'first_crawl.db', test_mode=True)
+app.db.add_blog('fc', 'First crawl', 'url')
+app.progress_data = {'last_updated': None, 'blogs': []}
+app.should_stop = False
+app._post_message = lambda *args: None
+app._report_post_progress = lambda *args: None
+
+lister = PostCrawler()
+lister.get_post_list = lambda blog_id: listed
+app.post_crawler = lister
+app._process_post_list({'id': 'fc'})
+check('Stored before the comments step',
+      app.db.get_post('fc_200')['comment_count'] == 3)
+
+# The API answers with an empty page for both posts
+first_crawl = CommentCrawler()
+first_crawl._fetch_comments_api = lambda *args, **kwargs: ([], 1)
+selenium_posts = []
+def fake_selenium(blog_id, log_no, post_id):
+    selenium_posts.append(log_no)
+    return iter([{'id': f'{post_id}_c1', 'post_id': post_id,
+                  'author': 'S', 'content': 'from Selenium'}])
+first_crawl._iter_comments_selenium = fake_selenium
+app.comment_crawler = first_crawl
+app._process_comments({'id': 'fc'})
+check('Empty API page falls back on the first crawl', selenium_posts == ['200'])
+check('Fallback comments stored', len(app.db.get_comments('fc_200')) == 1)
+app.db.close()
+
+# --- Conditional GET cache ---
+flush_section()
+out('\n--- TC-05-3a: Conditional GET cache ---')
+cache = DatabaseManager(TMP / 'cache.db', test_mode=True)
+pc = PostCrawler(cache=cache)
+parsed = {'title': 'T', 'content': 'C', 'category': None, 'post_date': None}
+parse_calls = []
+def fake_parse(text):
+    parse_calls.append(text)
+    return dict(parsed)
+pc._parse_post_content = fake_parse
+post_url = 'https://m.blog.naver.com/blog1/100'
+
+pc.session = FakeSession(FakeResponse(200, '<html>', {'ETag': '"v1"'}))
+check('200 response is parsed', pc.get_post_content('blog1', '100') == parsed)
+entry = cache.get_http_cache(post_url)
+check('Response with ETag is cached', entry is not None and entry['etag'] == '"v1"')
+
+pc.session = FakeSession(FakeResponse(304))
+parse_calls.clear()
+check('304 returns the cached data', pc.get_post_content('blog1', '100') == parsed)
+check('304 is not re-parsed', parse_calls == [])
+check('Cached ETag sent as If-None-Match',
+      pc.session.requests[0][2].get('If-None-Match') == '"v1"')
+
+pc.session = FakeSession(FakeResponse(200, '<html>'))
+pc.get_post_content('blog1', '101')
+check('Response without validators is not cached',
+      cache.get_http_cache('https://m.blog.naver.com/blog1/101') is None)
+
+bc = BlogCrawler(cache=cache)
+bc._get_post_count = lambda blog_id: 0
+bc.session = FakeSession(FakeResponse(200, '<title>B</title>'))
+bc.get_blog_info('blog1')
+check('Blog info without validators is not cached',
+      cache.get_http_cache('https://m.blog.naver.com/blog1') is None)
+cache.close()
+
+# --- Selenium driver pool ---
+flush_section()
+out('\n--- Driver pool ---')
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise WebDriverException('session deleted')
+        return 'about:blank'
+
+    def quit(self):
+        self.quit_called = True
+
+started = []
+def fake_create_driver():
+    started.append(FakeDriver())
+    return started[-1]
+selenium_helper._create_driver = fake_create_driver
+selenium_helper.POOL_SIZE = 1
+
+with selenium_helper.borrow_driver() as first:
+    pass
+with selenium_helper.borrow_driver() as again:
+    pass
+check('Idle driver is reused', again is first and len(started) == 1)
+
+try:
+    with selenium_helper.borrow_driver() as driver:
+        raise NoSuchElementException('no comments')
+except NoSuchElementException:
+    pass
+with selenium_helper.borrow_driver() as again:
+    pass
+check('Driver with a live session goes back to the pool', again is first and len(started) == 1)
+
+try:
+    with selenium_helper.borrow_driver() as driver:
+        driver.alive = False
+        raise WebDriverException('chrome not reachable')
+except WebDriverException:
+    pass
+check('Dead driver is quit', first.quit_called)
+with selenium_helper.borrow_driver() as replacement:
+    pass
+check('Dead driver is replaced in its slot',
+      replacement is not first and replacement.alive and len(started) == 2)
+selenium_helper.close_shared_drivers()
+check('close_shared_drivers quits the replacement', replacement.quit_called)
+
+with selenium_helper.borrow_driver() as borrowed:
+    selenium_helper.close_shared_drivers()
+check('Driver closed while borrowed is not pooled again', selenium_helper._pool.empty())
+
+# Without a working Chrome every borrower must fail, none may hang
+def failing_create_driver():
+    raise WebDriverException('chrome not found')
+selenium_helper._create_driver = failing_create_driver
+selenium_helper.POOL_SIZE = 4
+errors = []
+def borrow():
+    try:
+        with selenium_helper.borrow_driver():
+            pass
+    except WebDriverException as e:
+        errors.append(e)
+borrowers = [threading.Thread(target=borrow) for _ in range(6)]
+for t in borrowers:
+    t.start()
+for t in borrowers:
+    t.join(timeout=5)
+check('Failed launches do not strand waiting borrowers',
+      not any(t.is_alive() for t in borrowers) and len(errors) == 6)
+check('Failed slots never exceed the pool size', len(selenium_helper._drivers) <= 4)
+selenium_helper.close_shared_drivers()
+
+out(f'\n{"="*60}')
+out(f'TOTAL: {passed} passed, {failed} failed')
+out(f'{"="*60}')
+flush_section()
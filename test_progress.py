@@ -1,15 +1,20 @@
 """TC-07: Progress save/load/resume tests."""
-import sys, os, tempfile, json
+import sys, os, tempfile, json, atexit
 sys.path.insert(0, '.')
 
 from pathlib import Path
 from utils.helpers import (
-    load_progress, save_progress, has_incomplete_work,
+    load_progress, save_progress, has_incomplete_work, ProgressWriter,
     get_blog_progress, update_blog_progress,
     remove_blog_from_progress, get_next_incomplete_step
 )
 from config import CrawlStep
 
+# Temp files live in one directory, removed when the script exits
+TMPDIR = tempfile.TemporaryDirectory()
+atexit.register(TMPDIR.cleanup)
+TMP = Path(TMPDIR.name)
+
 passed = failed = 0
 
 def check(name, condition):
@@ -25,9 +30,7 @@ print('=' * 60)
 print('TC-07: PROGRESS SAVE/LOAD/RESUME TESTS')
 print('=' * 60)
 
-# Use temp files
-tmp = tempfile.mktemp(suffix='.json')
-progress_path = Path(tmp)
+progress_path = TMP / 'progress.json'
 
 # --- TC-07-5: File does not exist ---
 print('\n--- TC-07-5: Progress file missing ---')
@@ -37,11 +40,12 @@ check('has_incomplete_work on empty', has_incomplete_work(data) == False)
 
 # --- Basic save/load ---
 print('\n--- Save/Load cycle ---')
-data = update_blog_progress(data, 'blog1', blog_name='Test Blog',
-                            status='in_progress', total_posts=50)
+update_blog_progress(data, 'blog1', blog_name='Test Blog',
+                     status='in_progress', total_posts=50)
 r = save_progress(data, progress_path)
 check('Save progress returns True', r == True)
 check('File created', os.path.exists(progress_path))
+check('No temp file left behind', not os.path.exists(f"{progress_path}.tmp"))
 
 loaded = load_progress(progress_path)
 check('Load returns saved data', len(loaded['blogs']) == 1)
@@ -50,6 +54,33 @@ check('Blog name preserved', loaded['blogs'][0]['blog_name'] == 'Test Blog')
 check('Status preserved', loaded['blogs'][0]['status'] == 'in_progress')
 check('Total posts preserved', loaded['blogs'][0]['total_posts'] == 50)
 check('last_updated set', loaded['last_updated'] is not None)
+check('blog_id index not saved', '_index' not in loaded)
+check('Loaded statuses are interned', loaded['blogs'][0]['status'] is sys.intern('in_progress'))
+
+# --- Background writer ---
+print('\n--- ProgressWriter ---')
+writer_path = TMP / 'writer.json'
+writer = ProgressWriter(writer_path)
+for n in range(1, 21):
+    data['blogs'][0]['total_posts'] = n
+    writer.save(data)
+writer.flush()
+check('Writer leaves the newest snapshot', load_progress(writer_path)['blogs'][0]['total_posts'] == 20)
+check('Writer leaves no temp file', not os.path.exists(f"{writer_path}.tmp"))
+
+# schedule() takes one snapshot per interval and flush() takes the rest
+sched_path = TMP / 'scheduled.json'
+sched = ProgressWriter(sched_path, min_interval=60)
+data['blogs'][0]['total_posts'] = 1
+sched.schedule(data)
+sched.flush()
+data['blogs'][0]['total_posts'] = 2
+sched.schedule(data)
+os.remove(sched_path)
+check('schedule() coalesces within the interval', not os.path.exists(sched_path))
+sched.flush()
+check('flush() writes the coalesced snapshot', load_progress(sched_path)['blogs'][0]['total_posts'] == 2)
+data['blogs'][0]['total_posts'] = 50
 
 # --- get_blog_progress ---
 print('\n--- get_blog_progress ---')
@@ -59,6 +90,10 @@ check('Blog progress has steps', 'steps_completed' in bp)
 
 bp_none = get_blog_progress(loaded, 'nonexistent')
 check('Get nonexistent blog returns None', bp_none is None)
+check('Lookup indexes blogs by id', loaded['_index'] == {'blog1': bp})
+loaded['blogs'].append({'blog_id': 'late', 'steps_completed': {}})
+check('Index rebuilt after direct list change', get_blog_progress(loaded, 'late') is not None)
+loaded['blogs'].pop()
 
 # --- has_incomplete_work ---
 print('\n--- has_incomplete_work ---')
@@ -66,13 +101,13 @@ check('In-progress blog detected', has_incomplete_work(loaded) == True)
 
 # Complete all steps for blog1
 for step in CrawlStep.all_steps():
-    loaded = update_blog_progress(loaded, 'blog1', step=step, step_status='completed')
-loaded = update_blog_progress(loaded, 'blog1', status='completed')
+    update_blog_progress(loaded, 'blog1', step=step, step_status='completed')
+update_blog_progress(loaded, 'blog1', status='completed')
 check('All steps completed, status completed => no incomplete', has_incomplete_work(loaded) == False)
 
 # Add a blog with pending step
-loaded = update_blog_progress(loaded, 'blog2', blog_name='Blog 2',
-                              status='pending', total_posts=10)
+update_blog_progress(loaded, 'blog2', blog_name='Blog 2',
+                     status='pending', total_posts=10)
 check('Pending steps detected', has_incomplete_work(loaded) == True)
 
 # --- get_next_incomplete_step ---
@@ -85,26 +120,26 @@ next_step = get_next_incomplete_step(bp2)
 check('Pending blog => first step', next_step == CrawlStep.BLOG_INFO)
 
 # Simulate partial progress
-loaded = update_blog_progress(loaded, 'blog2', step=CrawlStep.BLOG_INFO, step_status='completed')
-loaded = update_blog_progress(loaded, 'blog2', step=CrawlStep.POST_LIST, step_status='completed')
-loaded = update_blog_progress(loaded, 'blog2', step=CrawlStep.POST_CONTENT, step_status='in_progress')
+update_blog_progress(loaded, 'blog2', step=CrawlStep.BLOG_INFO, step_status='completed')
+update_blog_progress(loaded, 'blog2', step=CrawlStep.POST_LIST, step_status='completed')
+update_blog_progress(loaded, 'blog2', step=CrawlStep.POST_CONTENT, step_status='in_progress')
 bp2 = get_blog_progress(loaded, 'blog2')
 next_step = get_next_incomplete_step(bp2)
 check('In-progress step returned first', next_step == CrawlStep.POST_CONTENT)
 
 # After completing POST_CONTENT
-loaded = update_blog_progress(loaded, 'blog2', step=CrawlStep.POST_CONTENT, step_status='completed')
+update_blog_progress(loaded, 'blog2', step=CrawlStep.POST_CONTENT, step_status='completed')
 bp2 = get_blog_progress(loaded, 'blog2')
 next_step = get_next_incomplete_step(bp2)
 check('Next pending step is REACTIONS', next_step == CrawlStep.REACTIONS)
 
 # --- update_blog_progress: current_post_index ---
 print('\n--- current_post_index tracking ---')
-loaded = update_blog_progress(loaded, 'blog2', current_post_index=25)
-bp2 = get_blog_progress(loaded, 'blog2')
+bp2 = update_blog_progress(loaded, 'blog2', current_post_index=25)
 check('Post index updated to 25', bp2['current_post_index'] == 25)
+check('Update returns the stored blog entry', bp2 is get_blog_progress(loaded, 'blog2'))
 
-loaded = update_blog_progress(loaded, 'blog2', current_post_index=30)
+update_blog_progress(loaded, 'blog2', current_post_index=30)
 bp2 = get_blog_progress(loaded, 'blog2')
 check('Post index updated to 30', bp2['current_post_index'] == 30)
 
@@ -135,13 +170,13 @@ check('Empty file returns default', empty == {'last_updated': None, 'blogs': []}
 # --- Multiple blogs resume scenario ---
 print('\n--- TC-07-6: Multiple blog resume ---')
 data = {'last_updated': None, 'blogs': []}
-data = update_blog_progress(data, 'a', blog_name='A', status='in_progress', total_posts=10)
-data = update_blog_progress(data, 'a', step=CrawlStep.BLOG_INFO, step_status='completed')
-data = update_blog_progress(data, 'a', step=CrawlStep.POST_LIST, step_status='completed')
-data = update_blog_progress(data, 'a', step=CrawlStep.POST_CONTENT, step_status='in_progress')
+update_blog_progress(data, 'a', blog_name='A', status='in_progress', total_posts=10)
+update_blog_progress(data, 'a', step=CrawlStep.BLOG_INFO, step_status='completed')
+update_blog_progress(data, 'a', step=CrawlStep.POST_LIST, step_status='completed')
+update_blog_progress(data, 'a', step=CrawlStep.POST_CONTENT, step_status='in_progress')
 
-data = update_blog_progress(data, 'b', blog_name='B', status='in_progress', total_posts=20)
-data = update_blog_progress(data, 'b', step=CrawlStep.BLOG_INFO, step_status='completed')
+update_blog_progress(data, 'b', blog_name='B', status='in_progress', total_posts=20)
+update_blog_progress(data, 'b', step=CrawlStep.BLOG_INFO, step_status='completed')
 
 check('Two in-progress blogs', has_incomplete_work(data) == True)
 in_progress = [b for b in data['blogs'] if b['status'] == 'in_progress']
@@ -153,9 +188,6 @@ check('Blog A next step POST_CONTENT', get_next_incomplete_step(bp_a) == CrawlSt
 bp_b = get_blog_progress(data, 'b')
 check('Blog B next step POST_LIST', get_next_incomplete_step(bp_b) == CrawlStep.POST_LIST)
 
-# Cleanup
-os.unlink(progress_path)
-
 print(f'\n{"="*60}')
 print(f'TOTAL: {passed} passed, {failed} failed')
 print(f'{"="*60}')
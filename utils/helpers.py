@@ -1,13 +1,45 @@
 """Utility functions for Naver Blog Crawler."""
 
+import atexit
+import csv
 import json
 import os
+import queue
 import re
+import sqlite3
+import sys
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Any, Optional, List, Iterable
 from pathlib import Path
 
-from config import PROGRESS_PATH, CrawlStep
+from config import PROGRESS_PATH, PROGRESS_SAVE_INTERVAL, CrawlStep
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+
+# One pass over the URL: query-string forms first, then the path form
+_BLOG_ID_RE = re.compile(
+    r'blog\.naver\.com/(?:'
+    r'PostList\.naver\?.*?blogId=(?P<list>[^&]+)'
+    r'|PostView\.naver\?.*?blogId=(?P<view>[^&]+)'
+    r'|(?P<path>[A-Za-z0-9_-]+))'
+)
+
+# Known non-blog-ID paths the last pattern would otherwise match
+_NON_BLOG_IDS = frozenset({
+    'PostList.naver', 'PostView.naver', 'NBlogTop.naver',
+    'SectionPostList.naver', 'PostList', 'PostView', 'NBlogTop',
+    'SectionPostList',
+})
 
 
 def extract_blog_id(url: str) -> Optional[str]:
@@ -19,60 +51,69 @@ def extract_blog_id(url: str) -> Optional[str]:
         https://blog.naver.com/PostList.naver?blogId=블로그ID
         https://blog.naver.com/PostView.naver?blogId=블로그ID&logNo=...
     """
-    patterns = [
-        r'blog\.naver\.com/PostList\.naver\?.*?blogId=([^&]+)',
-        r'blog\.naver\.com/PostView\.naver\?.*?blogId=([^&]+)',
-        r'blog\.naver\.com/([A-Za-z0-9_-]+)',
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            blog_id = match.group(1)
-            # Filter out known non-blog-ID paths
-            if blog_id not in ('PostList.naver', 'PostView.naver',
-                               'NBlogTop.naver', 'SectionPostList.naver',
-                               'PostList', 'PostView', 'NBlogTop',
-                               'SectionPostList'):
-                return blog_id
+    match = _BLOG_ID_RE.search(url)
+    if not match:
+        return None
 
-    return None
+    blog_id = match.group('list') or match.group('view') or match.group('path')
+    return blog_id if blog_id not in _NON_BLOG_IDS else None
+
+
+_INVALID_FILENAME_CHARS = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
 
 
 def sanitize_filename(name: str) -> str:
     """Sanitize a string to be safe for use as a filename."""
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        name = name.replace(char, '_')
-    name = name.strip('. ')
-    if len(name) > 200:
-        name = name[:200]
+    name = name.translate(_INVALID_FILENAME_CHARS).strip('. ')[:200]
     return name or 'unnamed'
 
 
+_DATETIME_FORMATS = [
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    '%Y.%m.%d.',
+    '%Y.%m.%d',
+    '%Y. %m. %d.',
+    '%Y. %m. %d',
+]
+
+# The formats a string can match, keyed by ('T' in s, '.' in s, ' ' in s),
+# so most strings need a single strptime instead of a run of failures
+_DATETIME_DISPATCH = {
+    (True, False, False): ['%Y-%m-%dT%H:%M:%S'],
+    (True, True, False): ['%Y-%m-%dT%H:%M:%S.%f'],
+    (False, False, True): ['%Y-%m-%d %H:%M:%S'],
+    (False, False, False): ['%Y-%m-%d'],
+    (False, True, False): ['%Y.%m.%d.', '%Y.%m.%d'],
+    (False, True, True): ['%Y. %m. %d.', '%Y. %m. %d'],
+}
+
+
+def _strptime_any(date_str: str, formats: List[str]) -> Optional[datetime]:
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
 def parse_datetime(date_str: str) -> Optional[datetime]:
     """Parse datetime string in various formats."""
     if not date_str:
         return None
 
-    formats = [
-        '%Y-%m-%dT%H:%M:%S',
-        '%Y-%m-%dT%H:%M:%S.%f',
-        '%Y-%m-%d %H:%M:%S',
-        '%Y-%m-%d',
-        '%Y.%m.%d.',
-        '%Y.%m.%d',
-        '%Y. %m. %d.',
-        '%Y. %m. %d',
-    ]
+    date_str = date_str.strip()
+    key = ('T' in date_str, '.' in date_str, ' ' in date_str)
+    likely = _DATETIME_DISPATCH.get(key)
+    if likely:
+        parsed = _strptime_any(date_str, likely)
+        if parsed is not None:
+            return parsed
 
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str.strip(), fmt)
-        except ValueError:
-            continue
-
-    return None
+    return _strptime_any(date_str, _DATETIME_FORMATS)
 
 
 def format_number(num: int) -> str:
@@ -80,61 +121,175 @@ def format_number(num: int) -> str:
     if num is None:
         return "N/A"
 
-    if num >= 1_000_000:
-        return f"{num / 1_000_000:.1f}M"
-    elif num >= 1_000:
+    # Most counts are under a thousand, so test that range first
+    if num < 1_000:
+        return str(num)
+    if num < 1_000_000:
         return f"{num / 1_000:.1f}K"
-    return str(num)
+    return f"{num / 1_000_000:.1f}M"
 
 
 # ==================== Progress File Management ====================
 
+# Crawl steps in run order, and the step statuses that still need work
+_ALL_STEPS = tuple(CrawlStep.all_steps())
+_UNDONE_STATUSES = frozenset(('pending', 'in_progress'))
+
+
 def load_progress(progress_path: Path = PROGRESS_PATH) -> Dict[str, Any]:
     """Load progress data from JSON file."""
-    if not os.path.exists(progress_path):
+    # A missing file is just another OSError, so no separate exists() stat
+    try:
+        progress_data = _json_loads(Path(progress_path).read_bytes())
+    except (ValueError, OSError):
+        # Covers json's and orjson's JSONDecodeError, both ValueErrors
         return {'last_updated': None, 'blogs': []}
+    _intern_statuses(progress_data)
+    return progress_data
+
 
+def _intern_statuses(progress_data: Dict[str, Any]):
+    """Share one str object per blog/step status across loaded blogs.
+
+    Both JSON parsers already share repeated keys but build a fresh str
+    for every value; interned, they match the code's literals by identity.
+    """
+    intern = sys.intern
+    for blog in progress_data.get('blogs', ()):
+        if isinstance(blog.get('status'), str):
+            blog['status'] = intern(blog['status'])
+        steps = blog.get('steps_completed')
+        if isinstance(steps, dict):
+            for step, status in steps.items():
+                if isinstance(status, str):
+                    steps[step] = intern(status)
+
+
+def _progress_json(progress_data: Dict[str, Any]) -> bytes:
+    """Stamp last_updated and serialize progress data as UTF-8 JSON."""
+    progress_data['last_updated'] = datetime.now().isoformat()
+    # The blog_id index is rebuilt on demand, never written
+    data = {k: v for k, v in progress_data.items() if k != '_index'}
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2
+                            | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _write_progress_file(payload: bytes, progress_path: Path) -> bool:
+    """Write serialized progress data to progress_path atomically."""
+    # Write a sibling temp file and swap it in, so an interrupted save
+    # never leaves a truncated progress file behind
+    tmp_path = f"{progress_path}.tmp"
     try:
-        with open(progress_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return {'last_updated': None, 'blogs': []}
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, progress_path)
+        return True
+    except IOError:
+        return False
 
 
 def save_progress(progress_data: Dict[str, Any],
                   progress_path: Path = PROGRESS_PATH) -> bool:
     """Save progress data to JSON file."""
-    try:
-        progress_data['last_updated'] = datetime.now().isoformat()
-        with open(progress_path, 'w', encoding='utf-8') as f:
-            json.dump(progress_data, f, ensure_ascii=False, indent=2)
+    return _write_progress_file(_progress_json(progress_data), progress_path)
+
+
+class ProgressWriter:
+    """Saves progress data on a background thread.
+
+    save() serializes a snapshot and returns without touching the disk;
+    when several snapshots queue up, only the newest is written.
+    schedule() additionally coalesces calls: at most one snapshot is
+    taken per min_interval, and the newest skipped one is taken by the
+    next save(), schedule() past the interval, or flush().
+    """
+
+    def __init__(self, progress_path: Path = PROGRESS_PATH,
+                 min_interval: float = PROGRESS_SAVE_INTERVAL):
+        self.progress_path = progress_path
+        self.min_interval = min_interval
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = None
+        self._last_save = float('-inf')
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        # Don't lose a coalesced snapshot when the app exits
+        atexit.register(self.flush)
+
+    def save(self, progress_data: Dict[str, Any]):
+        """Queue a snapshot of progress_data to be written."""
+        with self._lock:
+            self._pending = None
+            self._last_save = time.monotonic()
+            self._queue.put(_progress_json(progress_data))
+
+    def schedule(self, progress_data: Dict[str, Any]):
+        """Save progress_data unless a save happened within min_interval."""
+        with self._lock:
+            if time.monotonic() - self._last_save < self.min_interval:
+                self._pending = progress_data
+                return
+        self.save(progress_data)
+
+    def flush(self):
+        """Save any coalesced snapshot, then wait until all are written."""
+        with self._lock:
+            pending = self._pending
+        if pending is not None:
+            self.save(pending)
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            payload = self._queue.get()
+            handled = 1
+            # Skip straight to the newest snapshot
+            while True:
+                try:
+                    payload = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                handled += 1
+            _write_progress_file(payload, self.progress_path)
+            for _ in range(handled):
+                self._queue.task_done()
+
+
+def _blog_has_undone(blog: Dict[str, Any]) -> bool:
+    """Whether a blog is mid-crawl or has a pending/in-progress step."""
+    if blog.get('status') == 'in_progress':
         return True
-    except IOError:
-        return False
+    steps = blog.get('steps_completed', {})
+    return any(steps.get(step) in _UNDONE_STATUSES for step in _ALL_STEPS)
 
 
 def has_incomplete_work(progress_data: Dict[str, Any]) -> bool:
     """Check if there's any incomplete work in progress data."""
-    blogs = progress_data.get('blogs', [])
-    for blog in blogs:
-        if blog.get('status') == 'in_progress':
-            return True
+    return any(map(_blog_has_undone, progress_data.get('blogs', ())))
 
-        steps = blog.get('steps_completed', {})
-        for step in CrawlStep.all_steps():
-            if steps.get(step) in ['pending', 'in_progress']:
-                return True
 
-    return False
+def _blog_index(progress_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """progress_data's blogs keyed by blog_id, built on first use.
+
+    The index lives in progress_data['_index'] and is rebuilt whenever its
+    size no longer matches the blogs list, e.g. after a fresh load.
+    """
+    blogs = progress_data.get('blogs', [])
+    index = progress_data.get('_index')
+    if index is None or len(index) != len(blogs):
+        # Reversed so the first entry wins, as with a front-to-back scan
+        index = {blog.get('blog_id'): blog for blog in reversed(blogs)}
+        progress_data['_index'] = index
+    return index
 
 
 def get_blog_progress(progress_data: Dict[str, Any],
                       blog_id: str) -> Optional[Dict[str, Any]]:
     """Get progress data for a specific blog."""
-    for blog in progress_data.get('blogs', []):
-        if blog.get('blog_id') == blog_id:
-            return blog
-    return None
+    return _blog_index(progress_data).get(blog_id)
 
 
 def update_blog_progress(progress_data: Dict[str, Any],
@@ -145,8 +300,12 @@ def update_blog_progress(progress_data: Dict[str, Any],
                          current_post_index: int = None,
                          step: str = None,
                          step_status: str = None) -> Dict[str, Any]:
-    """Update or create blog progress data."""
-    blog_progress = get_blog_progress(progress_data, blog_id)
+    """Update or create a blog's progress entry in place.
+
+    Returns the blog's entry, so callers can read it without a lookup.
+    """
+    index = _blog_index(progress_data)
+    blog_progress = index.get(blog_id)
 
     if not blog_progress:
         blog_progress = {
@@ -155,11 +314,12 @@ def update_blog_progress(progress_data: Dict[str, Any],
             'status': status or 'pending',
             'total_posts': total_posts or 0,
             'current_post_index': current_post_index or 0,
-            'steps_completed': {s: 'pending' for s in CrawlStep.all_steps()}
+            'steps_completed': dict.fromkeys(_ALL_STEPS, 'pending')
         }
         if 'blogs' not in progress_data:
             progress_data['blogs'] = []
         progress_data['blogs'].append(blog_progress)
+        index[blog_id] = blog_progress
     else:
         if blog_name:
             blog_progress['blog_name'] = blog_name
@@ -174,16 +334,16 @@ def update_blog_progress(progress_data: Dict[str, Any],
                 blog_progress['steps_completed'] = {}
             blog_progress['steps_completed'][step] = step_status
 
-    return progress_data
+    return blog_progress
 
 
 def remove_blog_from_progress(progress_data: Dict[str, Any],
                               blog_id: str) -> Dict[str, Any]:
     """Remove a blog from progress data."""
-    blogs = progress_data.get('blogs', [])
-    progress_data['blogs'] = [
-        b for b in blogs if b.get('blog_id') != blog_id
-    ]
+    if _blog_index(progress_data).pop(blog_id, None) is not None:
+        progress_data['blogs'] = [
+            b for b in progress_data['blogs'] if b.get('blog_id') != blog_id
+        ]
     return progress_data
 
 
@@ -191,49 +351,136 @@ def get_next_incomplete_step(blog_progress: Dict[str, Any]) -> Optional[str]:
     """Get the next incomplete step for a blog."""
     steps = blog_progress.get('steps_completed', {})
 
-    # First, check for any in_progress step (resume)
-    for step in CrawlStep.all_steps():
-        if steps.get(step) == 'in_progress':
-            return step
-
-    # Then, find the first pending step
-    for step in CrawlStep.all_steps():
+    # An in_progress step (resume) wins over the first pending one
+    first_pending = None
+    for step in _ALL_STEPS:
         status = steps.get(step, 'pending')
-        if status == 'pending':
+        if status == 'in_progress':
             return step
+        if first_pending is None and status == 'pending':
+            first_pending = step
 
-    return None
+    return first_pending
 
 
 # ==================== Export Functions ====================
 
+def _json_default(obj):
+    """Serialize database rows embedded in export data."""
+    if isinstance(obj, sqlite3.Row):
+        return dict(zip(obj.keys(), obj))
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def _is_threaded_reply(comment) -> bool:
+    return bool(comment['is_reply'] and comment['parent_id'])
+
+
+def assemble_threaded_comments(comments: Iterable) -> List[Dict[str, Any]]:
+    """Nest each reply under its top-level comment.
+
+    Top-level comments are copied into dicts with a 'replies' list; the
+    replies themselves are kept as given (rows serialize directly), in
+    their original order. Replies whose parent is missing are dropped.
+    """
+    comments = list(comments)
+
+    # sorted() is stable, so each parent's replies keep their order
+    replies = sorted(filter(_is_threaded_reply, comments),
+                     key=itemgetter('parent_id'))
+    replies_by_parent = {
+        parent_id: list(group)
+        for parent_id, group in groupby(replies, key=itemgetter('parent_id'))
+    }
+
+    threaded = []
+    for comment in comments:
+        if not _is_threaded_reply(comment):
+            item = dict(zip(comment.keys(), comment)) \
+                if isinstance(comment, sqlite3.Row) else dict(comment)
+            item['replies'] = replies_by_parent.get(comment['id'], [])
+            threaded.append(item)
+    return threaded
+
+
+def _export_dumps(obj) -> bytes:
+    """Serialize obj as 2-space indented UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default,
+                            option=orjson.OPT_INDENT_2
+                            | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2,
+                      default=_json_default).encode('utf-8')
+
+
 def export_to_json(data: Dict[str, Any], filepath: str) -> bool:
     """Export data to JSON file."""
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(_export_dumps(data))
         return True
     except IOError:
         return False
 
 
-def export_to_csv(data: List[Dict[str, Any]], filepath: str,
-                  fieldnames: List[str] = None) -> bool:
-    """Export data to CSV file."""
-    import csv
+def export_to_json_stream(head: Dict[str, Any], list_key: str,
+                          items: Iterable[Dict[str, Any]],
+                          filepath: str) -> bool:
+    """Export head plus a list under list_key to a JSON file, writing
+    items one at a time as they are produced.
+
+    The output matches export_to_json({**head, list_key: list(items)}).
+    """
+    def dumps(obj, prefix: bytes) -> bytes:
+        return _export_dumps(obj).replace(b'\n', b'\n' + prefix)
+
+    try:
+        with open(filepath, 'wb') as f:
+            f.write(b'{')
+            for key, value in head.items():
+                f.write(b'\n  ' + dumps(key, b'') + b': '
+                        + dumps(value, b'  ') + b',')
+            f.write(b'\n  ' + dumps(list_key, b'') + b': [')
+            first = True
+            for item in items:
+                f.write(b'\n    ' if first else b',\n    ')
+                f.write(dumps(item, b'    '))
+                first = False
+            f.write(b']\n}' if first else b'\n  ]\n}')
+        return True
+    except IOError:
+        return False
+
 
-    if not data:
+def export_to_csv(data: Iterable[Dict[str, Any]], filepath: str,
+                  fieldnames: List[str] = None) -> bool:
+    """Export rows to CSV file; data may be any iterable of dicts."""
+    rows = iter(data)
+    first = next(rows, None)
+    if first is None:
         return False
 
     if not fieldnames:
-        fieldnames = list(data[0].keys())
+        fieldnames = list(first.keys())
+
+    # Project each row to a tuple in one C-level call; fields a row lacks
+    # are written empty, as DictWriter's restval would
+    getter = itemgetter(*fieldnames)
+    single = len(fieldnames) == 1
+
+    def project(row):
+        try:
+            values = getter(row)
+        except KeyError:
+            return tuple(row.get(name, '') for name in fieldnames)
+        return (values,) if single else values
 
     try:
         with open(filepath, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames,
-                                    extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(data)
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerow(project(first))
+            writer.writerows(map(project, rows))
         return True
     except IOError:
         return False